@@ -4,8 +4,6 @@ Refactored with modular architecture
 """
 
 import os
-import logging
-from logging.handlers import RotatingFileHandler
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
@@ -19,11 +17,50 @@ from backend.config import config
 from backend.models import User, Beehive, db
 
 # Import routes
-from backend.routes import auth_bp, beehives_bp
+from backend.routes import auth_bp, beehives_bp, metrics_bp, prometheus_bp, health_bp
+
+# Import CLI commands
+from backend.cli import kbee_cli
 
 # Import error handlers
 from backend.utils.errors import register_error_handlers
 
+# Import JSON serialization provider
+from backend.utils.json_provider import get_json_provider_class
+
+# Import cross-worker cache invalidation
+from backend.utils.invalidation import invalidation_bus
+
+# Import response compression
+from backend.utils.compression import compression
+
+# Import connection pool instrumentation
+from backend.utils.db_pool import use_instrumented_pool
+
+# Import read-replica routing
+from backend.utils.db_routing import replica_router, read_only
+
+# Import SQLite production profile
+from backend.utils.sqlite import sqlite_profile
+
+# Import per-request query instrumentation
+from backend.utils.query_stats import query_stats
+
+# Import Prometheus request metrics
+from backend.utils.metrics import metrics
+
+# Import on-demand request profiler
+from backend.utils.profiler import profiler
+
+# Import readiness checks
+from backend.utils.health import readiness
+
+# Import non-blocking structured logging
+from backend.utils.log_config import log_pipeline
+
+# Import request IDs and access log
+from backend.utils.request_log import request_log
+
 def create_app(config_name=None):
     """Application factory pattern"""
     
@@ -35,9 +72,39 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(app_config)
     
-    # Initialize extensions
+    # Configure logging first: JSON through a queue, levels from LOG_LEVEL
+    log_pipeline.init_app(app)
+    
+    # Request IDs on every log record and response, one access line per request
+    request_log.init_app(app)
+    
+    # Use the fast JSON provider (orjson when available)
+    app.json = get_json_provider_class(app_config.JSON_PROVIDER)(app)
+    
+    # Initialize cache invalidation bus (Redis pub/sub, shared memory fallback)
+    invalidation_bus.init_app(app)
+    
+    # Initialize extensions (pool class and replica binds must be set before engines exist)
+    use_instrumented_pool(app)
+    replica_router.init_app(app)
     db.init_app(app)
     
+    # Apply SQLite pragmas and writer serialization (SQLite profile only)
+    sqlite_profile.init_app(app, db)
+    
+    # Count queries and DB time per request (Server-Timing, slow query log)
+    query_stats.init_app(app, db)
+    
+    # Request metrics for /metrics (before the limiter and compression hooks,
+    # so rejected requests are counted and sizes are measured as sent)
+    metrics.init_app(app)
+    
+    # Profile requests carrying the profiling token or picked by sampling
+    profiler.init_app(app)
+    
+    # Dependency checks behind /healthz/ready
+    readiness.init_app(app)
+    
     # Initialize JWT
     jwt = JWTManager(app)
     
@@ -53,7 +120,7 @@ def create_app(config_name=None):
         limiter = Limiter(
             key_func=get_remote_address,
             app=app,
-            storage_uri="redis://kbee_redis:6379",
+            storage_uri=app_config.REDIS_URL,
             default_limits=[app_config.RATE_LIMIT_DEFAULT] if app_config.RATE_LIMIT_ENABLED else [],
             strategy="fixed-window",
             swallow_errors=True
@@ -61,7 +128,7 @@ def create_app(config_name=None):
         app.logger.info("Rate limiting initialized with Redis storage")
     except Exception as e:
         # Fallback to memory storage if Redis is unavailable
-        app.logger.warning(f"Redis unavailable for rate limiting ({e}), falling back to memory storage")
+        app.logger.warning("Redis unavailable for rate limiting (%s), falling back to memory storage", e)
         limiter = Limiter(
             key_func=get_remote_address,
             app=app,
@@ -74,53 +141,22 @@ def create_app(config_name=None):
     # Register error handlers
     register_error_handlers(app)
     
+    # Compress responses according to Accept-Encoding
+    compression.init_app(app)
+    
     # Register blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(beehives_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(prometheus_bp)
+    app.register_blueprint(health_bp)
+    
+    # Probes must never be rate limited
+    limiter.exempt(health_bp)
+    
+    # Register maintenance commands (flask kbee ...)
+    app.cli.add_command(kbee_cli)
     
-    # Configure logging
-    if not app.debug and not app.testing:
-        # Clear existing handlers to avoid duplicates
-        app.logger.handlers.clear()
-        
-        try:
-            # Create logs directory if it doesn't exist
-            logs_dir = '/app/logs'
-            os.makedirs(logs_dir, exist_ok=True)
-            
-            # Ensure the log file is writable
-            log_file_path = os.path.join(logs_dir, 'error.log')
-            if os.path.exists(log_file_path):
-                os.chmod(log_file_path, 0o644)
-            
-            # Configure file handler for errors
-            file_handler = RotatingFileHandler(
-                log_file_path,
-                maxBytes=10240000,  # 10MB
-                backupCount=10
-            )
-            file_handler.setFormatter(logging.Formatter(
-                '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-            ))
-            file_handler.setLevel(logging.ERROR)
-            app.logger.addHandler(file_handler)
-            
-            app.logger.setLevel(logging.INFO)
-            app.logger.info('KBee Manager startup with file logging')
-            
-        except (PermissionError, OSError) as e:
-            # Fallback to console logging if file logging fails
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(logging.Formatter(
-                '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-            ))
-            console_handler.setLevel(logging.ERROR)
-            app.logger.addHandler(console_handler)
-            
-            app.logger.setLevel(logging.INFO)
-            app.logger.warning(f'File logging failed ({e}), using console logging')
-            app.logger.info('KBee Manager startup with console logging')
-
     # Root route for health check
     @app.route('/')
     def health_check():
@@ -133,6 +169,7 @@ def create_app(config_name=None):
     
     # Public beehive route (without /api prefix)
     @app.route('/beehive/<qr_token>', methods=['GET'])
+    @read_only
     def get_beehive_by_token_public(qr_token):
         """Public endpoint to get beehive by QR token"""
         from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
@@ -161,7 +198,7 @@ def create_app(config_name=None):
             })
             
         except Exception as e:
-            app.logger.error(f'Error getting beehive by token: {str(e)}')
+            app.logger.error('Error getting beehive by token: %s', e)
             raise NotFoundError('Beehive not found')
         
     # Database initialization endpoint
@@ -170,38 +207,18 @@ def create_app(config_name=None):
         """Initialize database tables"""
         try:
             with app.app_context():
-                db.create_all()
+                db.create_all(bind_key=None)  # primary only, never the replicas
                 return jsonify({'message': 'Database initialized successfully'})
         except Exception as e:
             return jsonify({'message': f'Database initialization failed: {str(e)}'}), 500
 
     return app
 
-def init_db_on_startup(app):
-    """Initialize database and create tables on app startup."""
-    with app.app_context():
-        try:
-            # Create all tables
-            db.create_all()
-            print("✓ Database tables created successfully")
-            
-            # Check if any users exist, if not, we're ready for setup
-            user_count = User.query.count()
-            if user_count == 0:
-                print("✓ Database is ready for initial setup")
-            else:
-                print(f"✓ Database initialized with {user_count} users")
-                
-        except Exception as e:
-            print(f"✗ Error creating database tables: {str(e)}")
-            # Don't exit, let the app run and handle errors gracefully
-
-# Create app instance
+# Create app instance. Importing this module must not touch the database:
+# gunicorn imports it once in the master (preload_app) and forks workers
+# from it, and the schema is managed once per deploy by `flask kbee init-db`.
 app = create_app()
 
-# Initialize database on startup
-init_db_on_startup(app)
-
 if __name__ == '__main__':
     # Only run in debug mode if explicitly set
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
@@ -0,0 +1,106 @@
+"""
+Command line maintenance tasks for KBee Manager
+"""
+
+import sys
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import inspect
+
+from .models import User, db, rebuild_search_tokens
+
+kbee_cli = AppGroup('kbee', help='KBee Manager maintenance commands')
+
+
+@kbee_cli.command('reindex-search')
+def reindex_search():
+    """Rebuild the accent-folded search tokens of every beehive"""
+    count = rebuild_search_tokens()
+    click.echo(f'✓ Reindexed search tokens for {count} beehives')
+
+
+db_cli = AppGroup('db', help='Versioned schema migrations (run once per deploy, never on worker boot)')
+kbee_cli.add_command(db_cli)
+
+
+def _alembic():
+    # Alembic is only needed by these commands; keep it out of worker imports
+    from alembic import command
+    from .migrations import alembic_config
+    return command, alembic_config()
+
+
+@kbee_cli.command('init-db')
+def init_db():
+    """Create or upgrade the database schema (run once per deploy, before starting workers)"""
+    command, config = _alembic()
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    if 'alembic_version' not in tables and {'user', 'beehive'} & tables:
+        # Created by db.create_all() before migrations existed
+        columns = {column['name'] for column in inspector.get_columns('beehive')} if 'beehive' in tables else set()
+        if 'serial_seq' in columns:
+            click.echo('✗ Database has tables but no migration history; stamp its revision with '
+                       '`flask kbee db stamp <revision>`', err=True)
+            sys.exit(1)
+        command.stamp(config, '0001_baseline')
+        click.echo('✓ Existing database marked as 0001_baseline')
+    
+    command.upgrade(config, 'head')
+    click.echo('✓ Database schema is up to date')
+    
+    user_count = User.query.count()
+    if user_count == 0:
+        click.echo('✓ Database is ready for initial setup')
+    else:
+        click.echo(f'✓ Database initialized with {user_count} users')
+
+
+@db_cli.command('upgrade')
+@click.argument('revision', default='head')
+@click.option('--sql', is_flag=True, help='Print the SQL instead of executing it')
+def db_upgrade(revision, sql):
+    """Upgrade the schema to REVISION (default: head)"""
+    command, config = _alembic()
+    command.upgrade(config, revision, sql=sql)
+
+
+@db_cli.command('downgrade')
+@click.argument('revision')
+@click.option('--sql', is_flag=True, help='Print the SQL instead of executing it')
+def db_downgrade(revision, sql):
+    """Downgrade the schema to REVISION"""
+    command, config = _alembic()
+    command.downgrade(config, revision, sql=sql)
+
+
+@db_cli.command('current')
+def db_current():
+    """Show the schema revision of the database"""
+    command, config = _alembic()
+    command.current(config, verbose=True)
+
+
+@db_cli.command('history')
+def db_history():
+    """List the migrations"""
+    command, config = _alembic()
+    command.history(config)
+
+
+@db_cli.command('stamp')
+@click.argument('revision')
+def db_stamp(revision):
+    """Record REVISION as applied without running it (for databases created before migrations)"""
+    command, config = _alembic()
+    command.stamp(config, revision)
+
+
+@db_cli.command('revision')
+@click.option('-m', '--message', required=True, help='Short description of the change')
+@click.option('--autogenerate', is_flag=True, help='Diff the models against the database')
+def db_revision(message, autogenerate):
+    """Create a new migration script"""
+    command, config = _alembic()
+    command.revision(config, message=message, autogenerate=autogenerate)
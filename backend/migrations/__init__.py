@@ -0,0 +1,33 @@
+"""
+Versioned schema migrations for KBee Manager
+
+Alembic migrations wired to the shared ``db`` object. They are run
+explicitly, once per deploy (``flask kbee db upgrade``); application
+workers never create or alter tables when they boot.
+"""
+
+import os
+
+from ..models.search import FULLTEXT_INDEX_NAME, FTS_KEY_COLUMN, FTS_KEY_INDEX_NAME, FTS_TABLE_NAME
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def alembic_config():
+    """Alembic configuration pointing at this package (no alembic.ini needed)"""
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option('script_location', MIGRATIONS_DIR)
+    return config
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Skip search structures that live outside the SQLAlchemy metadata"""
+    if type_ == 'table' and name.startswith(FTS_TABLE_NAME):
+        return False
+    if type_ == 'index' and name in (FULLTEXT_INDEX_NAME, FTS_KEY_INDEX_NAME):
+        return False
+    if type_ == 'column' and name == FTS_KEY_COLUMN and obj.table.name == 'beehive':
+        return False
+    return True
@@ -0,0 +1,45 @@
+"""
+Alembic environment for KBee Manager
+
+Runs inside the Flask application context (flask kbee db ...), so the
+engine and metadata come from the shared ``db`` object.
+"""
+
+from alembic import context
+
+from backend.migrations import include_object
+from backend.models import db
+
+target_metadata = db.metadata
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of executing it (flask kbee db upgrade --sql)"""
+    context.configure(
+        url=db.engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with db.engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            compare_type=True,
+            # SQLite cannot ALTER most things in place; batch mode copies the table
+            render_as_batch=connection.dialect.name == 'sqlite',
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
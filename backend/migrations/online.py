@@ -0,0 +1,52 @@
+"""
+Online schema change helpers for migrations
+
+On MySQL, index and column changes are issued as ALTER TABLE ...
+ALGORITHM=INPLACE, LOCK=NONE so InnoDB builds them while the table keeps
+serving reads and writes; if the server cannot do the change online the
+statement fails instead of silently locking the table. Other databases
+fall back to the regular Alembic operations.
+"""
+
+from alembic import op
+from sqlalchemy.schema import CreateColumn
+
+
+def _is_mysql():
+    return op.get_bind().dialect.name == 'mysql'
+
+
+def _online_alter(table_name, clause, lock='NONE'):
+    op.execute(f'ALTER TABLE `{table_name}` {clause}, ALGORITHM=INPLACE, LOCK={lock}')
+
+
+def create_index_online(index_name, table_name, columns, unique=False, fulltext=False):
+    """Create an index without blocking writes on MySQL
+
+    FULLTEXT indexes cannot be built with LOCK=NONE; they take a shared
+    lock (reads continue, writes wait) and are MySQL only.
+    """
+    if not _is_mysql():
+        if not fulltext:
+            op.create_index(index_name, table_name, columns, unique=unique)
+        return
+    kind = 'FULLTEXT INDEX' if fulltext else 'UNIQUE INDEX' if unique else 'INDEX'
+    column_list = ', '.join(f'`{column}`' for column in columns)
+    _online_alter(table_name, f'ADD {kind} `{index_name}` ({column_list})', lock='SHARED' if fulltext else 'NONE')
+
+
+def drop_index_online(index_name, table_name):
+    """Drop an index without blocking writes on MySQL"""
+    if not _is_mysql():
+        op.drop_index(index_name, table_name=table_name)
+        return
+    _online_alter(table_name, f'DROP INDEX `{index_name}`')
+
+
+def add_column_online(table_name, column):
+    """Add a nullable column without blocking writes on MySQL"""
+    if not _is_mysql():
+        op.add_column(table_name, column)
+        return
+    ddl = CreateColumn(column).compile(dialect=op.get_bind().dialect)
+    _online_alter(table_name, f'ADD COLUMN {ddl}')
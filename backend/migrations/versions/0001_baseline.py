@@ -0,0 +1,68 @@
+"""Baseline schema: user and beehive tables as originally created by db.create_all()
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+
+Databases created before migrations existed already have these tables;
+mark them with ``flask kbee db stamp 0001_baseline`` and then upgrade.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BEEHIVE_INDEXES = ('import_date', 'split_date', 'health_status', 'species', 'is_sold', 'sold_date', 'user_id', 'created_at')
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(80), nullable=False),
+        sa.Column('email', sa.String(120), nullable=False),
+        sa.Column('password_hash', sa.String(120), nullable=False),
+        sa.Column('created_at', sa.DateTime(), default=datetime.utcnow),
+        sa.Column('farm_name', sa.String(200), nullable=True),
+        sa.Column('farm_address', sa.Text(), nullable=True),
+        sa.Column('farm_phone', sa.String(20), nullable=True),
+        sa.Column('qr_show_farm_info', sa.Boolean(), nullable=True),
+        sa.Column('qr_show_owner_contact', sa.Boolean(), nullable=True),
+        sa.Column('qr_show_beehive_history', sa.Boolean(), nullable=True),
+        sa.Column('qr_show_health_status', sa.Boolean(), nullable=True),
+        sa.Column('qr_custom_message', sa.Text(), nullable=True),
+        sa.Column('qr_footer_text', sa.String(500), nullable=True),
+    )
+    op.create_index('ix_user_username', 'user', ['username'], unique=True)
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+    
+    op.create_table(
+        'beehive',
+        sa.Column('serial_number', sa.String(50), primary_key=True),
+        sa.Column('qr_token', sa.String(12), nullable=False),
+        sa.Column('import_date', sa.Date(), nullable=False),
+        sa.Column('split_date', sa.Date(), nullable=True),
+        sa.Column('health_status', sa.String(20), nullable=False),
+        sa.Column('species', sa.String(20), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('is_sold', sa.Boolean(), nullable=True),
+        sa.Column('sold_date', sa.Date(), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_beehive_qr_token', 'beehive', ['qr_token'], unique=True)
+    for column in BEEHIVE_INDEXES:
+        op.create_index(f'ix_beehive_{column}', 'beehive', [column])
+
+
+def downgrade():
+    op.drop_table('beehive')
+    op.drop_table('user')
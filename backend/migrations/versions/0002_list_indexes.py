@@ -0,0 +1,69 @@
+"""Serial sequence column and (user_id, is_sold, column) list indexes
+
+Revision ID: 0002_list_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+
+Adds serial_seq (numeric part of the serial number, backfilled here) and
+replaces the single-column beehive indexes with composites matching the
+list queries. Composites are created before the old indexes are dropped
+so user_id stays indexed for its foreign key throughout.
+"""
+
+import re
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from backend.migrations.online import create_index_online, drop_index_online, add_column_online
+
+# revision identifiers, used by Alembic.
+revision = '0002_list_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+LIST_COLUMNS = ('serial_seq', 'serial_number', 'created_at', 'import_date', 'split_date', 'sold_date', 'health_status', 'species')
+SINGLE_COLUMN_INDEXES = ('import_date', 'split_date', 'health_status', 'species', 'is_sold', 'sold_date', 'user_id', 'created_at')
+
+_SERIAL = re.compile(r'^TO(\d+)$', re.IGNORECASE)
+
+beehive = sa.table('beehive', sa.column('serial_number', sa.String), sa.column('serial_seq', sa.Integer))
+
+
+def upgrade():
+    add_column_online('beehive', sa.Column('serial_seq', sa.Integer(), nullable=True))
+    
+    if op.get_bind().dialect.name == 'mysql' or context.is_offline_mode():
+        op.execute(
+            "UPDATE beehive SET serial_seq = CAST(SUBSTRING(serial_number, 3) AS UNSIGNED) "
+            "WHERE serial_number REGEXP '^TO[0-9]+$'"
+        )
+    else:
+        # No REGEXP/CAST portability elsewhere; parse like Beehive.serial_sequence
+        connection = op.get_bind()
+        serial_numbers = connection.execute(sa.select(beehive.c.serial_number)).scalars().all()
+        updates = [
+            {'sn': serial_number, 'seq': int(match.group(1))}
+            for serial_number, match in ((sn, _SERIAL.match(sn)) for sn in serial_numbers)
+            if match
+        ]
+        if updates:
+            connection.execute(
+                beehive.update().where(beehive.c.serial_number == sa.bindparam('sn')).values(serial_seq=sa.bindparam('seq')),
+                updates,
+            )
+    
+    for column in LIST_COLUMNS:
+        create_index_online(f'ix_beehive_user_sold_{column}', 'beehive', ['user_id', 'is_sold', column])
+    for column in SINGLE_COLUMN_INDEXES:
+        drop_index_online(f'ix_beehive_{column}', 'beehive')
+
+
+def downgrade():
+    for column in SINGLE_COLUMN_INDEXES:
+        create_index_online(f'ix_beehive_{column}', 'beehive', [column])
+    for column in LIST_COLUMNS:
+        drop_index_online(f'ix_beehive_user_sold_{column}', 'beehive')
+    with op.batch_alter_table('beehive') as batch_op:
+        batch_op.drop_column('serial_seq')
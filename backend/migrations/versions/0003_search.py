@@ -0,0 +1,102 @@
+"""Full-text index over notes and accent-folded search tokens
+
+Revision ID: 0003_search
+Revises: 0002_list_indexes
+Create Date: 2026-10-18
+
+MySQL gets a FULLTEXT index on beehive.notes (built in place; writes wait
+while it builds), SQLite an FTS5 table with sync triggers. The
+beehive_search_token side table is created and backfilled from existing
+rows; afterwards the application keeps it up to date.
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from backend.migrations.online import create_index_online, drop_index_online
+from backend.models.search import FULLTEXT_INDEX_NAME, FTS_TABLE_NAME
+from backend.utils.text import fold_words
+
+# revision identifiers, used by Alembic.
+revision = '0003_search'
+down_revision = '0002_list_indexes'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# FTS5 table and triggers as created at this revision (keyed on beehive.rowid,
+# re-keyed on search_id by 0004_fts_key)
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5("
+    f"notes, content='beehive', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ai AFTER INSERT ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) VALUES (new.rowid, new.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ad AFTER DELETE ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.rowid, old.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_au AFTER UPDATE OF notes ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.rowid, old.notes); "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) VALUES (new.rowid, new.notes); END",
+]
+
+SQLITE_DROP_DDL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE_NAME}',
+]
+
+
+def _serial_tokens(serial_number):
+    tokens = set(fold_words(serial_number))
+    digits = ''.join(ch for ch in serial_number or '' if ch.isdigit())
+    if digits:
+        tokens.add(digits)
+    return tokens
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        create_index_online(FULLTEXT_INDEX_NAME, 'beehive', ['notes'], fulltext=True)
+    elif dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        op.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')")
+    
+    tokens = op.create_table(
+        'beehive_search_token',
+        sa.Column('serial_number', sa.String(50), sa.ForeignKey('beehive.serial_number', ondelete='CASCADE'), primary_key=True),
+        sa.Column('field', sa.String(16), primary_key=True),
+        sa.Column('token', sa.String(64), primary_key=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_beehive_search_token_lookup', 'beehive_search_token', ['user_id', 'field', 'token'])
+    
+    if context.is_offline_mode():
+        op.execute('-- Backfill beehive_search_token afterwards with: flask kbee reindex-search')
+        return
+    
+    # Same tokenisation as backend.models.search, frozen at this revision
+    connection = op.get_bind()
+    beehive = sa.table('beehive', sa.column('serial_number'), sa.column('user_id'), sa.column('notes'))
+    rows = []
+    for serial_number, user_id, notes in connection.execute(sa.select(beehive.c.serial_number, beehive.c.user_id, beehive.c.notes)).all():
+        for field, words in (('serial_number', _serial_tokens(serial_number)), ('notes', fold_words(notes))):
+            for token in {word[:64] for word in words}:
+                rows.append({'serial_number': serial_number, 'user_id': user_id, 'field': field, 'token': token})
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(tokens, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(tokens, rows)
+
+
+def downgrade():
+    op.drop_table('beehive_search_token')
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        drop_index_online(FULLTEXT_INDEX_NAME, 'beehive')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_DROP_DDL:
+            op.execute(statement)
@@ -0,0 +1,90 @@
+"""Key the SQLite full-text index on an explicit INTEGER column
+
+Revision ID: 0004_fts_key
+Revises: 0003_search
+Create Date: 2026-10-18
+
+beehive's primary key is TEXT, so the implicit rowid the FTS5 table was
+keyed on may be renumbered by VACUUM or a table rebuild, silently pointing
+search results at the wrong rows. SQLite gets a uniquely indexed search_id
+column, backfilled from the current rowids, and the FTS5 table and triggers
+are recreated on it. MySQL (FULLTEXT on the table itself) is unchanged.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_fts_key'
+down_revision = '0003_search'
+branch_labels = None
+depends_on = None
+
+# Names and DDL as of this revision, copied rather than imported so later
+# changes to backend/models/search.py don't change what this revision does
+FTS_TABLE_NAME = 'beehive_fts'
+FTS_KEY_COLUMN = 'search_id'
+FTS_KEY_INDEX_NAME = 'ix_beehive_search_id'
+
+SQLITE_DDL = [
+    f'ALTER TABLE beehive ADD COLUMN {FTS_KEY_COLUMN} INTEGER',
+    f'CREATE UNIQUE INDEX IF NOT EXISTS {FTS_KEY_INDEX_NAME} ON beehive ({FTS_KEY_COLUMN})',
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5("
+    f"notes, content='beehive', content_rowid='{FTS_KEY_COLUMN}', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ai AFTER INSERT ON beehive BEGIN "
+    f"UPDATE beehive SET {FTS_KEY_COLUMN} = (SELECT IFNULL(MAX({FTS_KEY_COLUMN}), 0) + 1 FROM beehive) "
+    f"WHERE rowid = new.rowid AND {FTS_KEY_COLUMN} IS NULL; "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) SELECT {FTS_KEY_COLUMN}, notes FROM beehive WHERE rowid = new.rowid; END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ad AFTER DELETE ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.{FTS_KEY_COLUMN}, old.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_au AFTER UPDATE OF notes ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.{FTS_KEY_COLUMN}, old.notes); "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) VALUES (new.{FTS_KEY_COLUMN}, new.notes); END",
+]
+
+SQLITE_DROP_DDL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE_NAME}',
+]
+
+# Table and triggers as created by 0003_search
+PREVIOUS_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5("
+    f"notes, content='beehive', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ai AFTER INSERT ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) VALUES (new.rowid, new.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ad AFTER DELETE ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.rowid, old.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_au AFTER UPDATE OF notes ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.rowid, old.notes); "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) VALUES (new.rowid, new.notes); END",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in SQLITE_DROP_DDL:
+        op.execute(statement)
+    # Column and unique index first, backfilled before the triggers exist
+    column_ddl, index_ddl, *fts_ddl = SQLITE_DDL
+    op.execute(column_ddl)
+    op.execute(f'UPDATE beehive SET {FTS_KEY_COLUMN} = rowid')
+    op.execute(index_ddl)
+    for statement in fts_ddl:
+        op.execute(statement)
+    op.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in SQLITE_DROP_DDL:
+        op.execute(statement)
+    op.execute(f'DROP INDEX IF EXISTS {FTS_KEY_INDEX_NAME}')
+    op.execute(f'ALTER TABLE beehive DROP COLUMN {FTS_KEY_COLUMN}')
+    for statement in PREVIOUS_SQLITE_DDL:
+        op.execute(statement)
+    op.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')")
@@ -0,0 +1,75 @@
+"""Serial number search tokens without leading zeros
+
+Revision ID: 0005_serial_tokens
+Revises: 0004_fts_key
+Create Date: 2026-10-18
+
+The serialNumber filter matches token prefixes; indexing only "to012" and
+"012" meant "1" or "12" no longer found TO001 or TO012 (the filter used to
+be a substring match). Adds the numeric part without leading zeros
+("12") for existing beehives; the application indexes it for new ones.
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from backend.utils.text import fold_words
+
+# revision identifiers, used by Alembic.
+revision = '0005_serial_tokens'
+down_revision = '0004_fts_key'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+beehive = sa.table('beehive', sa.column('serial_number'), sa.column('user_id'))
+tokens = sa.table('beehive_search_token', sa.column('serial_number'), sa.column('field'),
+                  sa.column('token'), sa.column('user_id'))
+
+
+def _unpadded_token(serial_number):
+    """The token this revision adds, or None when 0003 already indexed it"""
+    digits = ''.join(ch for ch in serial_number or '' if ch.isdigit())
+    if not digits:
+        return None
+    token = digits.lstrip('0') or '0'
+    return None if token == digits or token in fold_words(serial_number) else token
+
+
+def _rows(connection):
+    for serial_number, user_id in connection.execute(sa.select(beehive.c.serial_number, beehive.c.user_id)).all():
+        token = _unpadded_token(serial_number)
+        if token:
+            yield {'serial_number': serial_number, 'user_id': user_id, 'field': 'serial_number', 'token': token[:64]}
+
+
+def upgrade():
+    if context.is_offline_mode():
+        op.execute('-- Backfill the new serial number tokens afterwards with: flask kbee reindex-search')
+        return
+    rows = []
+    for row in _rows(op.get_bind()):
+        rows.append(row)
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(tokens, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(tokens, rows)
+
+
+def downgrade():
+    if context.is_offline_mode():
+        op.execute('-- Rebuild the search tokens afterwards with: flask kbee reindex-search')
+        return
+    connection = op.get_bind()
+    rows = list(_rows(connection))
+    if rows:
+        connection.execute(
+            tokens.delete().where(
+                tokens.c.serial_number == sa.bindparam('sn'),
+                tokens.c.field == 'serial_number',
+                tokens.c.token == sa.bindparam('tok'),
+            ),
+            [{'sn': row['serial_number'], 'tok': row['token']} for row in rows],
+        )
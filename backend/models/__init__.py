@@ -4,5 +4,6 @@ Database models for KBee Manager
 
 from .user import User, db
 from .beehive import Beehive
+from .search import BeehiveSearchToken, apply_fulltext_search, folded_match, rebuild_search_tokens
 
-__all__ = ['User', 'Beehive', 'db']
+__all__ = ['User', 'Beehive', 'BeehiveSearchToken', 'db', 'apply_fulltext_search', 'folded_match', 'rebuild_search_tokens']
@@ -3,12 +3,14 @@ Beehive model for KBee Manager
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 from datetime import datetime
 import secrets
 import string
 
 # Import the shared db instance
 from .user import db
+from ..utils.invalidation import user_scope
 
 class Beehive(db.Model):
     """Beehive model for managing beehive information"""
@@ -16,37 +18,126 @@ class Beehive(db.Model):
     __tablename__ = 'beehive'
     
     serial_number = db.Column(db.String(50), primary_key=True)  # TO001, TO002, etc.
+    serial_seq = db.Column(db.Integer, nullable=True)  # Numeric part of serial_number, for ordering and prefix lookups
     qr_token = db.Column(db.String(12), unique=True, nullable=False, index=True)  # Random 12-char token for QR
-    import_date = db.Column(db.Date, nullable=False, index=True)
-    split_date = db.Column(db.Date, nullable=True, index=True)
-    health_status = db.Column(db.String(20), nullable=False, default='Tốt', index=True)  # Tốt, Yếu
-    species = db.Column(db.String(20), nullable=False, default='Furva Vàng', index=True)
+    import_date = db.Column(db.Date, nullable=False)
+    split_date = db.Column(db.Date, nullable=True)
+    health_status = db.Column(db.String(20), nullable=False, default='Tốt')  # Tốt, Yếu
+    species = db.Column(db.String(20), nullable=False, default='Furva Vàng')
     notes = db.Column(db.Text, nullable=True)
-    is_sold = db.Column(db.Boolean, default=False, index=True)
-    sold_date = db.Column(db.Date, nullable=True, index=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)  # Owner of beehive
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    is_sold = db.Column(db.Boolean, default=False)
+    sold_date = db.Column(db.Date, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # Owner of beehive
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # List queries always filter on user_id and is_sold first, then filter
+        # or sort on one more column. One (user_id, is_sold, <column>) index
+        # per sortable/filterable column serves both without a filesort;
+        # single-column indexes would only slow down writes.
+        db.Index('ix_beehive_user_sold_serial_seq', 'user_id', 'is_sold', 'serial_seq'),
+        db.Index('ix_beehive_user_sold_serial_number', 'user_id', 'is_sold', 'serial_number'),
+        db.Index('ix_beehive_user_sold_created_at', 'user_id', 'is_sold', 'created_at'),
+        db.Index('ix_beehive_user_sold_import_date', 'user_id', 'is_sold', 'import_date'),
+        db.Index('ix_beehive_user_sold_split_date', 'user_id', 'is_sold', 'split_date'),
+        db.Index('ix_beehive_user_sold_sold_date', 'user_id', 'is_sold', 'sold_date'),
+        db.Index('ix_beehive_user_sold_health_status', 'user_id', 'is_sold', 'health_status'),
+        db.Index('ix_beehive_user_sold_species', 'user_id', 'is_sold', 'species'),
+    )
+    
+    SERIAL_PREFIX = 'TO'
+    SERIAL_WIDTH = 3  # TO001: numbers are zero-padded to at least three digits
+    
+    # Columns exposed by the API, in response order
+    API_FIELDS = (
+        'serial_number', 'qr_token', 'import_date', 'split_date', 'health_status', 'species',
+        'notes', 'is_sold', 'sold_date', 'user_id', 'created_at', 'updated_at',
+    )
+    
+    # Compact representation for list views
+    SUMMARY_FIELDS = (
+        'serial_number', 'qr_token', 'import_date', 'split_date', 'health_status', 'species',
+        'is_sold', 'sold_date',
+    )
+    
+    @classmethod
+    def columns_for(cls, fields):
+        """Column objects for a list of API field names (for with_entities projections)"""
+        return [getattr(cls, field) for field in fields]
+    
+    @staticmethod
+    def row_to_dict(row, fields):
+        """Convert a projected row to a dictionary without hydrating an ORM instance"""
+        return dict(zip(fields, row))
+    
+    @staticmethod
+    def serial_sequence(serial_number):
+        """Numeric part of a serial number (TO001 -> 1), or None"""
+        if not serial_number or not serial_number.upper().startswith(Beehive.SERIAL_PREFIX):
+            return None
+        digits = serial_number[len(Beehive.SERIAL_PREFIX):]
+        return int(digits) if digits.isdigit() else None
+    
+    @staticmethod
+    def serial_prefix_ranges(prefix, max_width=9):
+        """serial_seq ranges (inclusive) of serial numbers starting with prefix
+
+        Returns None when every serial number matches and an empty list when
+        none can. "TO01" -> [(10, 19)], "TO12" -> [(120, 129), (1200, 1299), ...].
+        Bare digits, like the serialNumber list filter, also match the number
+        without its zero padding: "12" -> [(12, 12), (120, 129), ...].
+        """
+        prefix = (prefix or '').strip().upper()
+        if Beehive.SERIAL_PREFIX.startswith(prefix):
+            return None
+        bare = not prefix.startswith(Beehive.SERIAL_PREFIX)
+        if not bare:
+            prefix = prefix[len(Beehive.SERIAL_PREFIX):]
+        if not prefix.isdigit() or len(prefix) > max_width:
+            return []
+        
+        ranges = []
+        base = int(prefix)
+        if bare and prefix[0] != '0':
+            # Numbers shorter than the padding: "12" is TO012, "1" TO001 and TO010-TO019
+            for width in range(len(prefix), Beehive.SERIAL_WIDTH):
+                scale = 10 ** (width - len(prefix))
+                ranges.append((base * scale, (base + 1) * scale - 1))
+        for width in range(max(Beehive.SERIAL_WIDTH, len(prefix)), max_width + 1):
+            # Wider than the padding: numbers are written without leading zeros
+            if width > Beehive.SERIAL_WIDTH and prefix[0] == '0':
+                break
+            scale = 10 ** (width - len(prefix))
+            low, high = base * scale, (base + 1) * scale - 1
+            if width > Beehive.SERIAL_WIDTH:
+                low = max(low, 10 ** (width - 1))
+            if low <= high:
+                ranges.append((low, high))
+        return ranges
+    
+    @validates('serial_number')
+    def _set_serial_seq(self, key, serial_number):
+        """Keep serial_seq in sync with serial_number"""
+        self.serial_seq = Beehive.serial_sequence(serial_number)
+        return serial_number
+    
     @staticmethod
     def generate_serial_number():
         """Generate next serial number in format TO001, TO002, etc."""
-        # Get the highest existing serial number
-        last_beehive = Beehive.query.filter(
-            Beehive.serial_number.like('TO%')
-        ).order_by(Beehive.serial_number.desc()).first()
+        # Numeric maximum, so TO1000 correctly follows TO999
+        last_number = db.session.query(db.func.max(Beehive.serial_seq)).scalar()
         
-        if last_beehive:
-            # Extract number from last serial number (e.g., TO001 -> 1)
-            try:
-                last_number = int(last_beehive.serial_number[2:])  # Remove 'TO' prefix
-                next_number = last_number + 1
-            except (ValueError, IndexError):
-                next_number = 1
-        else:
-            next_number = 1
+        if last_number is None:
+            # serial_seq not backfilled yet: fall back to the highest serial string
+            last_beehive = Beehive.query.filter(
+                Beehive.serial_number.like(f'{Beehive.SERIAL_PREFIX}%')
+            ).order_by(Beehive.serial_number.desc()).first()
+            last_number = Beehive.serial_sequence(last_beehive.serial_number) if last_beehive else None
         
-        return f"TO{next_number:03d}"
+        next_number = (last_number or 0) + 1
+        
+        return f"{Beehive.SERIAL_PREFIX}{next_number:0{Beehive.SERIAL_WIDTH}d}"
     
     @staticmethod
     def generate_qr_token():
@@ -59,21 +150,25 @@ class Beehive(db.Model):
             if not Beehive.query.filter_by(qr_token=token).first():
                 return token
     
+    def invalidation_scopes(self):
+        """Cache scopes to invalidate when this beehive changes"""
+        return [user_scope(self.user_id)]
+    
     def to_dict(self):
-        """Convert beehive to dictionary for API responses"""
+        """Convert beehive to dictionary for API responses (dates are encoded by the JSON provider)"""
         return {
             'serial_number': self.serial_number,
             'qr_token': self.qr_token,
-            'import_date': self.import_date.isoformat() if self.import_date else None,
-            'split_date': self.split_date.isoformat() if self.split_date else None,
+            'import_date': self.import_date,
+            'split_date': self.split_date,
             'health_status': self.health_status,
             'species': self.species,
             'notes': self.notes,
             'is_sold': self.is_sold,
-            'sold_date': self.sold_date.isoformat() if self.sold_date else None,
+            'sold_date': self.sold_date,
             'user_id': self.user_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
     
     def __repr__(self):
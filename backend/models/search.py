@@ -0,0 +1,216 @@
+"""
+Search indexes over beehives
+
+Full-text search: MySQL uses a FULLTEXT index on ``beehive.notes``; SQLite
+(tests, embedded deployments) uses an external-content FTS5 table keyed
+on beehive.search_id and kept in sync by triggers. Both are maintained by
+the database on every write.
+
+Accent-folded search: the ``beehive_search_token`` side table stores the
+lower-cased, diacritic-free words of each serial number and notes field,
+indexed by (user_id, field, token) so "yeu" finds "Yếu" with an index
+range scan. It is maintained by mapper events on every write.
+"""
+
+import re
+
+from sqlalchemy import DDL, and_, delete, event, func, insert, inspect, literal_column, select, table, column
+from sqlalchemy.dialects.mysql import match
+
+from .user import db
+from .beehive import Beehive
+from ..utils.text import fold_words
+
+FULLTEXT_INDEX_NAME = 'ix_beehive_notes_fulltext'
+FTS_TABLE_NAME = 'beehive_fts'
+
+MYSQL_DDL = [
+    f'ALTER TABLE beehive ADD FULLTEXT INDEX {FULLTEXT_INDEX_NAME} (notes)',
+]
+
+FTS_KEY_COLUMN = 'search_id'
+FTS_KEY_INDEX_NAME = 'ix_beehive_search_id'
+
+# beehive's primary key is TEXT, so its implicit rowid is not stable (VACUUM
+# and table rebuilds may renumber it). The FTS5 table is keyed on search_id
+# instead: an INTEGER column, SQLite only, assigned once by the insert trigger.
+SQLITE_DDL = [
+    f'ALTER TABLE beehive ADD COLUMN {FTS_KEY_COLUMN} INTEGER',
+    f'CREATE UNIQUE INDEX IF NOT EXISTS {FTS_KEY_INDEX_NAME} ON beehive ({FTS_KEY_COLUMN})',
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5("
+    f"notes, content='beehive', content_rowid='{FTS_KEY_COLUMN}', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ai AFTER INSERT ON beehive BEGIN "
+    f"UPDATE beehive SET {FTS_KEY_COLUMN} = (SELECT IFNULL(MAX({FTS_KEY_COLUMN}), 0) + 1 FROM beehive) "
+    f"WHERE rowid = new.rowid AND {FTS_KEY_COLUMN} IS NULL; "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) SELECT {FTS_KEY_COLUMN}, notes FROM beehive WHERE rowid = new.rowid; END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ad AFTER DELETE ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.{FTS_KEY_COLUMN}, old.notes); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_au AFTER UPDATE OF notes ON beehive BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, notes) VALUES ('delete', old.{FTS_KEY_COLUMN}, old.notes); "
+    f"INSERT INTO {FTS_TABLE_NAME}(rowid, notes) VALUES (new.{FTS_KEY_COLUMN}, new.notes); END",
+]
+
+SQLITE_DROP_DDL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE_NAME}',
+]
+
+for statement in MYSQL_DDL:
+    event.listen(Beehive.__table__, 'after_create', DDL(statement).execute_if(dialect='mysql'))
+for statement in SQLITE_DDL:
+    event.listen(Beehive.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in SQLITE_DROP_DDL:
+    event.listen(Beehive.__table__, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+
+_fts = table(FTS_TABLE_NAME, column('rowid'))
+
+# Characters with a meaning in FTS5 / InnoDB boolean query syntax
+_QUERY_SYNTAX = re.compile(r'[^\w\s]', re.UNICODE)
+
+
+def search_terms(text):
+    """Split user input into plain search words"""
+    return _QUERY_SYNTAX.sub(' ', text or '').split()
+
+
+def apply_fulltext_search(query, text, rank=True):
+    """Restrict a Beehive query to notes matching every word of text
+
+    The last word is matched as a prefix so results update while typing.
+    With rank=True the query is ordered by relevance, best match first.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return query
+
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        expression = ' '.join(f'+{term}' for term in terms) + '*'
+        score = match(Beehive.notes, against=expression).in_boolean_mode()
+        query = query.filter(score > 0)
+        return query.order_by(score.desc()) if rank else query
+
+    if dialect == 'sqlite':
+        expression = ' '.join(f'"{term}"' for term in terms) + '*'
+        fts_table = literal_column(FTS_TABLE_NAME)
+        matched = fts_table.op('MATCH')(expression)
+        key = literal_column(f'beehive.{FTS_KEY_COLUMN}')
+        # Run the MATCH once, never per beehive row: as an uncorrelated IN
+        # list, or as the outer loop of the ranked join. "+ 0" keeps the
+        # planner from pushing rowid = beehive.search_id into the FTS5 scan
+        # (a MATCH per beehive), which it does once ORDER BY is dropped,
+        # e.g. in the pagination count.
+        if not rank:
+            return query.filter(key.in_(select(_fts.c.rowid).where(matched)))
+        ranked = select(
+            _fts.c.rowid.label('rowid'),
+            func.bm25(fts_table).label('rank'),
+        ).select_from(_fts).where(matched).subquery()
+        return query.join(ranked, ranked.c.rowid + 0 == key).order_by(ranked.c.rank)
+
+    # Other databases: no full-text index, fall back to substring matching
+    for term in terms:
+        query = query.filter(Beehive.notes.ilike(f'%{term}%'))
+    return query
+
+
+class BeehiveSearchToken(db.Model):
+    """Accent-folded word of a beehive's serial number or notes"""
+    
+    __tablename__ = 'beehive_search_token'
+    
+    serial_number = db.Column(db.String(50), db.ForeignKey('beehive.serial_number', ondelete='CASCADE'), primary_key=True)
+    field = db.Column(db.String(16), primary_key=True)  # serial_number or notes
+    token = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_beehive_search_token_lookup', 'user_id', 'field', 'token'),
+    )
+
+
+def _serial_tokens(serial_number):
+    """Tokens for a serial number: the whole value and its numeric part, also without leading zeros (TO012 -> to012, 012, 12)"""
+    tokens = set(fold_words(serial_number))
+    digits = ''.join(ch for ch in serial_number or '' if ch.isdigit())
+    if digits:
+        tokens.add(digits)
+        tokens.add(digits.lstrip('0') or '0')
+    return tokens
+
+
+def _token_rows(beehive, fields=('serial_number', 'notes')):
+    rows = []
+    if 'serial_number' in fields:
+        rows += [('serial_number', token) for token in {t[:64] for t in _serial_tokens(beehive.serial_number)}]
+    if 'notes' in fields:
+        rows += [('notes', token) for token in {t[:64] for t in fold_words(beehive.notes)}]
+    return [
+        {'serial_number': beehive.serial_number, 'user_id': beehive.user_id, 'field': field, 'token': token}
+        for field, token in rows
+    ]
+
+
+@event.listens_for(Beehive, 'after_insert')
+def _index_beehive(mapper, connection, target):
+    rows = _token_rows(target)
+    if rows:
+        connection.execute(insert(BeehiveSearchToken.__table__), rows)
+
+
+@event.listens_for(Beehive, 'after_update')
+def _reindex_beehive_notes(mapper, connection, target):
+    if not inspect(target).attrs.notes.history.has_changes():
+        return
+    tokens = BeehiveSearchToken.__table__
+    connection.execute(delete(tokens).where(
+        tokens.c.serial_number == target.serial_number, tokens.c.field == 'notes'
+    ))
+    rows = _token_rows(target, fields=('notes',))
+    if rows:
+        connection.execute(insert(tokens), rows)
+
+
+@event.listens_for(Beehive, 'after_delete')
+def _unindex_beehive(mapper, connection, target):
+    tokens = BeehiveSearchToken.__table__
+    connection.execute(delete(tokens).where(tokens.c.serial_number == target.serial_number))
+
+
+def folded_match(user_id, field, text):
+    """Condition matching beehives whose field has a word starting with each word of text
+
+    Matching ignores case and diacritics. Returns None when text has no words.
+    """
+    conditions = []
+    for word in fold_words(text):
+        pattern = word[:64].replace('\\', '\\\\').replace('_', '\\_') + '%'
+        conditions.append(Beehive.serial_number.in_(
+            select(BeehiveSearchToken.serial_number).where(
+                BeehiveSearchToken.user_id == user_id,
+                BeehiveSearchToken.field == field,
+                BeehiveSearchToken.token.like(pattern, escape='\\'),
+            )
+        ))
+    return and_(*conditions) if conditions else None
+
+
+def rebuild_search_tokens(batch_size=500):
+    """Rebuild the folded search tokens of every beehive, returns the beehive count"""
+    tokens = BeehiveSearchToken.__table__
+    db.session.execute(delete(tokens))
+    count = 0
+    rows = []
+    for beehive in Beehive.query.yield_per(batch_size):
+        rows += _token_rows(beehive)
+        count += 1
+        if len(rows) >= batch_size:
+            db.session.execute(insert(tokens), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(tokens), rows)
+    db.session.commit()
+    return count
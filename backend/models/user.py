@@ -7,8 +7,11 @@ from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
-# Create a shared db instance
-db = SQLAlchemy()
+from ..utils.invalidation import user_scope
+from ..utils.db_routing import RoutingSession
+
+# Create a shared db instance (sessions route @read_only requests to replicas when configured)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(UserMixin, db.Model):
     """User model for authentication and business information"""
@@ -45,6 +48,10 @@ class User(UserMixin, db.Model):
         """Check password against hash"""
         return check_password_hash(self.password_hash, password)
     
+    def invalidation_scopes(self):
+        """Cache scopes to invalidate when this user changes"""
+        return [user_scope(self.id)]
+    
     def to_dict(self):
         """Convert user to dictionary for API responses"""
         return {
@@ -62,7 +69,7 @@ class User(UserMixin, db.Model):
                 'customMessage': self.qr_custom_message,
                 'footerText': self.qr_footer_text,
             },
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'createdAt': self.created_at,
         }
     
     def __repr__(self):
@@ -4,5 +4,7 @@ Routes package for KBee Manager
 
 from .auth import auth_bp
 from .beehives import beehives_bp
+from .metrics import metrics_bp, prometheus_bp
+from .health import health_bp
 
-__all__ = ['auth_bp', 'beehives_bp']
+__all__ = ['auth_bp', 'beehives_bp', 'metrics_bp', 'prometheus_bp', 'health_bp']
@@ -31,7 +31,7 @@ def login():
         try:
             user = User.query.filter_by(username=validated_data['username']).first()
         except Exception as db_error:
-            logger.error(f'Database error during login: {str(db_error)}')
+            logger.error('Database error during login: %s', db_error)
             raise DatabaseError('Cơ sở dữ liệu chưa sẵn sàng. Vui lòng thử lại.')
         
         if user and user.check_password(validated_data['password']):
@@ -41,14 +41,14 @@ def login():
                 expires_delta=timedelta(days=30)
             )
             
-            logger.info(f'User {user.username} logged in successfully')
+            logger.info('User %s logged in successfully', user.username)
             
             return jsonify({
                 'token': token,
                 'user': user.to_dict()
             }), 200
         
-        logger.warning(f'Failed login attempt for username: {validated_data["username"]}')
+        logger.warning('Failed login attempt for username: %s', validated_data["username"])
         raise AuthenticationError('Thông tin đăng nhập không hợp lệ')
         
     except ValidationError:
@@ -58,7 +58,7 @@ def login():
     except DatabaseError:
         raise
     except Exception as e:
-        logger.error(f'Login error: {str(e)}')
+        logger.error('Login error: %s', e)
         raise AuthenticationError('Đăng nhập thất bại')
 
 @auth_bp.route('/me', methods=['GET'])
@@ -77,7 +77,7 @@ def get_current_user():
     except NotFoundError:
         raise
     except Exception as e:
-        logger.error(f'Get current user error: {str(e)}')
+        logger.error('Get current user error: %s', e)
         raise DatabaseError('Không thể lấy thông tin người dùng')
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -87,12 +87,12 @@ def logout():
     try:
         # JWT tokens are stateless, so we just return success
         # In a more secure implementation, you might want to blacklist the token
-        logger.info(f'User {get_jwt_identity()} logged out')
+        logger.info('User %s logged out', get_jwt_identity())
         
         return jsonify({'message': 'Đăng xuất thành công'}), 200
         
     except Exception as e:
-        logger.error(f'Logout error: {str(e)}')
+        logger.error('Logout error: %s', e)
         raise AuthenticationError('Đăng xuất thất bại')
 
 @auth_bp.route('/profile', methods=['PUT'])
@@ -165,7 +165,7 @@ def update_profile():
         # Save changes
         db.session.commit()
         
-        logger.info(f'User {user.username} profile updated successfully')
+        logger.info('User %s profile updated successfully', user.username)
         
         return jsonify({
             'message': 'Cập nhật thông tin thành công',
@@ -178,7 +178,7 @@ def update_profile():
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Profile update error: {str(e)}')
+        logger.error('Profile update error: %s', e)
         raise DatabaseError('Không thể cập nhật thông tin người dùng')
 
 @auth_bp.route('/setup/check', methods=['GET'])
@@ -194,11 +194,11 @@ def check_setup():
                 return jsonify({'setup_needed': False}), 200
         except Exception as db_error:
             # Database tables don't exist yet
-            logger.error(f'Database not ready for setup check: {str(db_error)}')
+            logger.error('Database not ready for setup check: %s', db_error)
             return jsonify({'setup_needed': True, 'message': 'Cơ sở dữ liệu chưa sẵn sàng'}), 200
             
     except Exception as e:
-        logger.error(f'Setup check error: {str(e)}')
+        logger.error('Setup check error: %s', e)
         return jsonify({'setup_needed': True, 'message': f'Lỗi khi kiểm tra thiết lập: {str(e)}'}), 200
 
 @auth_bp.route('/setup', methods=['POST'])
@@ -207,9 +207,9 @@ def setup_admin():
     try:
         # Ensure database tables exist first
         try:
-            db.create_all()
+            db.create_all(bind_key=None)  # primary only, never the replicas
         except Exception as db_error:
-            logger.error(f'Error creating database tables: {str(db_error)}')
+            logger.error('Error creating database tables: %s', db_error)
             raise DatabaseError('Khởi tạo cơ sở dữ liệu thất bại')
         
         # Check if any users exist
@@ -221,7 +221,7 @@ def setup_admin():
                     'setup_completed': True
                 }), 400
         except Exception as db_error:
-            logger.error(f'Error checking existing users: {str(db_error)}')
+            logger.error('Error checking existing users: %s', db_error)
             raise DatabaseError('Database not ready for setup')
         
         data = request.get_json()
@@ -247,7 +247,7 @@ def setup_admin():
         db.session.add(admin)
         db.session.commit()
         
-        logger.info(f'Admin user {admin.username} created successfully')
+        logger.info('Admin user %s created successfully', admin.username)
         
         return jsonify({
             'message': 'Tạo tài khoản quản trị thành công',
@@ -261,5 +261,5 @@ def setup_admin():
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Setup error: {str(e)}')
+        logger.error('Setup error: %s', e)
         raise DatabaseError(f'Lỗi khi tạo tài khoản quản trị: {str(e)}')
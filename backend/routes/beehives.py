@@ -5,30 +5,80 @@ Beehive management routes for KBee Manager
 from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from datetime import datetime
+from sqlalchemy import func, or_
 import logging
 import io
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 
-from ..models import Beehive, User, db
-from ..utils.validators import BeehiveValidator, QueryValidator
+from ..models import Beehive, User, db, apply_fulltext_search, folded_match
+from ..utils.validators import Validator, BeehiveValidator, QueryValidator, HEALTH_CHOICES, SPECIES_CHOICES
 from ..utils.qr_generator import QRCodeGenerator
+from ..utils.cache import VersionedCache
+from ..utils.invalidation import user_scope
+from ..utils.db_routing import read_only
+from ..utils.metrics import render_timer
+from ..utils.http_cache import user_etag, is_not_modified, not_modified_response, add_etag
+from ..utils.representations import list_format, negotiated_response, to_columnar, wants_msgpack
 from ..utils.errors import NotFoundError, DatabaseError, ValidationError, handle_database_error, validation_error_handler
 
 logger = logging.getLogger(__name__)
 
 beehives_bp = Blueprint('beehives', __name__, url_prefix='/api')
 
+# Per-user aggregates and dashboards, invalidated across workers whenever the user's data changes
+stats_cache = VersionedCache(maxsize=512, name='stats')
+
+# Per-user serial-number suggestions, same invalidation
+suggest_cache = VersionedCache(maxsize=1024, name='suggest')
+
+def _apply_list_filters(query, query_params):
+    """Apply validated date and multi-value filters to a beehive list query
+
+    Ranges are inclusive and served by the (user_id, is_sold, <column>)
+    composite indexes.
+    """
+    for field, column in (('import_date', Beehive.import_date),
+                          ('split_date', Beehive.split_date),
+                          ('sold_date', Beehive.sold_date)):
+        value = QueryValidator.validate_date_filter(query_params, field)
+        if value:
+            query = query.filter(column == value)
+    
+    for prefix, column in (('import', Beehive.import_date), ('sold', Beehive.sold_date)):
+        start, end = QueryValidator.validate_date_range(query_params, f'{prefix}_from', f'{prefix}_to')
+        if start:
+            query = query.filter(column >= start)
+        if end:
+            query = query.filter(column <= end)
+    
+    health_statuses = QueryValidator.validate_multi_choice(query_params, 'health_status', HEALTH_CHOICES)
+    if health_statuses:
+        query = query.filter(Beehive.health_status.in_(health_statuses))
+    
+    species = QueryValidator.validate_multi_choice(query_params, 'species', SPECIES_CHOICES)
+    if species:
+        query = query.filter(Beehive.species.in_(species))
+    
+    return query
+
+def _serialize_beehives(items, fields=None):
+    """Serialize list items, either projected rows or full Beehive instances"""
+    if fields:
+        return [Beehive.row_to_dict(row, fields) for row in items]
+    return [beehive.to_dict() for beehive in items]
+
 @beehives_bp.route('/beehives', methods=['GET'])
 @jwt_required()
+@read_only
 def get_beehives():
     """Get paginated list of active beehives"""
     try:
         current_user_id = get_jwt_identity()
         
+        # Answer revalidations from the user's write version before querying
+        etag = user_etag(current_user_id, wants_msgpack())
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
         # Validate query parameters
         query_params = {
             'page': request.args.get('page', 1, type=int),
@@ -38,7 +88,14 @@ def get_beehives():
             'serialNumber': request.args.get('serialNumber', ''),
             'import_date': request.args.get('import_date', ''),
             'split_date': request.args.get('split_date', ''),
+            'import_from': request.args.get('import_from', ''),
+            'import_to': request.args.get('import_to', ''),
+            'health_status': request.args.getlist('health_status'),
+            'species': request.args.getlist('species'),
             'notes': request.args.get('notes', ''),
+            'q': request.args.get('q', ''),
+            'fields': request.args.get('fields', ''),
+            'view': request.args.get('view', 'full'),
         }
         
         # Validate pagination
@@ -48,43 +105,39 @@ def get_beehives():
         allowed_sort_fields = ['serial_number', 'created_at', 'import_date', 'split_date', 'health_status', 'species']
         sort_params = QueryValidator.validate_sort_params(query_params, allowed_sort_fields)
         
+        # Validate sparse fieldset / summary representation
+        fields = QueryValidator.validate_fields_params(query_params, Beehive.API_FIELDS, Beehive.SUMMARY_FIELDS)
+        list_fmt = list_format()
+        
         # Build query for active beehives
         query = Beehive.query.filter_by(user_id=current_user_id, is_sold=False)
         
-        # Apply filters with OR logic for general search
-        from sqlalchemy import or_
-        
-        # If both serialNumber and notes are provided, use OR logic
-        if query_params['serialNumber'] and query_params['notes']:
-            query = query.filter(or_(
-                Beehive.serial_number.like(f'%{query_params["serialNumber"]}%'),
-                Beehive.notes.like(f'%{query_params["notes"]}%')
-            ))
-        elif query_params['serialNumber']:
-            query = query.filter(Beehive.serial_number.like(f'%{query_params["serialNumber"]}%'))
-        elif query_params['notes']:
-            query = query.filter(Beehive.notes.like(f'%{query_params["notes"]}%'))
-        
-        # Apply date filters
-        if query_params['import_date']:
-            try:
-                import_date_obj = datetime.strptime(query_params['import_date'], '%Y-%m-%d').date()
-                query = query.filter(Beehive.import_date == import_date_obj)
-            except ValueError:
-                pass
-        
-        if query_params['split_date']:
-            try:
-                split_date_obj = datetime.strptime(query_params['split_date'], '%Y-%m-%d').date()
-                query = query.filter(Beehive.split_date == split_date_obj)
-            except ValueError:
-                pass
+        # Apply filters with OR logic for general search: accent-insensitive
+        # word-prefix matches served by the indexed search token table
+        search_conditions = [
+            condition for condition in (
+                folded_match(current_user_id, 'serial_number', query_params['serialNumber']),
+                folded_match(current_user_id, 'notes', query_params['notes']),
+            ) if condition is not None
+        ]
+        if search_conditions:
+            query = query.filter(or_(*search_conditions))
+        
+        # Apply date (exact and range) and multi-value filters
+        query = _apply_list_filters(query, query_params)
+        
+        # Full-text search over notes, ranked by relevance unless a sort was requested
+        rank_by_relevance = bool(query_params['q']) and 'sort_field' not in request.args
+        if query_params['q']:
+            query = apply_fulltext_search(query, query_params['q'], rank=rank_by_relevance)
         
         # Apply sorting
         sort_field = sort_params['sort_field']
         sort_order = sort_params['sort_order']
         
-        if sort_field == 'serial_number':
+        if rank_by_relevance:
+            pass  # already ordered by search relevance
+        elif sort_field == 'serial_number':
             query = query.order_by(Beehive.serial_number.desc() if sort_order == 'desc' else Beehive.serial_number.asc())
         elif sort_field == 'created_at':
             query = query.order_by(Beehive.created_at.desc() if sort_order == 'desc' else Beehive.created_at.asc())
@@ -97,6 +150,10 @@ def get_beehives():
         elif sort_field == 'species':
             query = query.order_by(Beehive.species.desc() if sort_order == 'desc' else Beehive.species.asc())
         
+        # Project only the requested columns, skipping ORM hydration
+        if fields:
+            query = query.with_entities(*Beehive.columns_for(fields))
+        
         # Pagination
         pagination = query.paginate(
             page=pagination_params['page'],
@@ -104,15 +161,15 @@ def get_beehives():
             error_out=False
         )
         
-        # Calculate health statistics (two buckets)
-        all_active_beehives = Beehive.query.filter_by(user_id=current_user_id, is_sold=False).all()
-        health_stats = {
-            'Tốt': len([b for b in all_active_beehives if b.health_status == 'Tốt']),
-            'Yếu': len([b for b in all_active_beehives if b.health_status == 'Yếu']),
-        }
+        # Health statistics (two buckets) from the shared aggregate
+        health_stats = _get_breakdown(current_user_id)['health_stats']
+        
+        beehives = _serialize_beehives(pagination.items, fields)
+        if list_fmt == 'columnar':
+            beehives = to_columnar(beehives, fields or Beehive.API_FIELDS)
         
-        return jsonify({
-            'beehives': [beehive.to_dict() for beehive in pagination.items],
+        return add_etag(negotiated_response({
+            'beehives': beehives,
             'pagination': {
                 'page': pagination.page,
                 'per_page': pagination.per_page,
@@ -122,21 +179,27 @@ def get_beehives():
                 'has_next': pagination.has_next,
             },
             'health_stats': health_stats
-        }), 200
+        }), etag), 200
         
     except ValidationError:
         raise
     except Exception as e:
-        logger.error(f'Get beehives error: {str(e)}')
+        logger.error('Get beehives error: %s', e)
         raise DatabaseError('Không thể tải danh sách tổ ong')
 
 @beehives_bp.route('/sold-beehives', methods=['GET'])
 @jwt_required()
+@read_only
 def get_sold_beehives():
     """Get paginated list of sold beehives"""
     try:
         current_user_id = get_jwt_identity()
         
+        # Answer revalidations from the user's write version before querying
+        etag = user_etag(current_user_id, wants_msgpack())
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
         # Validate query parameters
         query_params = {
             'page': request.args.get('page', 1, type=int),
@@ -146,7 +209,16 @@ def get_sold_beehives():
             'serialNumber': request.args.get('serialNumber', ''),
             'import_date': request.args.get('import_date', ''),
             'sold_date': request.args.get('sold_date', ''),
+            'import_from': request.args.get('import_from', ''),
+            'import_to': request.args.get('import_to', ''),
+            'sold_from': request.args.get('sold_from', ''),
+            'sold_to': request.args.get('sold_to', ''),
+            'health_status': request.args.getlist('health_status'),
+            'species': request.args.getlist('species'),
             'notes': request.args.get('notes', ''),
+            'q': request.args.get('q', ''),
+            'fields': request.args.get('fields', ''),
+            'view': request.args.get('view', 'full'),
         }
         
         # Validate pagination
@@ -156,42 +228,39 @@ def get_sold_beehives():
         allowed_sort_fields = ['serial_number', 'created_at', 'import_date', 'sold_date', 'health_status', 'species']
         sort_params = QueryValidator.validate_sort_params(query_params, allowed_sort_fields)
         
+        # Validate sparse fieldset / summary representation
+        fields = QueryValidator.validate_fields_params(query_params, Beehive.API_FIELDS, Beehive.SUMMARY_FIELDS)
+        list_fmt = list_format()
+        
         # Build query for sold beehives
         query = Beehive.query.filter_by(user_id=current_user_id, is_sold=True)
         
-        # Apply filters with OR logic for general search
-        from sqlalchemy import or_
-        
-        # If both serialNumber and notes are provided, use OR logic
-        if query_params['serialNumber'] and query_params['notes']:
-            query = query.filter(or_(
-                Beehive.serial_number.like(f'%{query_params["serialNumber"]}%'),
-                Beehive.notes.like(f'%{query_params["notes"]}%')
-            ))
-        elif query_params['serialNumber']:
-            query = query.filter(Beehive.serial_number.like(f'%{query_params["serialNumber"]}%'))
-        elif query_params['notes']:
-            query = query.filter(Beehive.notes.like(f'%{query_params["notes"]}%'))
-        
-        if query_params['import_date']:
-            try:
-                import_date_obj = datetime.strptime(query_params['import_date'], '%Y-%m-%d').date()
-                query = query.filter(Beehive.import_date == import_date_obj)
-            except ValueError:
-                pass
-        
-        if query_params['sold_date']:
-            try:
-                sold_date_obj = datetime.strptime(query_params['sold_date'], '%Y-%m-%d').date()
-                query = query.filter(Beehive.sold_date == sold_date_obj)
-            except ValueError:
-                pass
+        # Apply filters with OR logic for general search: accent-insensitive
+        # word-prefix matches served by the indexed search token table
+        search_conditions = [
+            condition for condition in (
+                folded_match(current_user_id, 'serial_number', query_params['serialNumber']),
+                folded_match(current_user_id, 'notes', query_params['notes']),
+            ) if condition is not None
+        ]
+        if search_conditions:
+            query = query.filter(or_(*search_conditions))
+        
+        # Apply date (exact and range) and multi-value filters
+        query = _apply_list_filters(query, query_params)
+        
+        # Full-text search over notes, ranked by relevance unless a sort was requested
+        rank_by_relevance = bool(query_params['q']) and 'sort_field' not in request.args
+        if query_params['q']:
+            query = apply_fulltext_search(query, query_params['q'], rank=rank_by_relevance)
         
         # Apply sorting
         sort_field = sort_params['sort_field']
         sort_order = sort_params['sort_order']
         
-        if sort_field == 'serial_number':
+        if rank_by_relevance:
+            pass  # already ordered by search relevance
+        elif sort_field == 'serial_number':
             query = query.order_by(Beehive.serial_number.desc() if sort_order == 'desc' else Beehive.serial_number.asc())
         elif sort_field == 'created_at':
             query = query.order_by(Beehive.created_at.desc() if sort_order == 'desc' else Beehive.created_at.asc())
@@ -204,6 +273,10 @@ def get_sold_beehives():
         elif sort_field == 'species':
             query = query.order_by(Beehive.species.desc() if sort_order == 'desc' else Beehive.species.asc())
         
+        # Project only the requested columns, skipping ORM hydration
+        if fields:
+            query = query.with_entities(*Beehive.columns_for(fields))
+        
         # Pagination
         pagination = query.paginate(
             page=pagination_params['page'],
@@ -211,8 +284,12 @@ def get_sold_beehives():
             error_out=False
         )
         
-        return jsonify({
-            'beehives': [beehive.to_dict() for beehive in pagination.items],
+        beehives = _serialize_beehives(pagination.items, fields)
+        if list_fmt == 'columnar':
+            beehives = to_columnar(beehives, fields or Beehive.API_FIELDS)
+        
+        return add_etag(negotiated_response({
+            'beehives': beehives,
             'pagination': {
                 'page': pagination.page,
                 'per_page': pagination.per_page,
@@ -221,40 +298,155 @@ def get_sold_beehives():
                 'has_prev': pagination.has_prev,
                 'has_next': pagination.has_next,
             }
-        }), 200
+        }), etag), 200
         
     except ValidationError:
         raise
     except Exception as e:
-        logger.error(f'Get sold beehives error: {str(e)}')
+        logger.error('Get sold beehives error: %s', e)
         raise DatabaseError('Không thể tải danh sách tổ ong đã bán')
 
+def _compute_breakdown(user_id):
+    """Count a user's beehives by sold flag, health and species in one aggregate query"""
+    rows = db.session.query(
+        Beehive.is_sold, Beehive.health_status, Beehive.species, func.count()
+    ).filter(Beehive.user_id == user_id).group_by(
+        Beehive.is_sold, Beehive.health_status, Beehive.species
+    ).all()
+    
+    total = active = sold = 0
+    health_stats = {'Tốt': 0, 'Yếu': 0}
+    species_stats = {'Furva Vàng': 0, 'Furva Đen': 0}
+    for is_sold, health_status, species, count in rows:
+        total += count
+        if is_sold:
+            sold += count
+        elif is_sold is not None:
+            active += count
+            health_stats[health_status] = health_stats.get(health_status, 0) + count
+            species_key = species or 'Furva Vàng'
+            species_stats[species_key] = species_stats.get(species_key, 0) + count
+    
+    return {
+        'stats': {
+            'total': total,
+            'active': active,
+            'sold': sold,
+            'healthy': health_stats['Tốt'],
+        },
+        'health_stats': health_stats,
+        'species_stats': species_stats,
+    }
+
+def _get_breakdown(user_id):
+    """Cached per-user breakdown shared by the list, stats and dashboard endpoints"""
+    return stats_cache.get_or_set(user_scope(user_id), 'breakdown', lambda: _compute_breakdown(user_id))
+
 @beehives_bp.route('/stats', methods=['GET'])
 @jwt_required()
+@read_only
 def get_stats():
     """Get beehive statistics"""
     try:
         current_user_id = get_jwt_identity()
         
-        all_beehives = Beehive.query.filter_by(user_id=current_user_id).all()
-        all_active_beehives = Beehive.query.filter_by(user_id=current_user_id, is_sold=False).all()
-        all_sold_beehives = Beehive.query.filter_by(user_id=current_user_id, is_sold=True).all()
+        return jsonify(_get_breakdown(current_user_id)['stats']), 200
+        
+    except Exception as e:
+        logger.error('Get stats error: %s', e)
+        raise DatabaseError('Không thể lấy thống kê')
+
+@beehives_bp.route('/dashboard', methods=['GET'])
+@jwt_required()
+@read_only
+def get_dashboard():
+    """Get first page of active beehives, counters and chart breakdowns in one call"""
+    try:
+        current_user_id = get_jwt_identity()
+        
+        etag = user_etag(current_user_id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        pagination_params = QueryValidator.validate_pagination_params({
+            'page': request.args.get('page', 1, type=int),
+            'per_page': request.args.get('per_page', 20, type=int),
+        })
+        page = pagination_params['page']
+        per_page = pagination_params['per_page']
+        
+        def build_dashboard():
+            breakdown = _get_breakdown(current_user_id)
+            # The aggregate already knows the active total, so skip paginate's COUNT
+            total = breakdown['stats']['active']
+            beehives = Beehive.query.filter_by(user_id=current_user_id, is_sold=False).order_by(
+                Beehive.created_at.desc()
+            ).offset((page - 1) * per_page).limit(per_page).all()
+            total_pages = (total + per_page - 1) // per_page
+            
+            return {
+                'beehives': [beehive.to_dict() for beehive in beehives],
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'total': total,
+                    'total_pages': total_pages,
+                    'has_prev': page > 1,
+                    'has_next': page < total_pages,
+                },
+                'stats': breakdown['stats'],
+                'health_stats': breakdown['health_stats'],
+                'species_stats': breakdown['species_stats'],
+            }
         
-        total_beehives = len(all_beehives)
-        active_beehives_count = len(all_active_beehives)
-        sold_beehives_count = len(all_sold_beehives)
-        healthy_beehives_count = len([b for b in all_active_beehives if b.health_status == 'Tốt'])
+        dashboard = stats_cache.get_or_set(
+            user_scope(current_user_id), ('dashboard', page, per_page), build_dashboard
+        )
         
-        return jsonify({
-            'total': total_beehives,
-            'active': active_beehives_count,
-            'sold': sold_beehives_count,
-            'healthy': healthy_beehives_count,
-        }), 200
+        return add_etag(jsonify(dashboard), etag), 200
         
+    except ValidationError:
+        raise
     except Exception as e:
-        logger.error(f'Get stats error: {str(e)}')
-        raise DatabaseError('Không thể lấy thống kê')
+        logger.error('Get dashboard error: %s', e)
+        raise DatabaseError('Không thể tải bảng điều khiển')
+
+@beehives_bp.route('/beehives/suggest', methods=['GET'])
+@jwt_required()
+@read_only
+def suggest_serial_numbers():
+    """Autocomplete serial numbers from a prefix using the (user_id, is_sold, serial_seq) index"""
+    try:
+        current_user_id = get_jwt_identity()
+        
+        prefix = request.args.get('prefix', '')
+        is_sold = Validator.validate_boolean(request.args, 'sold', default=False)
+        limit = Validator.validate_integer(request.args, 'limit', min_value=1, max_value=50) if 'limit' in request.args else 10
+        
+        def find_suggestions():
+            ranges = Beehive.serial_prefix_ranges(prefix)
+            if ranges == []:
+                return []
+            query = db.session.query(Beehive.serial_number).filter(
+                Beehive.user_id == current_user_id,
+                Beehive.is_sold == is_sold
+            )
+            if ranges:
+                query = query.filter(or_(*[Beehive.serial_seq.between(low, high) for low, high in ranges]))
+            rows = query.order_by(Beehive.serial_seq.asc()).limit(limit).all()
+            return [row.serial_number for row in rows]
+        
+        suggestions = suggest_cache.get_or_set(
+            user_scope(current_user_id), (prefix.strip().upper(), is_sold, limit), find_suggestions
+        )
+        
+        return jsonify({'suggestions': suggestions}), 200
+        
+    except ValidationError:
+        raise
+    except Exception as e:
+        logger.error('Suggest serial numbers error: %s', e)
+        raise DatabaseError('Không thể gợi ý mã tổ')
 
 @beehives_bp.route('/beehives', methods=['POST'])
 @jwt_required()
@@ -289,7 +481,7 @@ def create_beehive():
         db.session.add(beehive)
         db.session.commit()
         
-        logger.info(f'Beehive {serial_number} created successfully by user {current_user_id}')
+        logger.info('Beehive %s created successfully by user %s', serial_number, current_user_id)
         
         return jsonify(beehive.to_dict()), 201
         
@@ -297,26 +489,32 @@ def create_beehive():
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Create beehive error: {str(e)}')
+        logger.error('Create beehive error: %s', e)
         raise DatabaseError('Không thể tạo tổ ong')
 
 @beehives_bp.route('/beehives/<serial_number>', methods=['GET'])
 @jwt_required()
+@read_only
 def get_beehive(serial_number):
     """Get specific beehive details"""
     try:
         current_user_id = get_jwt_identity()
         
+        # Answer revalidations from the user's write version before querying
+        etag = user_etag(current_user_id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
         beehive = Beehive.query.filter_by(serial_number=serial_number, user_id=current_user_id).first()
         if not beehive:
             raise NotFoundError('Không tìm thấy tổ ong')
         
-        return jsonify(beehive.to_dict()), 200
+        return add_etag(jsonify(beehive.to_dict()), etag), 200
         
     except NotFoundError:
         raise
     except Exception as e:
-        logger.error(f'Get beehive error: {str(e)}')
+        logger.error('Get beehive error: %s', e)
         raise DatabaseError('Không thể lấy thông tin tổ ong')
 
 @beehives_bp.route('/beehives/<serial_number>', methods=['PUT'])
@@ -334,12 +532,9 @@ def update_beehive(serial_number):
         if not data:
             raise ValidationError('Thiếu dữ liệu đầu vào')
         
-        logger.info(f"Update beehive data received: {data}")
-        
         # Validate input
         validated_data = BeehiveValidator.validate_beehive_update_data(data)
-        
-        logger.info(f"Validated data: {validated_data}")
+        logger.debug('Update beehive %s with %s', serial_number, validated_data)
         
         # Business rule: If beehive is sold, block updates unless the request explicitly unsells it
         if beehive.is_sold:
@@ -360,20 +555,16 @@ def update_beehive(serial_number):
             beehive.notes = validated_data['notes']
         if 'is_sold' in validated_data:
             beehive.is_sold = validated_data['is_sold']
-            logger.info(f'Setting is_sold to {validated_data["is_sold"]}')
         if 'sold_date' in validated_data:
             # Only allow changing sold_date when setting is_sold True, or clearing when unselling
             if beehive.is_sold and validated_data.get('sold_date') is None:
                 beehive.sold_date = None
             elif validated_data.get('sold_date') is not None:
                 beehive.sold_date = validated_data['sold_date']
-            logger.info(f'Setting sold_date to {validated_data.get("sold_date")}')
         
-        logger.info(f'Before commit - is_sold: {beehive.is_sold}, sold_date: {beehive.sold_date}')
         db.session.commit()
-        logger.info(f'After commit - is_sold: {beehive.is_sold}, sold_date: {beehive.sold_date}')
         
-        logger.info(f'Beehive {serial_number} updated successfully by user {current_user_id}')
+        logger.info('Beehive %s updated by user %s (%s)', serial_number, current_user_id, ', '.join(sorted(validated_data)))
         
         return jsonify(beehive.to_dict()), 200
         
@@ -383,7 +574,7 @@ def update_beehive(serial_number):
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Update beehive error: {str(e)}')
+        logger.error('Update beehive error: %s', e)
         raise DatabaseError('Không thể cập nhật tổ ong')
 
 @beehives_bp.route('/beehives/<serial_number>', methods=['DELETE'])
@@ -400,7 +591,7 @@ def delete_beehive(serial_number):
         db.session.delete(beehive)
         db.session.commit()
         
-        logger.info(f'Beehive {serial_number} deleted successfully by user {current_user_id}')
+        logger.info('Beehive %s deleted successfully by user %s', serial_number, current_user_id)
         
         return jsonify({'message': 'Xóa tổ ong thành công'}), 200
         
@@ -408,7 +599,7 @@ def delete_beehive(serial_number):
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Delete beehive error: {str(e)}')
+        logger.error('Delete beehive error: %s', e)
         raise DatabaseError('Không thể xóa tổ ong')
 
 @beehives_bp.route('/beehives/<serial_number>/sell', methods=['POST'])
@@ -427,7 +618,7 @@ def sell_beehive(serial_number):
         
         db.session.commit()
         
-        logger.info(f'Beehive {serial_number} marked as sold by user {current_user_id}')
+        logger.info('Beehive %s marked as sold by user %s', serial_number, current_user_id)
         
         return jsonify(beehive.to_dict()), 200
         
@@ -435,7 +626,7 @@ def sell_beehive(serial_number):
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Sell beehive error: {str(e)}')
+        logger.error('Sell beehive error: %s', e)
         raise DatabaseError('Không thể đánh dấu đã bán')
 
 @beehives_bp.route('/beehives/<serial_number>/unsell', methods=['POST'])
@@ -454,7 +645,7 @@ def unsell_beehive(serial_number):
         
         db.session.commit()
         
-        logger.info(f'Beehive {serial_number} marked as not sold by user {current_user_id}')
+        logger.info('Beehive %s marked as not sold by user %s', serial_number, current_user_id)
         
         return jsonify(beehive.to_dict()), 200
         
@@ -462,10 +653,11 @@ def unsell_beehive(serial_number):
         raise
     except Exception as e:
         db.session.rollback()
-        logger.error(f'Unsell beehive error: {str(e)}')
+        logger.error('Unsell beehive error: %s', e)
         raise DatabaseError('Không thể bỏ trạng thái đã bán')
 
 @beehives_bp.route('/beehive/<qr_token>', methods=['GET'])
+@read_only
 def get_beehive_by_token(qr_token):
     """Get beehive by QR token (public endpoint with admin privileges)"""
     try:
@@ -511,11 +703,12 @@ def get_beehive_by_token(qr_token):
     except NotFoundError:
         raise
     except Exception as e:
-        logger.error(f'Get beehive by token error: {str(e)}')
+        logger.error('Get beehive by token error: %s', e)
         raise DatabaseError('Không thể lấy thông tin tổ ong')
 
 @beehives_bp.route('/qr/<serial_number>')
 @jwt_required()
+@read_only
 def qr_code(serial_number):
     """Generate QR code for beehive"""
     try:
@@ -530,11 +723,12 @@ def qr_code(serial_number):
     except NotFoundError:
         raise
     except Exception as e:
-        logger.error(f'QR code generation error: {str(e)}')
+        logger.error('QR code generation error: %s', e)
         raise DatabaseError('Không thể tạo mã QR')
 
 @beehives_bp.route('/export_pdf/<serial_number>')
 @jwt_required()
+@read_only
 def export_pdf(serial_number):
     """Export beehive information as PDF"""
     try:
@@ -544,6 +738,13 @@ def export_pdf(serial_number):
         if not beehive:
             raise NotFoundError('Không tìm thấy tổ ong')
         
+        # reportlab is heavy and only needed here; import it on first export
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import cm
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        
         # Create PDF
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
@@ -575,22 +776,24 @@ def export_pdf(serial_number):
         
         # Build PDF
         elements = [title, Spacer(1, 20), table]
-        doc.build(elements)
+        with render_timer('pdf'):
+            doc.build(elements)
         
         buffer.seek(0)
         
-        logger.info(f'PDF exported for beehive {serial_number} by user {current_user_id}')
+        logger.info('PDF exported for beehive %s by user %s', serial_number, current_user_id)
         
         return send_file(buffer, as_attachment=True, download_name=f'{beehive.serial_number}.pdf', mimetype='application/pdf')
         
     except NotFoundError:
         raise
     except Exception as e:
-        logger.error(f'PDF export error: {str(e)}')
+        logger.error('PDF export error: %s', e)
         raise DatabaseError('Không thể xuất PDF')
 
 @beehives_bp.route('/export_bulk_qr_pdf', methods=['POST'])
 @jwt_required()
+@read_only
 def export_bulk_qr_pdf():
     """Export multiple beehives with QR codes as PDF in 5x5 grid layout"""
     try:
@@ -610,6 +813,13 @@ def export_bulk_qr_pdf():
         if not beehives:
             raise NotFoundError('Không tìm thấy tổ ong nào')
         
+        # reportlab is heavy and only needed here; import it on first export
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import cm
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage
+        
         # Create PDF with QR codes
         buffer = io.BytesIO()
         # Set margins to 1.5cm on all sides
@@ -658,7 +868,7 @@ def export_bulk_qr_pdf():
                     
                     qr_cells.append(qr_table)
                 except Exception as e:
-                    logger.error(f'Error generating QR for {beehive.serial_number}: {str(e)}')
+                    logger.error('Error generating QR for %s: %s', beehive.serial_number, e)
                     # Fallback: just show serial number
                     qr_cells.append(Paragraph(f'<para align="center"><b>{beehive.serial_number}</b></para>', styles['Normal']))
             
@@ -690,12 +900,13 @@ def export_bulk_qr_pdf():
             
             elements.append(grid_table)
         
-        doc.build(elements)
+        with render_timer('bulk_qr_pdf'):
+            doc.build(elements)
         buffer.seek(0)
         
         filename = f'QR_to_ong_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.pdf'
         
-        logger.info(f'Bulk QR PDF exported for {len(beehives)} beehives by user {current_user_id}')
+        logger.info('Bulk QR PDF exported for %d beehives by user %s', len(beehives), current_user_id)
         
         return send_file(
             buffer,
@@ -709,5 +920,5 @@ def export_bulk_qr_pdf():
     except NotFoundError:
         raise
     except Exception as e:
-        logger.error(f'Bulk QR PDF export error: {str(e)}')
+        logger.error('Bulk QR PDF export error: %s', e)
         raise DatabaseError('Không thể xuất PDF QR hàng loạt')
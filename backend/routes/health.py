@@ -0,0 +1,33 @@
+"""
+Health check routes for KBee Manager
+
+* /healthz/live  - the worker answers; touches no dependency (restart when failing)
+* /healthz/ready - dependency latency and pool headroom (stop routing when failing)
+"""
+
+from flask import Blueprint, jsonify
+import logging
+import os
+
+from ..utils.db_routing import read_only
+from ..utils.health import readiness
+
+logger = logging.getLogger(__name__)
+
+health_bp = Blueprint('health', __name__, url_prefix='/healthz')
+
+@health_bp.route('/live', methods=['GET'])
+def liveness():
+    """The worker process is serving requests"""
+    return jsonify({'status': 'alive', 'pid': os.getpid()}), 200
+
+@health_bp.route('/ready', methods=['GET'])
+@read_only
+def readiness_check():
+    """Database, pool and Redis checks (cached for a few seconds)"""
+    report = readiness.check()
+    if not report['ready']:
+        logger.warning('Not ready: %s', {name: check for name, check in report['checks'].items() if not check['ok']})
+    
+    report['pid'] = os.getpid()
+    return jsonify(report), 200 if report['ready'] else 503
@@ -0,0 +1,79 @@
+"""
+Operational metrics routes for KBee Manager
+"""
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_from_directory
+from flask_jwt_extended import jwt_required
+import hmac
+import logging
+import os
+
+from ..models import db
+from ..utils.db_pool import pool_status
+from ..utils.errors import AuthenticationError, AuthorizationError, DatabaseError, NotFoundError
+from ..utils.metrics import render_latest
+from ..utils.profiler import PROFILE_EXTENSIONS, PROFILE_TOKEN_HEADER, profiler
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+# Prometheus scrape endpoint, served at the root (nginx only proxies /api)
+prometheus_bp = Blueprint('prometheus', __name__)
+
+@metrics_bp.route('/db-pool', methods=['GET'])
+@jwt_required()
+def get_db_pool_metrics():
+    """Connection pool usage and checkout latency of this worker process"""
+    try:
+        engines = {
+            bind_key or 'default': pool_status(engine)
+            for bind_key, engine in db.engines.items()
+        }
+        
+        return jsonify({
+            'pid': os.getpid(),
+            'engines': engines,
+        }), 200
+        
+    except Exception as e:
+        logger.error('Get DB pool metrics error: %s', e)
+        raise DatabaseError('Không thể tải số liệu kết nối cơ sở dữ liệu')
+
+def _require_profile_token():
+    if not profiler.has_token():
+        raise AuthorizationError(f'Cần header {PROFILE_TOKEN_HEADER} hợp lệ')
+
+@metrics_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+def list_profiles():
+    """Stored request profiles of all workers, newest first"""
+    _require_profile_token()
+    
+    return jsonify({'profiles': profiler.list_profiles()}), 200
+
+@metrics_bp.route('/profiles/<name>', methods=['GET'])
+@jwt_required()
+def download_profile(name):
+    """Download one .pstats / .collapsed profile"""
+    _require_profile_token()
+    
+    if not name.endswith(PROFILE_EXTENSIONS) or name not in {p['name'] for p in profiler.list_profiles()}:
+        raise NotFoundError('Không tìm thấy profile')
+    
+    return send_from_directory(profiler.directory, name, as_attachment=True)
+
+@prometheus_bp.route('/metrics', methods=['GET'])
+def get_prometheus_metrics():
+    """Prometheus text exposition of every worker's metrics"""
+    if not current_app.config.get('METRICS_ENABLED', True):
+        raise NotFoundError('Không tìm thấy')
+    
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            raise AuthenticationError('Token không hợp lệ')
+    
+    body, content_type = render_latest()
+    return Response(body, content_type=content_type)
@@ -0,0 +1,60 @@
+"""
+In-process caching utilities for KBee Manager
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .db_routing import reads_from_replica
+from .invalidation import invalidation_bus
+from .metrics import record_cache
+
+
+class VersionedCache:
+    """Bounded LRU cache whose entries expire when their invalidation scope changes"""
+
+    def __init__(self, maxsize: int = 256, name: str = 'default'):
+        self.maxsize = maxsize
+        self.name = name  # label of the hit/miss metrics
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, scope: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for (scope, key), computing it with factory on a miss"""
+        # Read the version before computing so a concurrent write can never be
+        # stored under the newer version
+        version = invalidation_bus.version(scope)
+        if version is None:
+            self.misses += 1
+            record_cache(self.name, False)
+            return factory()
+
+        cache_key = (scope, key)
+        with self._lock:
+            entry = self._data.get(cache_key)
+            if entry is not None and entry[0] == version:
+                self._data.move_to_end(cache_key)
+                self.hits += 1
+                record_cache(self.name, True)
+                return entry[1]
+
+        self.misses += 1
+        record_cache(self.name, False)
+        value = factory()
+        if reads_from_replica():
+            # A lagging replica's data may predate version; don't pin it to it
+            return value
+        with self._lock:
+            self._data[cache_key] = (version, value)
+            self._data.move_to_end(cache_key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,136 @@
+"""
+Response compression for KBee Manager
+
+Compresses responses according to Accept-Encoding (brotli when installed and
+accepted, gzip otherwise). Small bodies and content types that do not
+benefit are left alone, streamed responses such as PDF exports are
+compressed chunk by chunk, and compressed bodies of ETag-cached responses
+are kept in a small LRU so repeated downloads are not recompressed.
+"""
+
+import zlib
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+from .metrics import record_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class Compression:
+    """after_request hook compressing eligible responses"""
+
+    def __init__(self, app=None):
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('COMPRESS_ENABLED', True)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+        self.mimetypes = set(app.config.get('COMPRESS_MIMETYPES', ['application/json']))
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        self.cache_size = app.config.get('COMPRESS_CACHE_SIZE', 128)
+        self._cache.clear()
+        app.after_request(self.after_request)
+
+    def choose_encoding(self):
+        """Preferred supported encoding from Accept-Encoding, or None"""
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks, encoding: str):
+        """Compress an iterable of chunks incrementally"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            process, finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+            process, finish = compressor.compress, compressor.flush
+        try:
+            for chunk in chunks:
+                data = process(chunk)
+                if data:
+                    yield data
+            yield finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+
+    def _cached(self, key, data, encoding):
+        """Compressed bytes for an ETag-identified body, compressing on a miss"""
+        with self._cache_lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+        if compressed is not None:
+            record_cache('compression', True)
+            return compressed
+        record_cache('compression', False)
+        compressed = self.compress(data, encoding)
+        with self._cache_lock:
+            self._cache[key] = compressed
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compressed
+
+    def after_request(self, response):
+        if (not self.enabled
+                or request.method == 'HEAD'
+                or response.status_code < 200
+                or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.mimetypes):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding()
+        if encoding is None:
+            return response
+
+        if response.direct_passthrough or response.is_streamed:
+            # Streaming mode: large exports are compressed as they are sent
+            if response.content_length is not None and response.content_length < self.min_size:
+                return response
+            response.response = self.stream(iter(response.response), encoding)
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+            response.headers.pop('Accept-Ranges', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            etag = response.headers.get('ETag')
+            if etag:
+                compressed = self._cached((request.path, etag, encoding), data, encoding)
+            else:
+                compressed = self.compress(data, encoding)
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+        # The encoded body differs byte-for-byte, so only a weak validator still holds
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response.headers['ETag'] = f'W/{etag}'
+        return response
+
+
+compression = Compression()
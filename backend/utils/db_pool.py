@@ -0,0 +1,131 @@
+"""
+Database connection pool instrumentation for KBee Manager
+
+Engines get an instrumented QueuePool that times every checkout (waiting
+for a free connection, plus opening a new one when the pool grows) and
+counts checkout timeouts. Together with the pool's own counters this shows
+how close each worker is to pool saturation. Checkouts are also exported
+to Prometheus (summed over workers, see metrics.py).
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, List
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout latency histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+POOL_CHECKOUT = Histogram(
+    'kbee_db_pool_checkout_seconds', 'Wait for a pooled database connection', buckets=CHECKOUT_BUCKETS,
+)
+POOL_TIMEOUTS = Counter(
+    'kbee_db_pool_checkout_timeouts_total', 'Checkouts that gave up after pool_timeout',
+)
+
+
+class CheckoutStats:
+    """Checkout latency counters for one pool (per process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.timeouts = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+            self.bucket_counts = [0] * (len(CHECKOUT_BUCKETS) + 1)  # last bucket is +Inf
+
+    def observe(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self.bucket_counts[bisect.bisect_left(CHECKOUT_BUCKETS, seconds)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'count': self.count,
+                'timeouts': self.timeouts,
+                'avg_ms': round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+                'max_ms': round(self.max_seconds * 1000, 3),
+                'total_seconds': self.total_seconds,
+                'buckets': dict(zip([str(b) for b in CHECKOUT_BUCKETS] + ['+Inf'], self.bucket_counts)),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        # Keep the counters when the engine recreates its pool (dispose)
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_stats.observe(time.perf_counter() - start, timed_out=True)
+            POOL_TIMEOUTS.inc()
+            raise
+        elapsed = time.perf_counter() - start
+        self.checkout_stats.observe(elapsed)
+        POOL_CHECKOUT.observe(elapsed)
+        return connection
+
+
+def use_instrumented_pool(app):
+    """Make pooled engines use InstrumentedQueuePool (call before db.init_app)"""
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # In-memory SQLite shares one static connection
+        return
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Current state and checkout latency of an engine's pool"""
+    pool = engine.pool
+    status: Dict[str, Any] = {'class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+            'timeout_seconds': pool.timeout(),
+        })
+    stats = getattr(pool, 'checkout_stats', None)
+    if stats is not None:
+        status['checkout'] = stats.snapshot()
+    return status
+
+
+def reset_checkout_stats(engines: List) -> None:
+    """Clear latency counters (e.g. in a freshly forked worker)"""
+    for engine in engines:
+        stats = getattr(engine.pool, 'checkout_stats', None)
+        if stats is not None:
+            stats.reset()
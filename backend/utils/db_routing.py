@@ -0,0 +1,237 @@
+"""
+Read-replica routing for KBee Manager
+
+When DATABASE_REPLICA_URLS is set, each replica becomes an SQLAlchemy bind
+(``replica_0``, ``replica_1``, ...). Route handlers marked ``@read_only``
+(lists, stats, public scans, exports) send their queries to a replica;
+everything else, and anything that flushes, uses the primary.
+
+* Read-your-writes: after a user's transaction commits, that user's reads
+  stay on the primary for DB_REPLICA_STICKY_SECONDS, in every worker (the
+  marker is kept next to the cache invalidation counters: Redis or shared
+  memory). The written scopes are the ones the invalidation bus collects
+  and publishes on commit.
+* Fallback: health is tracked from real failures, without probing every
+  request. A replica whose connection fails (opened when the request's
+  first query picks its bind) or drops mid-query is skipped for
+  DB_REPLICA_RETRY_SECONDS; the request falls back to the next replica or
+  the primary.
+* Replicas may lag the primary's invalidation versions, so data read from
+  them is never stored in version-keyed caches or given an ETag (see
+  ``reads_from_replica``).
+"""
+
+import itertools
+import logging
+import threading
+import time
+from functools import wraps
+from typing import Dict, List, Optional
+
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+
+from .invalidation import RedisVersionStore, SharedMemoryVersionStore, invalidation_bus, user_scope
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_PREFIX = 'replica_'
+STICKY_KEY_PREFIX = 'kbee:sticky:'
+
+
+class StickyWrites:
+    """Remembers, across workers, which scopes were written in the last few seconds"""
+
+    def __init__(self):
+        self.window = 0.0
+        self._client = None
+        self._shm = None
+        self._local: Dict[str, float] = {}
+
+    def init_app(self, app, window: float):
+        self.window = window
+        self._local = {}
+        self._client = None
+        self._shm = None
+        store = invalidation_bus.store
+        if isinstance(store, RedisVersionStore):
+            self._client = store.client
+        else:
+            self._shm = SharedMemoryVersionStore(app.config['INVALIDATION_SHM_PATH'] + '.writes')
+
+    def mark(self, scopes):
+        """Record a committed write to each scope"""
+        if self.window <= 0:
+            return
+        now = time.time()
+        for scope in scopes:
+            self._local[scope] = now
+        try:
+            if self._client is not None:
+                pipe = self._client.pipeline()
+                for scope in scopes:
+                    pipe.set(STICKY_KEY_PREFIX + scope, 1, px=int(self.window * 1000))
+                pipe.execute()
+            elif self._shm is not None:
+                for scope in scopes:
+                    self._shm.set(scope, int(now * 1000))
+        except Exception as e:
+            logger.error('Cannot record recent write for %s: %s', scopes, e)
+
+    def is_recent(self, scope: str) -> bool:
+        """Whether scope was written within the window (errors count as recent)"""
+        if self.window <= 0:
+            return False
+        now = time.time()
+        if now - self._local.get(scope, 0) < self.window:
+            return True
+        try:
+            if self._client is not None:
+                return bool(self._client.exists(STICKY_KEY_PREFIX + scope))
+            if self._shm is not None:
+                return now * 1000 - self._shm.get(scope) < self.window * 1000
+        except Exception as e:
+            logger.error('Cannot read recent writes for %s: %s', scope, e)
+            return True
+        return False
+
+
+class ReplicaRouter:
+    """Chooses the engine for read-only requests"""
+
+    def __init__(self, app=None):
+        self.bind_keys: List[str] = []
+        self.sticky = StickyWrites()
+        self._down_until: Dict[str, float] = {}
+        self._bind_keys_by_engine = {}
+        self._cycle = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register replica binds (call before db.init_app) and session hooks"""
+        urls = app.config.get('DATABASE_REPLICA_URLS') or []
+        self.retry_seconds = app.config.get('DB_REPLICA_RETRY_SECONDS', 30)
+        self.bind_keys = [f'{REPLICA_BIND_PREFIX}{i}' for i in range(len(urls))]
+        self._down_until = {}
+        self._bind_keys_by_engine = {}
+        self._cycle = itertools.cycle(self.bind_keys) if self.bind_keys else None
+
+        if self.bind_keys:
+            binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+            binds.update(zip(self.bind_keys, urls))
+            app.config['SQLALCHEMY_BINDS'] = binds
+            self.sticky.init_app(app, app.config.get('DB_REPLICA_STICKY_SECONDS', 5))
+            app.logger.info('Read-only requests routed to %d replica(s)', len(urls))
+
+        app.extensions['kbee_replica_router'] = self
+        invalidation_bus.on_commit(_mark_written_scopes)
+
+    def _current_user_scope(self) -> Optional[str]:
+        from flask_jwt_extended import get_jwt_identity
+        try:
+            user_id = get_jwt_identity()
+        except RuntimeError:
+            # Public endpoint, no token verified
+            return None
+        return user_scope(user_id) if user_id is not None else None
+
+    def _next_engine(self, engines):
+        """Next replica engine not marked down, or None (no connection is made)"""
+        now = time.time()
+        for _ in range(len(self.bind_keys)):
+            with self._lock:
+                bind_key = next(self._cycle)
+            if self._down_until.get(bind_key, 0) > now:
+                continue
+            engine = engines[bind_key]
+            if engine not in self._bind_keys_by_engine:
+                self._bind_keys_by_engine[engine] = bind_key
+                event.listen(engine, 'handle_error', self._on_engine_error)
+            return engine
+        return None
+
+    def _on_engine_error(self, context):
+        # Connection lost mid-query; SQL errors leave the replica in rotation
+        if context.is_disconnect:
+            self.replica_failed(context.engine, context.original_exception)
+
+    def replica_failed(self, engine, error):
+        """Skip the replica behind engine for DB_REPLICA_RETRY_SECONDS"""
+        bind_key = self._bind_keys_by_engine.get(engine)
+        if bind_key is None:
+            return
+        if self._down_until.get(bind_key, 0) <= time.time():
+            logger.warning('Replica %s unavailable, skipping it for %ss: %s', bind_key, self.retry_seconds, error)
+        self._down_until[bind_key] = time.time() + self.retry_seconds
+        if has_request_context() and g.get('db_replica_engine') is engine:
+            # Choose again: the next replica or the primary
+            g.pop('db_replica_engine')
+
+    def engine_for_request(self, engines):
+        """Replica engine for the current request, or None for the primary"""
+        if not self.bind_keys or not has_request_context() or not g.get('db_read_only'):
+            return None
+        if 'db_replica_engine' not in g:
+            scope = self._current_user_scope()
+            if g.get('db_wrote') or (scope and self.sticky.is_recent(scope)):
+                g.db_replica_engine = None
+            else:
+                g.db_replica_engine = self._next_engine(engines)
+        return g.db_replica_engine
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(FlaskSession):
+    """Session sending reads of @read_only requests to a replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            engine = replica_router.engine_for_request(self._db.engines)
+            while engine is not None:
+                try:
+                    # Open (or reuse) this session's connection to the replica
+                    # now, so an unreachable one falls back instead of failing
+                    self.connection(bind_arguments={'bind': engine})
+                    return engine
+                except DBAPIError as e:
+                    replica_router.replica_failed(engine, e)
+                    engine = replica_router.engine_for_request(self._db.engines)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def reads_from_replica() -> bool:
+    """Whether the current request's queries go to a replica
+
+    A replica may not have applied every write counted in the primary's
+    invalidation versions yet, so what it returns must not be cached or
+    validated under those versions.
+    """
+    if not replica_router.bind_keys or not has_request_context():
+        return False
+    from ..models import db
+    return replica_router.engine_for_request(db.engines) is not None
+
+
+def read_only(view):
+    """Mark a route handler as read-only so its queries may use a replica"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _mark_written_scopes(scopes):
+    """Commit callback of the invalidation bus, with the scopes it published"""
+    if has_request_context():
+        # Later reads in this request must see the write
+        g.db_wrote = True
+        g.pop('db_replica_engine', None)
+    if replica_router.bind_keys:
+        replica_router.sticky.mark(scopes)
@@ -7,6 +7,8 @@ from werkzeug.exceptions import HTTPException
 import logging
 import traceback
 
+from .request_log import current_request_id
+
 logger = logging.getLogger(__name__)
 
 class KBeeError(Exception):
@@ -61,12 +63,13 @@ def register_error_handlers(app):
     @app.errorhandler(KBeeError)
     def handle_kbee_error(error):
         """Handle custom KBee errors"""
-        logger.warning(f"KBee Error: {error.message}")
+        logger.warning("KBee Error: %s", error.message)
         
         response = {
             'error': True,
             'message': error.message,
-            'status_code': error.status_code
+            'status_code': error.status_code,
+            'request_id': current_request_id()
         }
         
         if error.payload:
@@ -77,13 +80,14 @@ def register_error_handlers(app):
     @app.errorhandler(ValidationError)
     def handle_validation_error(error):
         """Handle validation errors"""
-        logger.warning(f"Validation Error: {error.message}")
+        logger.warning("Validation Error: %s", error.message)
         
         response = {
             'error': True,
             'message': error.message,
             'status_code': 400,
-            'type': 'validation_error'
+            'type': 'validation_error',
+            'request_id': current_request_id()
         }
         
         if error.field:
@@ -94,68 +98,73 @@ def register_error_handlers(app):
     @app.errorhandler(AuthenticationError)
     def handle_auth_error(error):
         """Handle authentication errors"""
-        logger.warning(f"Authentication Error: {error.message}")
+        logger.warning("Authentication Error: %s", error.message)
         
         return jsonify({
             'error': True,
             'message': error.message,
             'status_code': 401,
-            'type': 'authentication_error'
+            'type': 'authentication_error',
+            'request_id': current_request_id()
         }), 401
     
     @app.errorhandler(AuthorizationError)
     def handle_authorization_error(error):
         """Handle authorization errors"""
-        logger.warning(f"Authorization Error: {error.message}")
+        logger.warning("Authorization Error: %s", error.message)
         
         return jsonify({
             'error': True,
             'message': error.message,
             'status_code': 403,
-            'type': 'authorization_error'
+            'type': 'authorization_error',
+            'request_id': current_request_id()
         }), 403
     
     @app.errorhandler(NotFoundError)
     def handle_not_found_error(error):
         """Handle not found errors"""
-        logger.warning(f"Not Found Error: {error.message}")
+        logger.warning("Not Found Error: %s", error.message)
         
         return jsonify({
             'error': True,
             'message': error.message,
             'status_code': 404,
-            'type': 'not_found_error'
+            'type': 'not_found_error',
+            'request_id': current_request_id()
         }), 404
     
     @app.errorhandler(DatabaseError)
     def handle_database_error(error):
         """Handle database errors"""
-        logger.error(f"Database Error: {error.message}")
+        logger.error("Database Error: %s", error.message)
         
         return jsonify({
             'error': True,
             'message': 'Thao tác cơ sở dữ liệu thất bại',
             'status_code': 500,
-            'type': 'database_error'
+            'type': 'database_error',
+            'request_id': current_request_id()
         }), 500
     
     @app.errorhandler(HTTPException)
     def handle_http_exception(error):
         """Handle HTTP exceptions"""
-        logger.warning(f"HTTP Exception: {error.code} - {error.description}")
+        logger.warning("HTTP Exception: %s - %s", error.code, error.description)
         
         return jsonify({
             'error': True,
             'message': error.description,
             'status_code': error.code,
-            'type': 'http_error'
+            'type': 'http_error',
+            'request_id': current_request_id()
         }), error.code
     
     @app.errorhandler(Exception)
     def handle_generic_exception(error):
         """Handle generic exceptions"""
-        logger.error(f"Unhandled Exception: {str(error)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Unhandled Exception: %s", error)
+        logger.error("Traceback: %s", traceback.format_exc())
         
         # Don't expose internal errors in production
         if app.config.get('FLASK_ENV') == 'production':
@@ -167,7 +176,8 @@ def register_error_handlers(app):
             'error': True,
             'message': message,
             'status_code': 500,
-            'type': 'internal_error'
+            'type': 'internal_error',
+            'request_id': current_request_id()
         }), 500
 
 def handle_database_error(func):
@@ -176,7 +186,7 @@ def handle_database_error(func):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Database error in {func.__name__}: {str(e)}")
+            logger.error("Database error in %s: %s", func.__name__, e)
             raise DatabaseError("Thao tác cơ sở dữ liệu thất bại")
     return db_wrapper
 
@@ -186,9 +196,9 @@ def validation_error_handler(func):
         try:
             return func(*args, **kwargs)
         except ValueError as e:
-            logger.warning(f"Validation error in {func.__name__}: {str(e)}")
+            logger.warning("Validation error in %s: %s", func.__name__, e)
             raise ValidationError(str(e))
         except TypeError as e:
-            logger.warning(f"Type error in {func.__name__}: {str(e)}")
+            logger.warning("Type error in %s: %s", func.__name__, e)
             raise ValidationError("Kiểu dữ liệu không hợp lệ")
     return validation_wrapper
@@ -0,0 +1,142 @@
+"""
+Readiness checks for KBee Manager
+
+/healthz/ready times a trivial query on the primary (and each replica), a
+Redis ping and the connection pool's free capacity, and compares them with
+the HEALTH_* thresholds. The result is cached per worker for
+HEALTH_CACHE_SECONDS so frequent probes cost at most one round of checks.
+
+* The primary and the pool are required: when the primary is down or slower
+  than its threshold, or the pool has too few free connections, the worker
+  reports not ready (HTTP 503) so the load balancer stops sending it traffic.
+* Redis and the replicas have fallbacks (shared memory, the primary); when
+  they fail the worker reports ``degraded`` but stays ready.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from .invalidation import RedisVersionStore, invalidation_bus
+
+
+def _timed(check) -> Dict[str, Any]:
+    """Run check(), returning its latency and any error"""
+    start = time.perf_counter()
+    try:
+        check()
+        error = None
+    except Exception as e:
+        error = str(e)
+    result = {'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+    if error:
+        result['error'] = error
+    return result
+
+
+class ReadinessProbe:
+    """Cached dependency checks behind /healthz/ready"""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+        self._redis = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.cache_seconds = app.config.get('HEALTH_CACHE_SECONDS', 2.0)
+        self.db_threshold_ms = app.config.get('HEALTH_DB_THRESHOLD_MS', 250)
+        self.redis_threshold_ms = app.config.get('HEALTH_REDIS_THRESHOLD_MS', 100)
+        self.min_pool_headroom = app.config.get('HEALTH_POOL_MIN_HEADROOM', 1)
+        self.redis_url = app.config.get('REDIS_URL')
+        self._result = None
+        self._checked_at = 0.0
+        self._redis = None
+        app.extensions['kbee_readiness'] = self
+
+    def check(self) -> Dict[str, Any]:
+        """Latest readiness report, re-running the checks when the cached one is stale"""
+        with self._lock:
+            age = time.monotonic() - self._checked_at
+            if self._result is None or age >= self.cache_seconds:
+                self._result = self._run()
+                self._checked_at = time.monotonic()
+                age = 0.0
+            return dict(self._result, cached=age > 0, age_seconds=round(age, 3))
+
+    def _run(self) -> Dict[str, Any]:
+        from ..models import db
+        from .db_routing import REPLICA_BIND_PREFIX
+
+        checks = {}
+        pool = self._check_pool(db.engine)
+        checks['pool'] = pool
+        if pool['ok']:
+            checks['database'] = self._check_engine(db.engine)
+        else:
+            # A full pool would make the query wait pool_timeout
+            checks['database'] = {'ok': False, 'error': 'skipped: no free connection', 'threshold_ms': self.db_threshold_ms}
+        for bind_key, engine in db.engines.items():
+            if bind_key and bind_key.startswith(REPLICA_BIND_PREFIX):
+                checks[bind_key] = dict(self._check_engine(engine), required=False)
+        checks['redis'] = self._check_redis()
+
+        ready = all(check['ok'] for check in checks.values() if check.get('required', True))
+        degraded = not all(check['ok'] for check in checks.values())
+        return {
+            'ready': ready,
+            'status': 'not_ready' if not ready else 'degraded' if degraded else 'ready',
+            'checks': checks,
+        }
+
+    def _check_engine(self, engine) -> Dict[str, Any]:
+        def query():
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+
+        result = _timed(query)
+        result['threshold_ms'] = self.db_threshold_ms
+        result['ok'] = 'error' not in result and result['latency_ms'] <= self.db_threshold_ms
+        return result
+
+    def _check_pool(self, engine) -> Dict[str, Any]:
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return {'ok': True, 'class': type(pool).__name__}
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        in_use = pool.checkedout()
+        headroom = capacity - in_use
+        return {
+            'ok': headroom >= self.min_pool_headroom,
+            'capacity': capacity,
+            'in_use': in_use,
+            'headroom': headroom,
+            'min_headroom': self.min_pool_headroom,
+        }
+
+    def _redis_client(self):
+        store = invalidation_bus.store
+        if isinstance(store, RedisVersionStore):
+            return store.client
+        if self._redis is None and self.redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        return self._redis
+
+    def _check_redis(self) -> Dict[str, Any]:
+        client = self._redis_client()
+        if client is None:
+            return {'ok': True, 'required': False, 'configured': False}
+        result = _timed(client.ping)
+        result['threshold_ms'] = self.redis_threshold_ms
+        result['ok'] = 'error' not in result and result['latency_ms'] <= self.redis_threshold_ms
+        result['required'] = False
+        return result
+
+
+readiness = ReadinessProbe()
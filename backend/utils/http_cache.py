@@ -0,0 +1,52 @@
+"""
+HTTP conditional request helpers for KBee Manager
+"""
+
+import hashlib
+from typing import Optional
+
+from flask import request, make_response
+
+from .. import __version__
+from .db_routing import reads_from_replica
+from .invalidation import invalidation_bus, user_scope
+
+
+def user_etag(user_id, *parts) -> Optional[str]:
+    """Weak ETag derived from the user's write version and the request shape
+
+    The version includes the store's epoch, so a reset store (counters back
+    at 0) never hands out an ETag issued before the reset. Returns None when
+    the version is unknown, or when the request reads from a replica that
+    may not have applied it yet, in which case the response must not be
+    treated as cacheable.
+    """
+    if reads_from_replica():
+        return None
+    version = invalidation_bus.version(user_scope(user_id))  # (epoch, counter)
+    if version is None:
+        return None
+
+    args = sorted(request.args.items(multi=True))
+    key = repr((__version__, user_id, version, request.path, args) + parts)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def is_not_modified(etag: Optional[str]) -> bool:
+    """Whether the client already holds the representation identified by etag"""
+    return bool(etag) and request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag: str):
+    """Empty 304 response carrying the validator headers"""
+    return add_etag(make_response('', 304), etag)
+
+
+def add_etag(response, etag: Optional[str]):
+    """Attach the ETag and revalidation headers to a response"""
+    if etag:
+        response.set_etag(etag, weak=True)
+        # Private per-user data: browsers may keep it but must revalidate
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Authorization')
+    return response
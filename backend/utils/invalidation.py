@@ -0,0 +1,369 @@
+"""
+Cross-worker cache invalidation for KBee Manager
+
+Every gunicorn worker keeps its own in-process caches. Writes bump a version
+counter for each affected scope (e.g. ``user:42``) after the transaction
+commits; caches key their entries by that version so every worker stops
+serving stale data as soon as the counter moves.
+
+Two backends are available:
+
+* ``redis`` - counters live in Redis and changes are broadcast over pub/sub,
+  each worker mirrors them in a local dict so reads cost no round-trip.
+* ``shm``   - counters live in a memory-mapped file shared by all workers on
+  a single node (no Redis needed).
+
+Counters restart at 0 when the store is reset (a non-persistent Redis
+restarts, /dev/shm is cleared), so every store also carries a random epoch
+chosen when it is created; versions are (epoch, counter) pairs and never
+repeat across resets.
+
+When a bump fails, this worker stops using version-keyed caches (versions
+read as unknown) until a retry of the failed bump succeeds.
+"""
+
+import os
+import mmap
+import random
+import struct
+import threading
+import time
+import zlib
+import logging
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'kbee:invalidate'
+VERSION_KEY_PREFIX = 'kbee:version:'
+EPOCH_KEY = 'kbee:epoch'
+PENDING_SCOPES_KEY = 'kbee_invalidation_scopes'
+PUBLISH_RETRY_SECONDS = 1.0
+
+
+def _new_epoch() -> int:
+    return random.getrandbits(63) or 1
+
+
+def user_scope(user_id) -> str:
+    """Scope covering everything owned by a user"""
+    return f'user:{user_id}'
+
+
+class SharedMemoryVersionStore:
+    """Version counters stored in a memory-mapped file shared by all local workers
+
+    Slot 0 holds the epoch of the file, written by the first process to open it.
+    """
+
+    SLOT = struct.Struct('<Q')
+
+    def __init__(self, path: str, slots: int = 4096):
+        self.path = path
+        self.slots = slots
+        self._fd = None
+        self._map = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_open(self):
+        """Open the mapping once per process (flock must not be shared across forks)"""
+        if self._map is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._map is not None and self._pid == os.getpid():
+                return
+            size = self.slots * self.SLOT.size
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+            self._fd = fd
+            self._pid = os.getpid()
+            self._locked(self._claim_epoch)
+
+    def _claim_epoch(self):
+        if self.SLOT.unpack_from(self._map, 0)[0] == 0:
+            self.SLOT.pack_into(self._map, 0, _new_epoch())
+
+    def _locked(self, func):
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            return func()
+        finally:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, scope: str) -> int:
+        # Hash collisions only cause extra invalidations, never stale reads
+        return (zlib.crc32(scope.encode('utf-8')) % (self.slots - 1) + 1) * self.SLOT.size
+
+    def epoch(self) -> int:
+        """Random value identifying this incarnation of the file"""
+        self._ensure_open()
+        return self.SLOT.unpack_from(self._map, 0)[0]
+
+    def get(self, scope: str) -> int:
+        """Return the current version of a scope"""
+        self._ensure_open()
+        return self.SLOT.unpack_from(self._map, self._offset(scope))[0]
+
+    def bump(self, scopes: Iterable[str]):
+        """Increment the version of each scope"""
+        self._ensure_open()
+
+        def increment():
+            for scope in scopes:
+                offset = self._offset(scope)
+                current = self.SLOT.unpack_from(self._map, offset)[0]
+                self.SLOT.pack_into(self._map, offset, current + 1)
+
+        self._locked(increment)
+
+    def set(self, scope: str, value: int):
+        """Store a value for a scope (e.g. a timestamp rather than a counter)"""
+        self._ensure_open()
+        self.SLOT.pack_into(self._map, self._offset(scope), value)
+
+
+class RedisVersionStore:
+    """Version counters stored in Redis and mirrored locally through pub/sub
+
+    The epoch key is created with SET NX next to the counters, so a Redis
+    that lost its data gets a new epoch on the next read or bump.
+    """
+
+    def __init__(self, client, channel: str = INVALIDATION_CHANNEL):
+        self.client = client
+        self.channel = channel
+        self._versions: Dict[str, int] = {}
+        self._epoch: Optional[int] = None
+        self._listening = False
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_listener(self):
+        """Start the pub/sub listener thread once per process"""
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            # A forked child must not trust the mirror inherited from its parent
+            self._versions = {}
+            self._epoch = None
+            self._listening = False
+            self._listener_pid = os.getpid()
+            thread = threading.Thread(target=self._listen, name='kbee-invalidation', daemon=True)
+            thread.start()
+
+    def _listen(self):
+        """Apply version broadcasts from other workers, reconnecting on failure"""
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Anything cached before the subscription may have missed messages
+                self._versions.clear()
+                self._epoch = None
+                self._listening = True
+                for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    data = message['data']
+                    if isinstance(data, bytes):
+                        data = data.decode('utf-8')
+                    epoch, _, rest = data.partition(' ')
+                    scope, _, version = rest.rpartition(' ')
+                    self._apply(int(epoch), scope, int(version))
+            except Exception as e:
+                logger.warning('Invalidation listener disconnected: %s', e)
+            finally:
+                self._listening = False
+                self._versions.clear()
+                self._epoch = None
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(1)
+
+    def _apply(self, epoch: int, scope: str, version: int):
+        with self._lock:
+            if epoch != self._epoch:
+                # Redis was reset: nothing mirrored so far is comparable
+                self._versions.clear()
+                self._epoch = epoch
+            if self._listening and version > self._versions.get(scope, -1):
+                self._versions[scope] = version
+
+    def _pipeline_with_epoch(self):
+        pipe = self.client.pipeline()
+        pipe.set(EPOCH_KEY, _new_epoch(), nx=True)
+        pipe.get(EPOCH_KEY)
+        return pipe
+
+    def epoch(self) -> int:
+        """Random value identifying the current contents of Redis"""
+        self._ensure_listener()
+        epoch = self._epoch
+        if epoch is None:
+            epoch = int(self._pipeline_with_epoch().execute()[1])
+            self._epoch = epoch
+        return epoch
+
+    def get(self, scope: str) -> int:
+        """Return the current version of a scope (local mirror when subscribed)"""
+        self._ensure_listener()
+        if self._listening and self._epoch is not None and scope in self._versions:
+            return self._versions[scope]
+        pipe = self._pipeline_with_epoch()
+        pipe.get(VERSION_KEY_PREFIX + scope)
+        _, epoch, version = pipe.execute()
+        version = int(version or 0)
+        self._apply(int(epoch), scope, version)
+        return version
+
+    def bump(self, scopes: Iterable[str]):
+        """Increment the version of each scope and broadcast it"""
+        scopes = list(scopes)
+        pipe = self._pipeline_with_epoch()
+        for scope in scopes:
+            pipe.incr(VERSION_KEY_PREFIX + scope)
+        _, epoch, *versions = pipe.execute()
+        epoch = int(epoch)
+        pipe = self.client.pipeline()
+        for scope, version in zip(scopes, versions):
+            self._apply(epoch, scope, version)
+            pipe.publish(self.channel, f'{epoch} {scope} {version}')
+        pipe.execute()
+
+
+class InvalidationBus:
+    """Broadcasts scope invalidations to every worker after each commit"""
+
+    def __init__(self, app=None):
+        self.store = None
+        self._failed_scopes = set()
+        self._commit_callbacks = []
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Select the version store and hook into SQLAlchemy session events"""
+        backend = app.config.get('INVALIDATION_BACKEND', 'redis')
+        self.store = None
+        self._failed_scopes = set()
+
+        if backend == 'redis':
+            try:
+                import redis
+                client = redis.Redis.from_url(
+                    app.config.get('REDIS_URL', 'redis://localhost:6379'),
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5,
+                )
+                client.ping()
+                self.store = RedisVersionStore(client)
+                app.logger.info('Cache invalidation bus using Redis pub/sub')
+            except Exception as e:
+                app.logger.warning('Redis unavailable for cache invalidation (%s), falling back to shared memory', e)
+
+        if self.store is None:
+            self.store = SharedMemoryVersionStore(
+                app.config['INVALIDATION_SHM_PATH'],
+                app.config.get('INVALIDATION_SHM_SLOTS', 4096),
+            )
+
+        app.extensions['kbee_invalidation'] = self
+        _register_session_events()
+
+    def version(self, scope: str) -> Optional[Tuple[int, int]]:
+        """Current (epoch, counter) of a scope, or None when it cannot be trusted"""
+        if self.store is None:
+            return None
+        if self._failed_scopes:
+            # Cached data may be stale in this worker until the bump goes through
+            if time.monotonic() < self._retry_at:
+                return None
+            self.publish(())
+            if self._failed_scopes:
+                return None
+        try:
+            counter = self.store.get(scope)
+            return self.store.epoch(), counter
+        except Exception as e:
+            logger.error('Cannot read invalidation version for %s: %s', scope, e)
+            return None
+
+    def on_commit(self, callback: Callable[[Set[str]], None]):
+        """Also call callback(scopes) with the scopes of each commit that wrote any"""
+        if callback not in self._commit_callbacks:
+            self._commit_callbacks.append(callback)
+
+    def publish(self, scopes: Iterable[str]):
+        """Invalidate scopes in every worker (and retry earlier failed ones)"""
+        if self.store is None:
+            return
+        with self._lock:
+            scopes = sorted(set(scopes) | self._failed_scopes)
+            if not scopes:
+                return
+            try:
+                self.store.bump(scopes)
+            except Exception as e:
+                self._failed_scopes = set(scopes)
+                self._retry_at = time.monotonic() + PUBLISH_RETRY_SECONDS
+                logger.error('Cannot publish invalidation for %s, caches disabled in this worker: %s', scopes, e)
+                return
+            if self._failed_scopes:
+                logger.warning('Invalidation published after earlier failures, caches enabled again')
+                self._failed_scopes = set()
+
+
+invalidation_bus = InvalidationBus()
+
+
+def _collect_scopes(session, flush_context):
+    """Record the scopes touched by a flush until the transaction ends"""
+    pending = session.info.setdefault(PENDING_SCOPES_KEY, set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        get_scopes = getattr(instance, 'invalidation_scopes', None)
+        if get_scopes is not None:
+            pending.update(get_scopes())
+
+
+def _publish_scopes(session):
+    scopes = session.info.pop(PENDING_SCOPES_KEY, None)
+    if scopes:
+        invalidation_bus.publish(scopes)
+        for callback in invalidation_bus._commit_callbacks:
+            callback(scopes)
+
+
+def _discard_scopes(session, transaction):
+    # Only when the outermost transaction ends: a rolled back savepoint leaves
+    # the scopes flushed before it pending (extra invalidations are harmless)
+    if transaction.parent is None:
+        session.info.pop(PENDING_SCOPES_KEY, None)
+
+
+def _register_session_events():
+    if event.contains(Session, 'after_commit', _publish_scopes):
+        return
+    event.listen(Session, 'after_flush', _collect_scopes)
+    event.listen(Session, 'after_commit', _publish_scopes)
+    event.listen(Session, 'after_transaction_end', _discard_scopes)
@@ -0,0 +1,58 @@
+"""
+JSON serialization providers for KBee Manager
+"""
+
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class KBeeJSONProvider(DefaultJSONProvider):
+    """Stdlib JSON provider that encodes dates as ISO 8601 strings"""
+
+    # Vietnamese text stays as UTF-8 instead of \\uXXXX escapes, and key
+    # sorting is skipped since clients never depend on key order
+    ensure_ascii = False
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (date, datetime)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class ORJSONProvider(KBeeJSONProvider):
+    """orjson-backed provider, encodes dates natively in C"""
+
+    OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        # Options such as indent are only supported by the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.OPTIONS),
+            mimetype=self.mimetype
+        )
+
+
+def get_json_provider_class(name: str = 'auto'):
+    """Resolve the configured provider (auto, orjson or stdlib)"""
+    if name == 'stdlib' or orjson is None:
+        return KBeeJSONProvider
+    return ORJSONProvider
@@ -0,0 +1,217 @@
+"""
+Structured, non-blocking logging for KBee Manager
+
+Request threads only put records on an in-memory queue (QueueHandler); a
+QueueListener thread formats them and writes to stdout (one JSON object
+per line, or plain text with LOG_FORMAT=text) and, for errors, to the
+rotating /app/logs/error.log. Slow disks or a full pipe never block a
+request.
+
+* LOG_LEVEL - level of the application's loggers (``app``, ``backend.*``),
+  then optional per-logger overrides:
+  ``INFO,backend.routes.beehives=DEBUG,sqlalchemy.engine=INFO``.
+  Third-party libraries log warnings and above unless overridden.
+* LOG_SAMPLE_RATES - keep only a fraction of the INFO/DEBUG records of
+  noisy loggers (prefix match): ``backend.routes=0.1``. Warnings and errors
+  are always kept.
+
+The listener thread does not survive fork(); each gunicorn worker starts
+its own after forking.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+APP_LOGGERS = ('backend',)
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s [in %(pathname)s:%(lineno)d]'
+
+# LogRecord attributes that are not user-supplied extras
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def parse_levels(spec: str) -> Tuple[int, Dict[str, int]]:
+    """'INFO,name=DEBUG' -> (application level, {logger name: level})"""
+    root = logging.INFO
+    overrides = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, level = item.rpartition('=')
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level '{level}' in LOG_LEVEL")
+        if name:
+            overrides[name.strip()] = value
+        else:
+            root = value
+    return root, overrides
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'backend.routes=0.1' -> {logger prefix: fraction kept}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, rate = item.partition('=')
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any ``extra=`` fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'pid': record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Drops a share of the INFO/DEBUG records of configured loggers"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first so the most specific rate wins
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rate_for(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _QueueHandler(QueueHandler):
+    """Keeps the traceback apart from the message (QueueHandler merges them)"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogPipeline:
+    """QueueHandler on the root logger, QueueListener writing to the real handlers"""
+
+    def __init__(self):
+        self.handler: Optional[QueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+        self._targets = []
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def init_app(self, app):
+        """Apply LOG_LEVEL everywhere; route records through the queue unless debugging/testing"""
+        app_level, overrides = parse_levels(app.config.get('LOG_LEVEL', 'INFO'))
+        root = logging.getLogger()
+        # INFO on the root would turn on e.g. SQLAlchemy's per-statement logging
+        root.setLevel(max(app_level, logging.WARNING))
+        app.logger.setLevel(app_level)
+        for name in APP_LOGGERS:
+            logging.getLogger(name).setLevel(app_level)
+        for name, level in overrides.items():
+            logging.getLogger(name).setLevel(level)
+
+        if app.debug or app.testing:
+            return
+
+        sampling = SamplingFilter(parse_sample_rates(app.config.get('LOG_SAMPLE_RATES', '')))
+        json_output = app.config.get('LOG_FORMAT', 'json') == 'json'
+
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(JsonFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+        targets = [console]
+
+        error_file = self._error_file_handler(app.config.get('LOG_DIR', '/app/logs'))
+        if error_file is not None:
+            targets.append(error_file)
+
+        self.stop()
+        self._targets = targets
+        self.handler = _QueueHandler(queue.SimpleQueue())
+        self.handler.addFilter(sampling)
+
+        # Everything propagates to the root; Flask's own stderr handler would duplicate
+        app.logger.handlers.clear()
+        for handler in list(root.handlers):
+            if isinstance(handler, QueueHandler):
+                root.removeHandler(handler)
+        root.addHandler(self.handler)
+        self.start()
+
+        app.logger.info('KBee Manager logging: level %s, %s to stdout%s', logging.getLevelName(app_level),
+                        'JSON' if json_output else 'text', ', errors to file' if error_file else '')
+
+    @staticmethod
+    def _error_file_handler(logs_dir: str):
+        try:
+            os.makedirs(logs_dir, exist_ok=True)
+            handler = RotatingFileHandler(
+                os.path.join(logs_dir, 'error.log'),
+                maxBytes=10240000,  # 10MB
+                backupCount=10
+            )
+        except OSError as e:
+            logging.getLogger(__name__).warning('File logging failed (%s), using stdout only', e)
+            return None
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handler.setLevel(logging.ERROR)
+        return handler
+
+    def start(self):
+        if self.handler is None or self.listener is not None:
+            return
+        self.listener = QueueListener(self.handler.queue, *self._targets, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the listener thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _after_fork(self):
+        # The parent's listener thread does not exist here: give this process
+        # a fresh queue and its own listener
+        if self.handler is None:
+            return
+        self.listener = None
+        self.handler.queue = queue.SimpleQueue()
+        self.start()
+
+
+log_pipeline = LogPipeline()
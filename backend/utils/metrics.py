@@ -0,0 +1,161 @@
+"""
+Prometheus metrics for KBee Manager
+
+Request latency, in-flight requests, response sizes and DB time per
+endpoint, plus cache hit rates, QR/PDF render times and rate limiter
+decisions, exposed in the Prometheus text format on /metrics.
+
+Under gunicorn every worker writes its samples to memory-mapped files in
+PROMETHEUS_MULTIPROC_DIR (prepared by gunicorn.conf.py before the app is
+imported) and /metrics sums them over all workers, whichever worker serves
+the scrape. Without that variable (flask run, tests) the values live in the
+process.
+"""
+
+import os
+import time
+
+from flask import current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+
+from .query_stats import request_query_stats
+
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+# The .env.example value: as good as no token when left unchanged
+PLACEHOLDER_METRICS_TOKEN = 'change-me-metrics-token'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+REQUEST_LATENCY = Histogram(
+    'kbee_http_request_duration_seconds', 'Time to build the response',
+    ['method', 'endpoint'], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'kbee_http_requests_total', 'Responses by status code',
+    ['method', 'endpoint', 'status'],
+)
+IN_FLIGHT = Gauge(
+    'kbee_http_requests_in_flight', 'Requests being processed',
+    ['endpoint'], multiprocess_mode='livesum',
+)
+RESPONSE_SIZE = Histogram(
+    'kbee_http_response_size_bytes', 'Response body size as sent (after compression)',
+    ['endpoint'], buckets=SIZE_BUCKETS,
+)
+DB_TIME = Histogram(
+    'kbee_db_request_duration_seconds', 'Database time per request',
+    ['endpoint'], buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'kbee_db_queries_per_request', 'SQL statements per request',
+    ['endpoint'], buckets=QUERY_COUNT_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'kbee_cache_requests_total', 'In-process cache lookups',
+    ['cache', 'result'],
+)
+RENDER_TIME = Histogram(
+    'kbee_render_duration_seconds', 'QR code and PDF rendering time',
+    ['kind'], buckets=LATENCY_BUCKETS,
+)
+RATE_LIMIT_DECISIONS = Counter(
+    'kbee_rate_limit_decisions_total', 'Requests checked by the rate limiter',
+    ['decision'],
+)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count one lookup of an in-process cache"""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def render_timer(kind: str):
+    """Context manager timing a QR/PDF render: ``with render_timer('pdf'): ...``"""
+    return RENDER_TIME.labels(kind).time()
+
+
+def _endpoint() -> str:
+    # Unmatched URLs share one label so scanners cannot blow up cardinality
+    return request.endpoint or 'unmatched'
+
+
+def _limiter_decision(response):
+    if response.status_code == 429:
+        return 'limited'
+    for limiter in current_app.extensions.get('limiter', ()):
+        try:
+            if limiter.current_limit is not None:
+                return 'allowed'
+        except Exception:
+            continue
+    return None
+
+
+def render_latest():
+    """(body, content type) of every metric, summed over workers when multiprocess"""
+    if os.getenv(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class Metrics:
+    """before/after request hooks feeding the request metrics"""
+
+    def __init__(self, app=None):
+        self.enabled = True
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the hooks (before compression, so sizes are measured as sent)"""
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        if not self.enabled:
+            return
+        token = app.config.get('METRICS_TOKEN')
+        if app.config.get('METRICS_TOKEN_REQUIRED') and (not token or token == PLACEHOLDER_METRICS_TOKEN):
+            raise ValueError('METRICS_TOKEN must be set to a secret to serve /metrics in production '
+                             '(or set METRICS_ENABLED=False)')
+        app.before_request(self._start_request)
+        app.after_request(self._record_response)
+        app.teardown_request(self._end_request)
+        app.extensions['kbee_metrics'] = self
+
+    def _start_request(self):
+        endpoint = _endpoint()
+        g.metrics_started = time.perf_counter()
+        g.metrics_endpoint = endpoint
+        IN_FLIGHT.labels(endpoint).inc()
+
+    def _record_response(self, response):
+        if 'metrics_started' not in g:
+            return response
+        endpoint = g.metrics_endpoint
+        REQUEST_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - g.metrics_started)
+        REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+        if response.content_length is not None:
+            # Streamed exports have no length up front and are not sized
+            RESPONSE_SIZE.labels(endpoint).observe(response.content_length)
+
+        count, seconds = request_query_stats()
+        DB_TIME.labels(endpoint).observe(seconds)
+        DB_QUERIES.labels(endpoint).observe(count)
+
+        decision = _limiter_decision(response)
+        if decision is not None:
+            RATE_LIMIT_DECISIONS.labels(decision).inc()
+        return response
+
+    def _end_request(self, exception=None):
+        endpoint = g.pop('metrics_endpoint', None)
+        if endpoint is not None:
+            IN_FLIGHT.labels(endpoint).dec()
+
+
+metrics = Metrics()
@@ -0,0 +1,198 @@
+"""
+On-demand request profiling for KBee Manager
+
+A request is profiled when it carries ``X-Profile-Token: <PROFILE_TOKEN>``
+or is picked by PROFILE_SAMPLE_RATE (optionally only for the endpoints in
+PROFILE_ENDPOINTS). Two profilers are available (PROFILE_MODE, or the
+``X-Profile-Mode`` header of a token request):
+
+* cprofile - deterministic, every call; written as ``.pstats``
+  (``python -m pstats file`` or snakeviz)
+* sample   - a background thread samples the request thread's stack every
+  PROFILE_INTERVAL_MS; low overhead, written as collapsed stacks
+  (``.collapsed``, for flamegraph.pl / speedscope)
+
+Profiles go to PROFILE_DIR, which keeps only the newest PROFILE_MAX_FILES.
+One request per worker is profiled at a time.
+"""
+
+import cProfile
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('cprofile', 'sample')
+PROFILE_EXTENSIONS = ('.pstats', '.collapsed')
+PROFILE_TOKEN_HEADER = 'X-Profile-Token'
+PROFILE_MODE_HEADER = 'X-Profile-Mode'
+PROFILE_FILE_HEADER = 'X-Profile-File'
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='kbee-stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                # co_qualname is Python 3.11+; the image runs 3.9
+                name = getattr(code, 'co_qualname', code.co_name)
+                stack.append(f'{os.path.basename(code.co_filename)}:{name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, path: str):
+        """Write the samples as collapsed stacks ("frame;frame;frame count")"""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class RequestProfiler:
+    """before/after request hooks profiling selected requests"""
+
+    def __init__(self, app=None):
+        self.directory = None
+        self._busy = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.token = app.config.get('PROFILE_TOKEN', '')
+        self.sample_rate = app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+        self.endpoints = set(app.config.get('PROFILE_ENDPOINTS') or [])
+        self.mode = app.config.get('PROFILE_MODE', 'cprofile')
+        self.interval = app.config.get('PROFILE_INTERVAL_MS', 5) / 1000
+        self.directory = app.config.get('PROFILE_DIR')
+        self.max_files = app.config.get('PROFILE_MAX_FILES', 50)
+        if self.mode not in PROFILE_MODES:
+            raise ValueError(f"PROFILE_MODE must be one of {PROFILE_MODES}, not '{self.mode}'")
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._abandon)
+        app.extensions['kbee_profiler'] = self
+
+    def has_token(self) -> bool:
+        """Whether the request carries the profiling token"""
+        supplied = request.headers.get(PROFILE_TOKEN_HEADER, '')
+        return bool(self.token) and hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    def _selected_mode(self):
+        """Profiler to use for this request, or None"""
+        if self.has_token():
+            mode = request.headers.get(PROFILE_MODE_HEADER, self.mode)
+            return mode if mode in PROFILE_MODES else self.mode
+        if self.sample_rate > 0 and (not self.endpoints or request.endpoint in self.endpoints):
+            if random.random() < self.sample_rate:
+                return self.mode
+        return None
+
+    def _start(self):
+        mode = self._selected_mode()
+        if mode is None or not self._busy.acquire(blocking=False):
+            return
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+        g.profiler = (mode, profiler, time.perf_counter())
+
+    def _stop(self):
+        mode, profiler, started = g.pop('profiler')
+        try:
+            if mode == 'cprofile':
+                profiler.disable()
+            else:
+                profiler.stop()
+        finally:
+            self._busy.release()
+        return mode, profiler, time.perf_counter() - started
+
+    def _finish(self, response):
+        if 'profiler' not in g:
+            return response
+        mode, profiler, elapsed = self._stop()
+        try:
+            name = self._save(mode, profiler, elapsed, response.status_code)
+            response.headers[PROFILE_FILE_HEADER] = name
+            logger.info('Profiled %s %s (%.0f ms) -> %s', request.method, request.path, elapsed * 1000, name)
+        except OSError as e:
+            logger.error('Cannot save profile: %s', e)
+        return response
+
+    def _abandon(self, exception=None):
+        # The request failed before after_request: release the profiler
+        if 'profiler' in g:
+            self._stop()
+
+    def _save(self, mode, profiler, elapsed, status) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'unmatched')
+        name = (f'{datetime.utcnow():%Y%m%dT%H%M%S%f}_{endpoint}_{status}_{elapsed * 1000:.0f}ms_{os.getpid()}'
+                f"{'.pstats' if mode == 'cprofile' else '.collapsed'}")
+        path = os.path.join(self.directory, name)
+        if mode == 'cprofile':
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+        self._prune()
+        return name
+
+    def _prune(self):
+        """Keep only the newest max_files profiles"""
+        for entry in self.list_profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, entry['name']))
+            except OSError:
+                pass
+
+    def list_profiles(self) -> List[Dict]:
+        """Stored profiles, newest first"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(PROFILE_EXTENSIONS):
+                stat = entry.stat()
+                entries.append({
+                    'name': entry.name,
+                    'size': stat.st_size,
+                    'created_at': datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+                })
+        entries.sort(key=lambda e: e['name'], reverse=True)
+        return entries
+
+
+profiler = RequestProfiler()
@@ -2,12 +2,12 @@
 QR Code generation utilities for KBee Manager
 """
 
-import qrcode
 import io
 import os
 from flask import send_file
 from typing import Optional
 from .errors import ExternalServiceError
+from .metrics import render_timer
 
 class QRCodeGenerator:
     """QR Code generation utility"""
@@ -31,25 +31,29 @@ class QRCodeGenerator:
     def generate_qr_image(qr_token: str, domain: Optional[str] = None, protocol: Optional[str] = None, port: Optional[str] = None) -> io.BytesIO:
         """Generate QR code image"""
         try:
-            qr_url = QRCodeGenerator.generate_qr_url(qr_token, domain, protocol, port)
-            
-            # Generate QR code
-            qr = qrcode.QRCode(
-                version=1,
-                box_size=10,
-                border=5,
-                error_correction=qrcode.constants.ERROR_CORRECT_L
-            )
-            qr.add_data(qr_url)
-            qr.make(fit=True)
+            # qrcode pulls in PIL; load both on first use rather than at worker boot
+            import qrcode
             
-            # Create image
-            img = qr.make_image(fill_color="black", back_color="white")
+            qr_url = QRCodeGenerator.generate_qr_url(qr_token, domain, protocol, port)
             
-            # Convert to bytes
-            img_buffer = io.BytesIO()
-            img.save(img_buffer, format='PNG')
-            img_buffer.seek(0)
+            with render_timer('qr'):
+                # Generate QR code
+                qr = qrcode.QRCode(
+                    version=1,
+                    box_size=10,
+                    border=5,
+                    error_correction=qrcode.constants.ERROR_CORRECT_L
+                )
+                qr.add_data(qr_url)
+                qr.make(fit=True)
+                
+                # Create image
+                img = qr.make_image(fill_color="black", back_color="white")
+                
+                # Convert to bytes
+                img_buffer = io.BytesIO()
+                img.save(img_buffer, format='PNG')
+                img_buffer.seek(0)
             
             return img_buffer
             
@@ -0,0 +1,109 @@
+"""
+Per-request SQL instrumentation for KBee Manager
+
+Cursor events on every engine (primary and replicas) count the statements
+each request issues and the time spent in the database. The totals are
+returned in a ``Server-Timing`` header (visible in the browser's network
+panel) and statements slower than SLOW_QUERY_MS are logged with the route
+that issued them.
+"""
+
+import logging
+import time
+from typing import Tuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+START_TIMES_KEY = 'kbee_query_start'
+MAX_LOGGED_STATEMENT = 1000  # characters of a slow statement written to the log
+
+
+def request_query_stats() -> Tuple[int, float]:
+    """(statements, seconds in the database) of the current request so far"""
+    if not has_request_context():
+        return 0, 0.0
+    return g.get('db_query_count', 0), g.get('db_query_seconds', 0.0)
+
+
+def _route_name() -> str:
+    if not has_request_context():
+        return '<no request>'
+    return f'{request.method} {request.url_rule.rule if request.url_rule else request.path}'
+
+
+class QueryStats:
+    """Query counting, Server-Timing header and slow query log"""
+
+    def __init__(self, app=None, db=None):
+        self.slow_query_seconds = 0.2
+        self.server_timing = True
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        """Hook the engines of db (call after db.init_app)"""
+        self.slow_query_seconds = app.config.get('SLOW_QUERY_MS', 200) / 1000
+        self.server_timing = app.config.get('SERVER_TIMING_ENABLED', True)
+
+        if db is None:
+            from ..models import db
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            if not event.contains(engine, 'before_cursor_execute', self._before_cursor_execute):
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+                event.listen(engine, 'handle_error', self._handle_error)
+
+        app.before_request(self._start_request)
+        app.after_request(self._add_server_timing)
+        app.extensions['kbee_query_stats'] = self
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(START_TIMES_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._record(conn, statement)
+
+    def _handle_error(self, exception_context):
+        # Failed statements count too (and must not leave their start time behind)
+        if exception_context.connection is not None and exception_context.statement is not None:
+            self._record(exception_context.connection, exception_context.statement)
+
+    def _record(self, conn, statement):
+        start_times = conn.info.get(START_TIMES_KEY)
+        if not start_times:
+            return
+        elapsed = time.perf_counter() - start_times.pop()
+
+        if has_request_context():
+            g.db_query_count = g.get('db_query_count', 0) + 1
+            g.db_query_seconds = g.get('db_query_seconds', 0.0) + elapsed
+
+        if elapsed >= self.slow_query_seconds:
+            logger.warning(
+                'Slow query (%.1f ms) in %s: %s',
+                elapsed * 1000, _route_name(), ' '.join(statement.split())[:MAX_LOGGED_STATEMENT]
+            )
+
+    def _start_request(self):
+        g.request_started = time.perf_counter()
+        g.db_query_count = 0
+        g.db_query_seconds = 0.0
+
+    def _add_server_timing(self, response):
+        if not self.server_timing or 'request_started' not in g:
+            return response
+        count, seconds = request_query_stats()
+        total = time.perf_counter() - g.request_started
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={seconds * 1000:.2f};desc="{count} queries", app;dur={total * 1000:.2f}'
+        )
+        return response
+
+
+query_stats = QueryStats()
@@ -0,0 +1,94 @@
+"""
+Alternative list representations for KBee Manager
+
+List endpoints normally return a JSON array of objects. Clients syncing
+large tables can ask for:
+
+* ``Accept: application/msgpack`` - the same document, binary encoded
+* ``?format=columnar``            - one array per field, with low-cardinality
+  fields dictionary-encoded (values list + integer codes)
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from flask import request, jsonify, current_app
+
+from .errors import ValidationError
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Fields with few distinct values, sent as a dictionary plus codes
+DICTIONARY_ENCODED_FIELDS = ('health_status', 'species')
+
+
+def wants_msgpack() -> bool:
+    """Whether the client prefers MessagePack over JSON"""
+    if msgpack is None:
+        return False
+    # JSON is listed first so it wins ties such as */*
+    return request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+
+def list_format() -> str:
+    """Validate the ?format= parameter (objects or columnar)"""
+    fmt = request.args.get('format', 'objects')
+    if fmt not in ('objects', 'columnar'):
+        raise ValidationError("Định dạng phải là 'objects' hoặc 'columnar'", field='format')
+    return fmt
+
+
+def to_columnar(rows: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Convert a list of row dictionaries into a column-oriented layout"""
+    if fields is None:
+        fields = list(rows[0].keys()) if rows else []
+
+    columns = {}
+    dictionaries = {}
+    for field in fields:
+        values = [row.get(field) for row in rows]
+        if field in DICTIONARY_ENCODED_FIELDS:
+            lookup = {}
+            codes = []
+            for value in values:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes.append(code)
+            dictionaries[field] = list(lookup)
+            columns[field] = codes
+        else:
+            columns[field] = values
+
+    return {
+        'fields': list(fields),
+        'count': len(rows),
+        'columns': columns,
+        'dictionaries': dictionaries,
+    }
+
+
+def _msgpack_default(o):
+    if isinstance(o, (date, datetime)):
+        return o.isoformat()
+    raise TypeError(f'Cannot serialize {type(o).__name__}')
+
+
+def encode_msgpack(obj) -> bytes:
+    """Encode a document as MessagePack (dates as ISO 8601 strings)"""
+    return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
+
+
+def negotiated_response(payload: Dict[str, Any]):
+    """Serialize payload as MessagePack or JSON according to the Accept header"""
+    if wants_msgpack():
+        response = current_app.response_class(encode_msgpack(payload), mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(payload)
+    response.vary.add('Accept')
+    return response
@@ -0,0 +1,111 @@
+"""
+Request IDs and access log for KBee Manager
+
+Every request gets an ID: the incoming ``X-Request-ID`` (set by nginx, or
+by a client) when it looks sane, otherwise a new one. The ID is returned in
+the response header, in error responses, and added as ``request_id`` to
+every log record emitted while the request is handled, so nginx's access
+log, the application logs and an error reported by a user can be matched.
+
+When the request ends, one line is logged on ``backend.access`` with the
+route, status, duration, DB time, query count and response size. 5xx
+responses are logged as warnings so LOG_SAMPLE_RATES never drops them.
+"""
+
+import logging
+import re
+import time
+import uuid
+from typing import Optional
+
+from flask import g, has_request_context, request
+
+from .query_stats import request_query_stats
+
+access_logger = logging.getLogger('backend.access')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+
+def current_request_id() -> Optional[str]:
+    """ID of the request being handled, or None outside a request"""
+    if not has_request_context():
+        return None
+    return g.get('request_id')
+
+
+class RequestLog:
+    """X-Request-ID propagation, request_id on log records, access log line"""
+
+    def __init__(self, app=None):
+        self.access_log = True
+        self._factory_installed = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register early: the ID must exist before other hooks log anything"""
+        self.access_log = app.config.get('ACCESS_LOG_ENABLED', True)
+        self._install_record_factory()
+
+        app.before_request(self._start_request)
+        # after_request hooks run in reverse order, so this one sees the final response
+        app.after_request(self._finish_request)
+        app.extensions['kbee_request_log'] = self
+
+    def _install_record_factory(self):
+        # A record factory (unlike a handler filter) applies to every logger
+        # and handler, and runs in the thread that logs
+        if self._factory_installed:
+            return
+        previous = logging.getLogRecordFactory()
+
+        def factory(*args, **kwargs):
+            record = previous(*args, **kwargs)
+            request_id = current_request_id()
+            if request_id is not None:
+                record.request_id = request_id
+            return record
+
+        logging.setLogRecordFactory(factory)
+        self._factory_installed = True
+
+    def _start_request(self):
+        supplied = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = supplied if _VALID_REQUEST_ID.match(supplied) else uuid.uuid4().hex
+        g.request_log_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        request_id = current_request_id()
+        if request_id is None:
+            return response
+        response.headers[REQUEST_ID_HEADER] = request_id
+        if self.access_log:
+            self._log_access(response)
+        return response
+
+    def _log_access(self, response):
+        duration = time.perf_counter() - g.request_log_started
+        count, db_seconds = request_query_stats()
+        route = request.url_rule.rule if request.url_rule else request.path
+        size = response.content_length
+        access_logger.log(
+            logging.WARNING if response.status_code >= 500 else logging.INFO,
+            '%s %s %s %.1fms db=%.1fms/%dq %sB',
+            request.method, route, response.status_code, duration * 1000, db_seconds * 1000, count,
+            '-' if size is None else size,
+            extra={
+                'method': request.method,
+                'route': route,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'db_ms': round(db_seconds * 1000, 2),
+                'queries': count,
+                'response_bytes': size,
+            }
+        )
+
+
+request_log = RequestLog()
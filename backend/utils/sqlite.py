@@ -0,0 +1,62 @@
+"""
+SQLite production profile for KBee Manager
+
+Applies the configured PRAGMAs (WAL, synchronous, mmap, busy timeout...)
+to every new SQLite connection, and serialises writers across gunicorn
+workers: transactions of writing requests (POST, PUT, PATCH, DELETE)
+start with BEGIN IMMEDIATE, so they take the database's single write lock
+up front and wait for it (busy_timeout) instead of upgrading a read lock
+later and failing with "database is locked". Everything else (GET
+requests, CLI commands, health checks) keeps deferred transactions, which
+under WAL never wait for the writer.
+"""
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class SQLiteProfile:
+    """Connection setup for SQLite engines"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, db=None):
+        """Hook the SQLite engines of db (call after db.init_app)"""
+        pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+        immediate_writes = app.config.get('SQLITE_IMMEDIATE_WRITES', False)
+        if not pragmas and not immediate_writes:
+            return
+
+        if db is None:
+            from ..models import db
+        with app.app_context():
+            engines = [engine for engine in db.engines.values() if engine.dialect.name == 'sqlite']
+        for engine in engines:
+            self._hook_engine(engine, pragmas, immediate_writes)
+
+    @staticmethod
+    def _hook_engine(engine, pragmas, immediate_writes):
+        @event.listens_for(engine, 'connect')
+        def set_pragmas(dbapi_connection, connection_record):
+            if immediate_writes:
+                # Let SQLAlchemy's begin event below issue BEGIN instead of pysqlite
+                dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f'PRAGMA {name}={value}')
+            finally:
+                cursor.close()
+
+        if immediate_writes:
+            @event.listens_for(engine, 'begin')
+            def begin(connection):
+                writing = has_request_context() and request.method not in SAFE_METHODS
+                connection.exec_driver_sql('BEGIN IMMEDIATE' if writing else 'BEGIN')
+
+
+sqlite_profile = SQLiteProfile()
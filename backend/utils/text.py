@@ -0,0 +1,23 @@
+"""
+Text normalisation utilities for KBee Manager
+"""
+
+import re
+import unicodedata
+from typing import List
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def fold_text(text: str) -> str:
+    """Lower-case text and strip Vietnamese diacritics ("Yếu" -> "yeu", "Đen" -> "den")"""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFD', text.replace('đ', 'd').replace('Đ', 'D'))
+    stripped = ''.join(ch for ch in decomposed if unicodedata.category(ch) != 'Mn')
+    return unicodedata.normalize('NFC', stripped).lower()
+
+
+def fold_words(text: str) -> List[str]:
+    """Accent-folded words of text, in order"""
+    return _WORD.findall(fold_text(text))
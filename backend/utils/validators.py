@@ -4,9 +4,13 @@ Input validation utilities for KBee Manager
 
 import re
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from .errors import ValidationError
 
+# Allowed beehive values
+HEALTH_CHOICES = ['Tốt', 'Yếu']
+SPECIES_CHOICES = ['Furva Vàng', 'Furva Đen']
+
 class Validator:
     """Base validator class"""
     
@@ -222,13 +226,11 @@ class BeehiveValidator:
                 raise ValidationError("Ngày tách đàn phải sau ngày nhập", field='split_date')
         
         # Health status validation (only two values)
-        health_choices = ['Tốt', 'Yếu']
-        validated_data['health_status'] = Validator.validate_choice(data, 'health_status', health_choices)
+        validated_data['health_status'] = Validator.validate_choice(data, 'health_status', HEALTH_CHOICES)
 
         # Species validation (default to Furva Vàng)
-        species_choices = ['Furva Vàng', 'Furva Đen']
         if 'species' in data and data['species']:
-            validated_data['species'] = Validator.validate_choice(data, 'species', species_choices)
+            validated_data['species'] = Validator.validate_choice(data, 'species', SPECIES_CHOICES)
         else:
             validated_data['species'] = 'Furva Vàng'
         
@@ -256,13 +258,11 @@ class BeehiveValidator:
                 validated_data['split_date'] = None
         
         if 'health_status' in data:
-            health_choices = ['Tốt', 'Yếu']
-            validated_data['health_status'] = Validator.validate_choice(data, 'health_status', health_choices)
+            validated_data['health_status'] = Validator.validate_choice(data, 'health_status', HEALTH_CHOICES)
 
         # Species (optional on update)
         if 'species' in data:
-            species_choices = ['Furva Vàng', 'Furva Đen']
-            validated_data['species'] = Validator.validate_choice(data, 'species', species_choices)
+            validated_data['species'] = Validator.validate_choice(data, 'species', SPECIES_CHOICES)
         
         if 'notes' in data:
             if data['notes']:
@@ -313,3 +313,77 @@ class QueryValidator:
             'sort_field': sort_field,
             'sort_order': sort_order
         }
+    
+    @staticmethod
+    def validate_date_filter(data: Dict[str, Any], field: str) -> Optional[date]:
+        """Validate an optional YYYY-MM-DD filter parameter"""
+        value = data.get(field)
+        if not value:
+            return None
+        
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            raise ValidationError(f"Trường '{field}' phải có định dạng YYYY-MM-DD", field=field)
+    
+    @staticmethod
+    def validate_date_range(data: Dict[str, Any], from_field: str, to_field: str) -> Tuple[Optional[date], Optional[date]]:
+        """Validate an inclusive date range made of two optional filter parameters"""
+        start = QueryValidator.validate_date_filter(data, from_field)
+        end = QueryValidator.validate_date_filter(data, to_field)
+        
+        if start and end and start > end:
+            raise ValidationError(f"Trường '{from_field}' phải trước hoặc bằng '{to_field}'", field=from_field)
+        
+        return start, end
+    
+    @staticmethod
+    def validate_multi_choice(data: Dict[str, Any], field: str, choices: List[str]) -> List[str]:
+        """Validate a multi-value filter (repeated parameter or comma-separated)"""
+        values = data.get(field) or []
+        if isinstance(values, str):
+            values = [values]
+        
+        selected = []
+        for raw in values:
+            for value in raw.split(','):
+                value = value.strip()
+                if not value or value in selected:
+                    continue
+                if value not in choices:
+                    raise ValidationError(f"Trường '{field}' phải là một trong: {', '.join(choices)}", field=field)
+                selected.append(value)
+        
+        return selected
+    
+    @staticmethod
+    def validate_fields_params(data: Dict[str, Any], allowed_fields: List[str], summary_fields: List[str]) -> Optional[List[str]]:
+        """Validate sparse fieldset parameters (fields=a,b or view=summary)
+
+        Returns the projected field list, or None for the full representation.
+        """
+        fields = data.get('fields', '')
+        view = data.get('view', 'full')
+        
+        if fields:
+            requested = []
+            for field in fields.split(','):
+                field = field.strip()
+                if not field or field in requested:
+                    continue
+                if field not in allowed_fields:
+                    raise ValidationError(f"Trường dữ liệu phải là một trong: {', '.join(allowed_fields)}", field='fields')
+                requested.append(field)
+            
+            # The serial number identifies each row, always include it
+            if 'serial_number' in requested:
+                requested.remove('serial_number')
+            return ['serial_number'] + requested
+        
+        if view == 'summary':
+            return list(summary_fields)
+        
+        if view != 'full':
+            raise ValidationError("Kiểu hiển thị phải là 'full' hoặc 'summary'", field='view')
+        
+        return None
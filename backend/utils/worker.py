@@ -0,0 +1,41 @@
+"""
+Worker process setup for KBee Manager
+
+Called from gunicorn's post_fork hook (see gunicorn.conf.py) in each freshly
+forked worker, before it serves any request.
+"""
+
+import logging
+from typing import Optional
+
+from ..models import db
+from .invalidation import invalidation_bus
+from .db_pool import reset_checkout_stats
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_worker(app, threads: Optional[int] = None):
+    """Reset state inherited from the master and warm per-process caches
+
+    Makes no database round-trips: pools are emptied, not refilled.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            # Connections opened before the fork belong to the master; drop
+            # them from this worker's pool without closing the parent's sockets
+            engine.dispose(close=False)
+
+            pool_size = getattr(engine.pool, 'size', None)
+            if threads and callable(pool_size):
+                capacity = pool_size() + max(getattr(engine.pool, '_max_overflow', 0), 0)
+                if capacity < threads:
+                    logger.warning('DB pool allows %s connections for %s worker threads', capacity, threads)
+
+        reset_checkout_stats(db.engines.values())
+
+    # Open the version store (shared memory map or Redis listener) for this process
+    invalidation_bus.version('worker:warmup')
+
+    # Compile the URL map now instead of on the first request
+    app.url_map.bind('localhost').match('/api/stats', method='GET')
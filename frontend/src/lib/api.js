@@ -115,7 +115,14 @@ class ApiService {
       ...(searchParams.serialNumber && { serialNumber: searchParams.serialNumber }),
       ...(searchParams.import_date && { import_date: searchParams.import_date }),
       ...(searchParams.split_date && { split_date: searchParams.split_date }),
+      ...(searchParams.import_from && { import_from: searchParams.import_from }),
+      ...(searchParams.import_to && { import_to: searchParams.import_to }),
+      ...(searchParams.health_status && { health_status: [].concat(searchParams.health_status).join(',') }),
+      ...(searchParams.species && { species: [].concat(searchParams.species).join(',') }),
       ...(searchParams.notes && { notes: searchParams.notes }),
+      ...(searchParams.q && { q: searchParams.q }),
+      ...(searchParams.view && { view: searchParams.view }),
+      ...(searchParams.fields && { fields: searchParams.fields }),
     });
     
     return await this.request(`/beehives?${params}`);
@@ -128,7 +135,16 @@ class ApiService {
       ...(searchParams.serialNumber && { serialNumber: searchParams.serialNumber }),
       ...(searchParams.import_date && { import_date: searchParams.import_date }),
       ...(searchParams.sold_date && { sold_date: searchParams.sold_date }),
+      ...(searchParams.sold_from && { sold_from: searchParams.sold_from }),
+      ...(searchParams.sold_to && { sold_to: searchParams.sold_to }),
+      ...(searchParams.import_from && { import_from: searchParams.import_from }),
+      ...(searchParams.import_to && { import_to: searchParams.import_to }),
+      ...(searchParams.health_status && { health_status: [].concat(searchParams.health_status).join(',') }),
+      ...(searchParams.species && { species: [].concat(searchParams.species).join(',') }),
       ...(searchParams.notes && { notes: searchParams.notes }),
+      ...(searchParams.q && { q: searchParams.q }),
+      ...(searchParams.view && { view: searchParams.view }),
+      ...(searchParams.fields && { fields: searchParams.fields }),
     });
     
     return await this.request(`/sold-beehives?${params}`);
@@ -138,6 +154,27 @@ class ApiService {
     return await this.request('/stats');
   }
 
+  // First page of active beehives plus counters and chart breakdowns in one call
+  async getDashboard(page = 1, per_page = 10) {
+    const params = new URLSearchParams({
+      page: page.toString(),
+      per_page: per_page.toString(),
+    });
+
+    return await this.request(`/dashboard?${params}`);
+  }
+
+  // Serial-number autocomplete (prefix such as "TO01" or "12")
+  async suggestSerialNumbers(prefix, { sold = false, limit = 10 } = {}) {
+    const params = new URLSearchParams({
+      prefix,
+      sold: sold.toString(),
+      limit: limit.toString(),
+    });
+
+    return await this.request(`/beehives/suggest?${params}`);
+  }
+
   async getBeehive(serialNumber) {
     return await this.request(`/beehives/${serialNumber}`);
   }
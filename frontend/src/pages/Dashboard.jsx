@@ -30,96 +30,79 @@ const Dashboard = () => {
   const [beehiveToDelete, setBeehiveToDelete] = useState(null);
   const [loading, setLoading] = useState(true);
   const [page, setPage] = useState(1);
+  const [pagination, setPagination] = useState({ total: 0, total_pages: 1 });
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const perPage = 10;
 
+  // Search runs on the server; wait for typing to pause before querying
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setDebouncedSearch(searchTerm.trim());
+      setPage(1);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  useEffect(() => {
+    apiService.getCurrentUser().then(setUser).catch((error) => console.error('Error loading user:', error));
+  }, []);
+
+  // One request per view: the dashboard call (page, counters and breakdowns)
+  // when unfiltered, otherwise the filtered list page; counters keep their
+  // values from the last dashboard call
   const loadData = useCallback(async () => {
     try {
       setLoading(true);
-      // Load all active beehives (paginate) similar to Sold page for consistent search
-      let allBeehives = [];
-      let page = 1;
-      const perPage = 100;
-      let hasMore = true;
-
-      while (hasMore) {
-        const response = await apiService.getBeehives(page, perPage, {});
-        const pageBeehives = (response.beehives || []).filter(b => !b.is_sold);
-        allBeehives = [...allBeehives, ...pageBeehives];
-        hasMore = (response.beehives || []).length === perPage;
-        page += 1;
+      const filtered = debouncedSearch || healthFilter || speciesFilter;
+      if (filtered) {
+        const response = await apiService.getBeehives(page, perPage, {
+          serialNumber: debouncedSearch,
+          notes: debouncedSearch,
+          health_status: healthFilter,
+          species: speciesFilter,
+        });
+        setBeehives(response.beehives || []);
+        setPagination(response.pagination || { total: 0, total_pages: 1 });
+        return;
       }
 
-      setBeehives(allBeehives);
-      const [statsResponse, userResponse] = await Promise.all([
-        apiService.getStats(),
-        apiService.getCurrentUser()
-      ]);
-      // Compute breakdowns
-      const activeBeehives = allBeehives.filter(b => !b.is_sold);
-      const soldBeehives = allBeehives.filter(b => b.is_sold);
-      const goodCount = activeBeehives.filter(b => b.health_status === 'Tốt').length;
-      const weakCount = activeBeehives.filter(b => b.health_status === 'Yếu').length;
-      const speciesCounts = activeBeehives.reduce((acc, b) => {
-        const key = b.species || 'Furva Vàng';
-        acc[key] = (acc[key] || 0) + 1;
-        return acc;
-      }, { 'Furva Vàng': 0, 'Furva Đen': 0 });
+      const dashboard = await apiService.getDashboard(page, perPage);
+      setBeehives(dashboard.beehives || []);
+      setPagination(dashboard.pagination || { total: 0, total_pages: 1 });
+      const statsResponse = dashboard.stats || {};
+      const healthStats = dashboard.health_stats || {};
       setStats({
         total: statsResponse.total || 0,
-        active: statsResponse.active || activeBeehives.length,
-        sold: statsResponse.sold || soldBeehives.length,
-        good: goodCount,
-        weak: weakCount,
+        active: statsResponse.active || 0,
+        sold: statsResponse.sold || 0,
+        good: healthStats['Tốt'] || 0,
+        weak: healthStats['Yếu'] || 0,
       });
-      setSpeciesStats(speciesCounts);
-      setUser(userResponse);
+      setSpeciesStats(dashboard.species_stats || { 'Furva Vàng': 0, 'Furva Đen': 0 });
     } catch (error) {
       toast.error('Không thể tải dữ liệu');
       console.error('Error loading data:', error);
     } finally {
       setLoading(false);
     }
-  }, [searchTerm]);
+  }, [page, debouncedSearch, healthFilter, speciesFilter]);
 
   useEffect(() => {
     loadData();
   }, [loadData]);
-  // Derived: filtered beehives (client-side to match Sold page behavior)
-  const filteredBeehives = beehives.filter((b) => {
-    const term = searchTerm.trim().toLowerCase();
-    if (term) {
-      const importDateLocal = b.import_date ? new Date(b.import_date).toLocaleDateString('vi-VN') : '';
-      const matchesSearch = (
-        (b.serial_number || '').toLowerCase().includes(term) ||
-        (b.qr_token || '').toLowerCase().includes(term) ||
-        (b.notes || '').toLowerCase().includes(term) ||
-        (b.import_date || '').includes(term) ||
-        importDateLocal.includes(term)
-      );
-      if (!matchesSearch) return false;
-    }
-    if (healthFilter && b.health_status !== healthFilter) return false;
-    if (speciesFilter && (b.species || 'Furva Vàng') !== speciesFilter) return false;
-    return true;
-  });
 
-  const totalItems = filteredBeehives.length;
-  const totalPages = Math.max(1, Math.ceil(totalItems / perPage));
+  const totalItems = pagination.total || 0;
+  const totalPages = Math.max(1, pagination.total_pages || 1);
   const currentPage = Math.min(page, totalPages);
   const startIdx = (currentPage - 1) * perPage;
-  const endIdx = startIdx + perPage;
-  const paginatedBeehives = filteredBeehives.slice(startIdx, endIdx);
+  const endIdx = startIdx + beehives.length;
+  const paginatedBeehives = beehives;
 
   const goToPage = (p) => {
     if (p < 1 || p > totalPages) return;
     setPage(p);
   };
 
-  // Reset page when search/filters change
-  useEffect(() => {
-    setPage(1);
-  }, [searchTerm, healthFilter, speciesFilter]);
-
   const handleDelete = (serialNumber) => {
     setBeehiveToDelete(serialNumber);
     setShowDeleteDialog(true);
@@ -258,7 +241,7 @@ const Dashboard = () => {
               <div className="relative flex-1">
                 <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 w-4 h-4 text-gray-400" />
                 <Input
-                  placeholder="Tìm theo mã tổ, ngày nhập, ghi chú"
+                  placeholder="Tìm theo mã tổ, ghi chú"
                   value={searchTerm}
                   onChange={(e) => setSearchTerm(e.target.value)}
                   className="pl-10"
@@ -286,7 +269,7 @@ const Dashboard = () => {
                   <label className="text-sm text-gray-600 font-medium">Lọc theo sức khoẻ</label>
                   <select
                     value={healthFilter}
-                    onChange={(e) => setHealthFilter(e.target.value)}
+                    onChange={(e) => { setHealthFilter(e.target.value); setPage(1); }}
                     className="w-full mt-1 border rounded-md px-3 py-2 bg-white"
                   >
                     <option value="">Tất cả</option>
@@ -298,7 +281,7 @@ const Dashboard = () => {
                   <label className="text-sm text-gray-600 font-medium">Lọc theo chủng loại</label>
                   <select
                     value={speciesFilter}
-                    onChange={(e) => setSpeciesFilter(e.target.value)}
+                    onChange={(e) => { setSpeciesFilter(e.target.value); setPage(1); }}
                     className="w-full mt-1 border rounded-md px-3 py-2 bg-white"
                   >
                     <option value="">Tất cả</option>
@@ -314,6 +297,7 @@ const Dashboard = () => {
                       onClick={() => {
                         setHealthFilter('');
                         setSpeciesFilter('');
+                        setPage(1);
                       }}
                       className="text-gray-500 hover:text-gray-700"
                     >
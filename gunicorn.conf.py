@@ -0,0 +1,157 @@
+"""
+Gunicorn configuration for KBee Manager
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+The application is imported once in the master (preload_app) and workers
+are forked from it, so respawns after max_requests are cheap. Importing the
+app makes no database round-trips; run `flask kbee init-db` once per
+deploy before starting gunicorn.
+
+Settings come from the environment:
+
+* GUNICORN_WORKER_CLASS - sync, gthread (default) or gevent
+* GUNICORN_WORKERS      - worker processes (default: derived from the CPU count)
+* GUNICORN_THREADS      - threads per gthread worker (default 4)
+* GUNICORN_WORKER_CONNECTIONS - concurrent greenlets per gevent worker (default 100)
+* GUNICORN_TIMEOUT, GUNICORN_BIND, GUNICORN_PRELOAD_EXPORTS
+* DB_MAX_CONNECTIONS   - database connections this instance may open in
+                         total (its share of MySQL max_connections, which
+                         defaults to 151); unset = no limit
+* DB_POOL_SIZE, DB_MAX_OVERFLOW - per-worker pool; default to what one
+                         worker can use at once (see "Database connections")
+* PROMETHEUS_MULTIPROC_DIR - where workers keep their metric samples so
+                             /metrics can sum them (default /dev/shm/kbee_metrics,
+                             emptied at every start)
+
+Worker classes and the database driver:
+
+* sync    - one request per process; a slow PDF export or Redis timeout
+            holds the whole worker. Works with any driver.
+* gthread - several requests per process on threads; SQLAlchemy gives
+            each thread its own session, the connection pool must allow
+            at least GUNICORN_THREADS connections per worker.
+* gevent  - many requests per process on greenlets. Needs gevent installed
+            and a pure-Python driver (PyMySQL, redis-py) that cooperates
+            once the stdlib is monkey-patched; C drivers such as
+            mysqlclient block the whole worker and are rejected.
+
+Database connections:
+
+Every worker has its own pool (and one per read replica), so an instance
+can open workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections to each
+database. Unless set, the pool is sized to one worker's concurrency: 1
+connection for sync, GUNICORN_THREADS for gthread, 10 for gevent, with no
+overflow. With DB_MAX_CONNECTIONS the pool is capped at
+DB_MAX_CONNECTIONS // workers; explicit pool settings above that budget
+refuse to start.
+"""
+
+import glob
+import importlib
+import os
+import tempfile
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class not in ('sync', 'gthread', 'gevent'):
+    raise RuntimeError(f"GUNICORN_WORKER_CLASS must be sync, gthread or gevent, not '{worker_class}'")
+
+if worker_class == 'gevent':
+    database_url = os.getenv('DATABASE_URL', 'mysql+pymysql://')
+    if database_url.startswith(('mysql://', 'mysql+mysqldb://', 'mysql+mysqlconnector://')):
+        raise RuntimeError('gevent workers need a pure-Python MySQL driver: use a mysql+pymysql:// DATABASE_URL')
+    # preload_app imports the app in the master, so patch before anything
+    # opens sockets or creates locks (the gevent worker patches too late)
+    from gevent import monkey
+    monkey.patch_all()
+
+# Must be set before the app (and prometheus_client) is imported: every
+# worker then writes its metrics to files here instead of process memory
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'kbee_metrics'))
+os.makedirs(metrics_dir, exist_ok=True)
+for stale in glob.glob(os.path.join(metrics_dir, '*.db')):
+    os.remove(stale)  # samples of a previous run
+
+
+def _cpu_count():
+    """CPUs available to this process, honouring affinity and cgroup quotas (containers)"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            count = min(count, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+cpus = _cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+# Blocking sync workers need more processes to overlap I/O; threaded and
+# evented workers get their concurrency inside each process
+default_workers = cpus * 2 + 1 if worker_class == 'sync' else cpus + 1
+workers = int(os.getenv('GUNICORN_WORKERS') or default_workers)
+threads = int(os.getenv('GUNICORN_THREADS') or 4) if worker_class == 'gthread' else 1
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS') or 100)
+
+# Connections one worker can use at once; more would only sit idle in MySQL
+worker_concurrency = {'sync': 1, 'gthread': threads, 'gevent': min(worker_connections, 10)}[worker_class]
+db_max_connections = int(os.getenv('DB_MAX_CONNECTIONS') or 0)
+if db_max_connections:
+    if db_max_connections < workers:
+        raise RuntimeError(f'DB_MAX_CONNECTIONS={db_max_connections} is less than one connection per worker ({workers} workers)')
+    worker_concurrency = min(worker_concurrency, db_max_connections // workers)
+# Read by backend.config when the app is imported below (preload_app)
+os.environ['DB_POOL_SIZE'] = os.getenv('DB_POOL_SIZE') or str(worker_concurrency)
+os.environ['DB_MAX_OVERFLOW'] = os.getenv('DB_MAX_OVERFLOW') or '0'
+db_pool_capacity = int(os.environ['DB_POOL_SIZE']) + int(os.environ['DB_MAX_OVERFLOW'])
+if db_max_connections and workers * db_pool_capacity > db_max_connections:
+    raise RuntimeError(
+        f'{workers} workers x {db_pool_capacity} pooled connections exceed DB_MAX_CONNECTIONS={db_max_connections}; '
+        f'lower DB_POOL_SIZE / DB_MAX_OVERFLOW or GUNICORN_WORKERS'
+    )
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT') or 120)
+graceful_timeout = 30
+keepalive = 2
+
+# Recycle workers periodically to bound memory growth
+max_requests = 1000
+max_requests_jitter = 100
+
+preload_app = True
+
+# Modules only the PDF/QR export endpoints use. Workers import them lazily;
+# with preload_app the master imports them once before forking so workers
+# share the pages copy-on-write instead of each paying on first export.
+# Set GUNICORN_PRELOAD_EXPORTS=0 to keep them out of memory entirely.
+EXPORT_MODULES = ('reportlab.platypus', 'reportlab.lib.styles', 'qrcode', 'qrcode.image.pil')
+
+
+def when_ready(server):
+    if preload_app and os.getenv('GUNICORN_PRELOAD_EXPORTS', '1') == '1':
+        for name in EXPORT_MODULES:
+            importlib.import_module(name)
+    server.log.info('%s %s workers (%s threads each) on %s CPUs, up to %s database connections',
+                    workers, worker_class, threads, cpus, workers * db_pool_capacity)
+
+
+def post_fork(server, worker):
+    """Give each worker its own DB connections and warm its caches"""
+    from app import app
+    from backend.utils.worker import prepare_worker
+
+    prepare_worker(app, threads=threads if worker_class == 'gthread' else None)
+
+
+def child_exit(server, worker):
+    """Drop the exited worker's in-flight gauges (its counters are kept)"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -14,16 +14,17 @@ ALTER DATABASE kbee_manager CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 -- Create tables will be handled by Flask-SQLAlchemy
 -- This file can be used for any additional database setup
 
--- Beehive table helper (fresh init will recreate via SQLAlchemy)
--- For fresh setups, ensure species column exists and defaults are set
--- Example SQL if manually migrating an existing DB (data will be dropped per request):
--- DROP TABLE IF EXISTS beehive;
--- The application will recreate with columns:
---   species VARCHAR(20) NOT NULL DEFAULT 'Furva Vàng'
---   health_status VARCHAR(20) NOT NULL DEFAULT 'Tốt'
-
--- Create indexes for better performance
--- These will be created after the tables are created by the application
+-- Schema changes are versioned migrations in backend/migrations, applied once
+-- per deploy (never by the application workers):
+--   flask kbee db upgrade            # create / upgrade to the latest schema
+--   flask kbee db upgrade --sql      # print the SQL for review instead
+-- Databases created before migrations existed (tables made by the app at
+-- startup, no alembic_version table) are marked first, then upgraded:
+--   flask kbee db stamp 0001_baseline && flask kbee db upgrade
+-- On MySQL index and column changes run as ALTER TABLE ... ALGORITHM=INPLACE,
+-- LOCK=NONE, so they do not block reads or writes.
+-- Vietnamese words are often 1-2 characters, so the server runs with
+-- innodb_ft_min_token_size=1 and stopwords disabled (see docker-compose.yml).
 
 -- Sample data (optional - can be removed in production)
 -- INSERT INTO user (username, email, password_hash) VALUES 
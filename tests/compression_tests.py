@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Compression Tests for KBee Manager
+Checks Accept-Encoding negotiation (brotli, gzip, identity), the size
+threshold and content types left alone, streaming compression of PDF
+exports, and the cache of compressed ETag-identified bodies.
+
+Uses the testing config (SQLite in memory). The brotli checks are skipped
+when brotli is not installed.
+"""
+
+import os
+import sys
+import gzip
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils.compression import brotli, compression
+
+BEEHIVES = 60
+
+
+class CompressionTests(unittest.TestCase):
+    """after_request compression"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with enough beehives for a list above the threshold"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for i in range(BEEHIVES):
+            db.session.add(Beehive(serial_number=f'TO{i + 1:03d}', qr_token=f'qr{i + 1:010d}',
+                                   import_date=date(2025, 1, 1 + i % 28), health_status='Tốt',
+                                   notes='Đàn khỏe, cần kiểm tra lại sau hai tuần', user_id=user.id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        cls.min_size = compression.min_size
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def get(self, url, encoding=None, **headers):
+        if encoding is not None:
+            headers['Accept-Encoding'] = encoding
+        response = self.client.get(url, headers=dict(self.headers, **headers))
+        self.assertIn(response.status_code, (200, 304))
+        return response
+
+    def test_01_gzip(self):
+        """Large JSON bodies are gzipped when accepted and decode to the same bytes"""
+        plain = self.get('/api/beehives?per_page=100', encoding='identity')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertGreater(len(plain.data), self.min_size)
+
+        response = self.get('/api/beehives?per_page=100', encoding='gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertLess(len(response.data), len(plain.data))
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+    @unittest.skipUnless(brotli, 'brotli not installed')
+    def test_02_brotli_preferred(self):
+        """Brotli wins over gzip when both are accepted"""
+        plain = self.get('/api/beehives?per_page=100', encoding='identity')
+        response = self.get('/api/beehives?per_page=100', encoding='gzip, deflate, br')
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.data), plain.data)
+
+    def test_03_not_accepted(self):
+        """Without a supported Accept-Encoding the body is sent as is"""
+        for encoding in ('', 'identity', 'deflate'):
+            with self.subTest(encoding=encoding):
+                response = self.get('/api/beehives?per_page=100', encoding=encoding)
+                self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_04_threshold(self):
+        """Bodies below COMPRESS_MIN_SIZE are not compressed"""
+        response = self.get('/api/stats', encoding='gzip')
+        self.assertLess(len(response.data), self.min_size)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIn('Accept-Encoding', response.vary)
+
+    def test_05_excluded_types_and_status(self):
+        """PNG images and 304 responses are left alone"""
+        response = self.get('/api/qr/TO001', encoding='gzip')
+        self.assertEqual(response.mimetype, 'image/png')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        etag = self.get('/api/beehives?per_page=100').headers['ETag']
+        response = self.get('/api/beehives?per_page=100', encoding='gzip', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_06_etag_weakened_and_cached(self):
+        """Compressed bodies keep a weak ETag and are reused from the cache"""
+        compression._cache.clear()
+        first = self.get('/api/beehives?per_page=100&page=1', encoding='gzip')
+        self.assertTrue(first.headers['ETag'].startswith('W/'))
+        self.assertEqual(len(compression._cache), 1)
+        second = self.get('/api/beehives?per_page=100&page=1', encoding='gzip')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(len(compression._cache), 1)
+
+    def test_07_streamed_pdf(self):
+        """PDF exports are compressed while streaming, without Content-Length"""
+        plain = self.get('/api/export_pdf/TO001', encoding='identity')
+        self.assertEqual(plain.mimetype, 'application/pdf')
+
+        response = self.get('/api/export_pdf/TO001', encoding='gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertNotIn('Accept-Ranges', response.headers)
+        body = gzip.decompress(response.data)
+        self.assertTrue(body.startswith(b'%PDF'))
+        # The PDF embeds its creation time, so compare sizes rather than bytes
+        self.assertAlmostEqual(len(body), len(plain.data), delta=64)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
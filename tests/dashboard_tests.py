@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Dashboard Tests for KBee Manager
+Checks that /api/dashboard returns the same page, counters and breakdowns
+as the separate list and stats endpoints, paginates the same way, and
+reflects writes immediately.
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+
+ACTIVE = 25
+SOLD = 3
+
+
+class DashboardTests(unittest.TestCase):
+    """/api/dashboard against /api/beehives and /api/stats"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with active and sold beehives of both species and health states"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for i in range(ACTIVE + SOLD):
+            db.session.add(Beehive(
+                serial_number=f'TO{i + 1:03d}', qr_token=f'qr{i + 1:010d}', import_date=date(2025, 1, 1 + i % 28),
+                health_status='Tốt' if i % 3 else 'Yếu', species='Furva Vàng' if i % 2 else 'Furva Đen',
+                user_id=user.id, is_sold=i >= ACTIVE,
+            ))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def get(self, url):
+        response = self.client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def test_01_matches_separate_endpoints(self):
+        """Page, pagination, counters and breakdowns equal the separate calls"""
+        dashboard = self.get('/api/dashboard?page=1&per_page=10')
+        listing = self.get('/api/beehives?page=1&per_page=10')
+        stats = self.get('/api/stats')
+
+        self.assertEqual(dashboard['beehives'], listing['beehives'])
+        self.assertEqual(dashboard['pagination'], listing['pagination'])
+        self.assertEqual(dashboard['health_stats'], listing['health_stats'])
+        self.assertEqual(dashboard['stats'], stats)
+        self.assertEqual(dashboard['stats']['active'], ACTIVE)
+        self.assertEqual(dashboard['stats']['sold'], SOLD)
+        self.assertEqual(sum(dashboard['species_stats'].values()), ACTIVE)
+
+    def test_02_pagination(self):
+        """Later pages follow the list endpoint, last page flags are right"""
+        dashboard = self.get('/api/dashboard?page=3&per_page=10')
+        listing = self.get('/api/beehives?page=3&per_page=10')
+        self.assertEqual(dashboard['beehives'], listing['beehives'])
+        self.assertEqual(len(dashboard['beehives']), ACTIVE - 20)
+        self.assertEqual(dashboard['pagination']['total_pages'], 3)
+        self.assertTrue(dashboard['pagination']['has_prev'])
+        self.assertFalse(dashboard['pagination']['has_next'])
+        self.assertTrue(all(not beehive['is_sold'] for beehive in dashboard['beehives']))
+
+    def test_03_invalid_pagination(self):
+        """Out-of-range pagination is rejected like on the list endpoint"""
+        response = self.client.get('/api/dashboard?per_page=1000', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_04_reflects_writes(self):
+        """A sale moves the counters on the next call (cache invalidated)"""
+        before = self.get('/api/dashboard')['stats']
+        response = self.client.post('/api/beehives/TO001/sell', headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        after = self.get('/api/dashboard')['stats']
+        self.assertEqual(after['active'], before['active'] - 1)
+        self.assertEqual(after['sold'], before['sold'] + 1)
+
+    def test_05_requires_login(self):
+        """The dashboard is per-user"""
+        self.assertEqual(self.client.get('/api/dashboard').status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Sparse Fieldset Tests for KBee Manager
+Checks ?fields= and ?view=summary on the list endpoints: the returned keys,
+the 400 on unknown fields or views, and that the list query selects only
+the requested columns (with_entities projection, no ORM hydration).
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import sys
+import unittest
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+
+
+class FieldsetTests(unittest.TestCase):
+    """fields= and view= on /api/beehives and /api/sold-beehives"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with active and sold beehives"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for i in range(6):
+            db.session.add(Beehive(serial_number=f'TO{i + 1:03d}', qr_token=f'qr{i + 1:010d}',
+                                   import_date=date(2025, 1, 1 + i), health_status='Tốt', notes=f'ghi chú {i}',
+                                   user_id=user.id, is_sold=i >= 4, sold_date=date(2025, 2, 1) if i >= 4 else None))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def get(self, url, status=200):
+        response = self.client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status, response.get_json())
+        return response.get_json()
+
+    @contextmanager
+    def statements(self):
+        """Collect the SQL statements run inside the block"""
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield executed
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    def test_01_fields(self):
+        """Only the requested fields are returned, serial number first"""
+        for url in ('/api/beehives', '/api/sold-beehives'):
+            with self.subTest(url=url):
+                full = self.get(url)['beehives']
+                sparse = self.get(f'{url}?fields=health_status,import_date')['beehives']
+                self.assertEqual(len(sparse), len(full))
+                for row, complete in zip(sparse, full):
+                    self.assertEqual(list(row), ['serial_number', 'health_status', 'import_date'])
+                    self.assertEqual(row, {key: complete[key] for key in row})
+
+    def test_02_duplicates_and_serial(self):
+        """Repeated fields and an explicit serial_number are folded"""
+        rows = self.get('/api/beehives?fields=species,serial_number,species')['beehives']
+        self.assertEqual(list(rows[0]), ['serial_number', 'species'])
+
+    def test_03_summary_view(self):
+        """view=summary returns the compact field set"""
+        rows = self.get('/api/beehives?view=summary')['beehives']
+        self.assertEqual(list(rows[0]), list(Beehive.SUMMARY_FIELDS))
+        self.assertNotIn('notes', rows[0])
+
+    def test_04_invalid(self):
+        """Unknown fields or views are rejected with 400"""
+        body = self.get('/api/beehives?fields=serial_number,password_hash', status=400)
+        self.assertEqual(body['field'], 'fields')
+        body = self.get('/api/sold-beehives?view=compact', status=400)
+        self.assertEqual(body['field'], 'view')
+
+    def test_05_projection(self):
+        """The page query selects only the requested columns"""
+        with self.statements() as executed:
+            self.get('/api/beehives?fields=health_status&sort_field=serial_number')
+        page_queries = [s for s in executed if 'LIMIT' in s and 'beehive.health_status' in s]
+        self.assertEqual(len(page_queries), 1, executed)
+        select_list = page_queries[0].split('FROM')[0]
+        self.assertIn('beehive.serial_number', select_list)
+        self.assertNotIn('beehive.notes', select_list)
+        self.assertNotIn('beehive.qr_token', select_list)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Filter Tests for KBee Manager
+Checks the list filters of /api/beehives and /api/sold-beehives: exact
+dates, inclusive date ranges (open on either end), multi-value
+health_status and species (repeated or comma-separated), their
+combination, and the 400 responses on malformed dates, inverted ranges
+and unknown choices.
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+
+START = date(2025, 1, 1)
+BEEHIVES = 40
+HEALTH = ['Tốt', 'Yếu']
+SPECIES = ['Furva Vàng', 'Furva Đen']
+
+
+def beehive_values(i):
+    """Deterministic attributes of the i-th beehive (every fourth one is sold)"""
+    sold = i % 4 == 0
+    return {
+        'serial_number': f'TO{i + 1:03d}',
+        'import_date': START + timedelta(days=i),
+        'split_date': START + timedelta(days=i % 5) if i % 2 else None,
+        'health_status': HEALTH[i % 2],
+        'species': SPECIES[i % 3 == 0],
+        'is_sold': sold,
+        'sold_date': START + timedelta(days=30 + i) if sold else None,
+    }
+
+
+ROWS = [beehive_values(i) for i in range(BEEHIVES)]
+
+
+class FilterTests(unittest.TestCase):
+    """Date, range and multi-value list filters"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with active and sold beehives spread over dates, states and species"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for i, values in enumerate(ROWS):
+            db.session.add(Beehive(qr_token=f'qr{i:010d}', user_id=user.id, **values))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def get(self, path, params, status=200):
+        response = self.client.get(f'{path}?{urlencode(params, doseq=True)}', headers=self.headers)
+        self.assertEqual(response.status_code, status, response.get_json())
+        return response.get_json()
+
+    def active(self, **params):
+        body = self.get('/api/beehives', dict(params, per_page=100))
+        return {beehive['serial_number'] for beehive in body['beehives']}
+
+    def sold(self, **params):
+        body = self.get('/api/sold-beehives', dict(params, per_page=100))
+        return {beehive['serial_number'] for beehive in body['beehives']}
+
+    @staticmethod
+    def expected(is_sold, predicate):
+        return {row['serial_number'] for row in ROWS if row['is_sold'] == is_sold and predicate(row)}
+
+    def test_01_exact_dates(self):
+        """import_date, split_date and sold_date match one day"""
+        day = START + timedelta(days=5)
+        self.assertEqual(self.active(import_date=day.isoformat()), {'TO006'})
+        self.assertEqual(self.active(split_date=(START + timedelta(days=3)).isoformat()),
+                         self.expected(False, lambda row: row['split_date'] == START + timedelta(days=3)))
+        self.assertEqual(self.sold(sold_date=(START + timedelta(days=38)).isoformat()), {'TO009'})
+
+    def test_02_import_range(self):
+        """import_from / import_to are inclusive and may be open-ended"""
+        low, high = START + timedelta(days=10), START + timedelta(days=20)
+        self.assertEqual(self.active(import_from=low.isoformat(), import_to=high.isoformat()),
+                         self.expected(False, lambda row: low <= row['import_date'] <= high))
+        self.assertEqual(self.active(import_from=high.isoformat()),
+                         self.expected(False, lambda row: row['import_date'] >= high))
+        self.assertEqual(self.active(import_to=low.isoformat()),
+                         self.expected(False, lambda row: row['import_date'] <= low))
+        self.assertEqual(self.active(import_from=low.isoformat(), import_to=low.isoformat()),
+                         self.expected(False, lambda row: row['import_date'] == low))
+
+    def test_03_sold_range(self):
+        """sold_from / sold_to filter the sold list and combine with import ranges"""
+        low, high = START + timedelta(days=35), START + timedelta(days=55)
+        self.assertEqual(self.sold(sold_from=low.isoformat(), sold_to=high.isoformat()),
+                         self.expected(True, lambda row: low <= row['sold_date'] <= high))
+        cutoff = START + timedelta(days=15)
+        self.assertEqual(self.sold(sold_from=low.isoformat(), import_to=cutoff.isoformat()),
+                         self.expected(True, lambda row: row['sold_date'] >= low and row['import_date'] <= cutoff))
+
+    def test_04_multi_value(self):
+        """Repeated and comma-separated values select any of them"""
+        self.assertEqual(self.active(health_status='Yếu'), self.expected(False, lambda row: row['health_status'] == 'Yếu'))
+        everything = self.expected(False, lambda row: True)
+        self.assertEqual(self.active(health_status=['Tốt', 'Yếu']), everything)
+        self.assertEqual(self.active(health_status='Tốt,Yếu'), everything)
+        self.assertEqual(self.active(species='Furva Đen, Furva Đen'), self.expected(False, lambda row: row['species'] == 'Furva Đen'))
+        self.assertEqual(self.sold(species=['Furva Vàng']), self.expected(True, lambda row: row['species'] == 'Furva Vàng'))
+
+    def test_05_combined(self):
+        """Ranges and multi-value filters are AND-ed, and the total follows"""
+        low = START + timedelta(days=8)
+        params = {'import_from': low.isoformat(), 'health_status': 'Tốt', 'species': ['Furva Vàng']}
+        expected = self.expected(False, lambda row: row['import_date'] >= low and row['health_status'] == 'Tốt'
+                                 and row['species'] == 'Furva Vàng')
+        self.assertEqual(self.active(**params), expected)
+        self.assertEqual(self.get('/api/beehives', params)['pagination']['total'], len(expected))
+
+    def test_06_malformed_dates(self):
+        """Malformed dates are rejected with 400 naming the parameter"""
+        for field, value in (('import_date', '2025-13-01'), ('import_from', '01/02/2025'),
+                             ('import_to', 'yesterday'), ('split_date', '2025-02-30')):
+            with self.subTest(field=field):
+                body = self.get('/api/beehives', {field: value}, status=400)
+                self.assertEqual(body['field'], field)
+        body = self.get('/api/sold-beehives', {'sold_to': '2025-1-1x'}, status=400)
+        self.assertEqual(body['field'], 'sold_to')
+
+    def test_07_inverted_range_and_unknown_choice(self):
+        """from after to, and values outside the choices, are rejected with 400"""
+        body = self.get('/api/beehives', {'import_from': '2025-02-01', 'import_to': '2025-01-01'}, status=400)
+        self.assertEqual(body['field'], 'import_from')
+        body = self.get('/api/beehives', {'health_status': 'Tốt,Khá'}, status=400)
+        self.assertEqual(body['field'], 'health_status')
+        body = self.get('/api/sold-beehives', {'species': 'Apis'}, status=400)
+        self.assertEqual(body['field'], 'species')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
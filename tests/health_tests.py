@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Health Check Tests for KBee Manager
+Calls /healthz/live and /healthz/ready in-process and checks the readiness
+report: latency numbers, caching, and 503 when the database is too slow or
+the connection pool has no headroom.
+
+Uses the testing config: SQLite in memory by default, or MySQL when
+TEST_DATABASE_URL points at a scratch database.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db
+from backend.utils.health import readiness
+
+
+class HealthTests(unittest.TestCase):
+    """Liveness and readiness probes"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the app (the probes need no data)"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        cls.client = cls.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ctx.pop()
+
+    def setUp(self):
+        self.saved = (readiness.cache_seconds, readiness.db_threshold_ms, readiness.min_pool_headroom)
+        readiness.cache_seconds = 0
+
+    def tearDown(self):
+        readiness.cache_seconds, readiness.db_threshold_ms, readiness.min_pool_headroom = self.saved
+
+    def test_01_live(self):
+        """Liveness answers without touching dependencies"""
+        response = self.client.get('/healthz/live')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'alive')
+
+    def test_02_ready_reports_latency(self):
+        """Readiness times the database and reports the pool"""
+        response = self.client.get('/healthz/ready')
+        report = response.get_json()
+        self.assertEqual(response.status_code, 200, report)
+        self.assertTrue(report['ready'])
+        self.assertIn(report['status'], ('ready', 'degraded'))
+        database = report['checks']['database']
+        self.assertTrue(database['ok'])
+        self.assertGreaterEqual(database['latency_ms'], 0)
+        self.assertIn('threshold_ms', database)
+        self.assertIn('pool', report['checks'])
+        self.assertIn('redis', report['checks'])
+
+    def test_03_ready_is_cached(self):
+        """Probes within HEALTH_CACHE_SECONDS reuse the last result"""
+        readiness.cache_seconds = 60
+        readiness.check()
+        statements = []
+
+        def count(*args):
+            statements.append(args[2])
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            report = self.client.get('/healthz/ready').get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        self.assertTrue(report['cached'])
+        self.assertEqual(statements, [])
+
+    def test_04_slow_database_not_ready(self):
+        """A database slower than its threshold makes the worker not ready"""
+        readiness.db_threshold_ms = -1
+        response = self.client.get('/healthz/ready')
+        report = response.get_json()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(report['status'], 'not_ready')
+        self.assertFalse(report['checks']['database']['ok'])
+
+    def test_05_pool_headroom(self):
+        """Too few free pooled connections makes the worker not ready"""
+        readiness.min_pool_headroom = 1
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f'sqlite:///{tmp}/pool.db', poolclass=QueuePool, pool_size=2, max_overflow=1)
+            connections = [engine.connect() for _ in range(2)]
+            self.assertEqual(readiness._check_pool(engine)['headroom'], 1)
+            self.assertTrue(readiness._check_pool(engine)['ok'])
+            connections.append(engine.connect())
+            pool = readiness._check_pool(engine)
+            for connection in connections:
+                connection.close()
+            engine.dispose()
+        self.assertFalse(pool['ok'])
+        self.assertEqual((pool['capacity'], pool['in_use'], pool['headroom']), (3, 3, 0))
+
+    def test_06_full_pool_skips_query(self):
+        """With no headroom the database query is skipped (it would wait pool_timeout)"""
+        check_pool = readiness._check_pool
+        readiness._check_pool = lambda engine: {'ok': False, 'headroom': 0}
+        try:
+            response = self.client.get('/healthz/ready')
+        finally:
+            readiness._check_pool = check_pool
+        report = response.get_json()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('skipped', report['checks']['database']['error'])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache Tests for KBee Manager
+Revalidates the list, sold list, dashboard and detail endpoints with
+If-None-Match and checks that a matching ETag is answered with 304 before
+any database query runs, that a write changes the ETag, and that a reset
+version store never reissues an old ETag.
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils.invalidation import SharedMemoryVersionStore, invalidation_bus
+
+CACHED_ENDPOINTS = [
+    '/api/beehives',
+    '/api/beehives?page=1&per_page=5&sort_field=serial_number',
+    '/api/sold-beehives',
+    '/api/dashboard',
+    '/api/beehives/TO001',
+]
+
+
+def queries_run(response):
+    """Statement count reported in the Server-Timing header"""
+    match = re.search(r'desc="(\d+) queries"', response.headers.get('Server-Timing', ''))
+    return int(match.group(1)) if match else None
+
+
+class HttpCacheTests(unittest.TestCase):
+    """ETag revalidation"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with an active and a sold beehive"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=user.id))
+        db.session.add(Beehive(serial_number='TO002', qr_token='qr0000000002', import_date=date(2025, 1, 2),
+                               health_status='Tốt', user_id=user.id, is_sold=True))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, headers=dict(self.headers, **{'If-None-Match': etag}))
+
+    def test_01_not_modified_without_queries(self):
+        """A matching If-None-Match gets a 304 and runs no query"""
+        for url in CACHED_ENDPOINTS:
+            with self.subTest(url=url):
+                response = self.client.get(url, headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+                etag = response.headers.get('ETag')
+                self.assertTrue(etag)
+                self.assertGreater(queries_run(response), 0)
+
+                response = self.revalidate(url, etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.data, b'')
+                self.assertEqual(response.headers['ETag'], etag)
+                self.assertEqual(queries_run(response), 0)
+
+    def test_02_etag_depends_on_request(self):
+        """Different query strings get different ETags"""
+        first = self.client.get('/api/beehives?page=1', headers=self.headers).headers['ETag']
+        second = self.client.get('/api/beehives?page=2', headers=self.headers).headers['ETag']
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.revalidate('/api/beehives?page=2', first).status_code, 200)
+
+    def test_03_write_changes_etag(self):
+        """After an update the old ETag no longer matches"""
+        etag = self.client.get('/api/beehives', headers=self.headers).headers['ETag']
+        response = self.client.put('/api/beehives/TO001', json={'notes': 'moved'}, headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        response = self.revalidate('/api/beehives', etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_04_store_reset_changes_etag(self):
+        """Two stores at the same counter (a reset) produce different ETags"""
+        directory = tempfile.mkdtemp(prefix='kbee_etag_')
+        original = invalidation_bus.store
+        try:
+            invalidation_bus.store = SharedMemoryVersionStore(os.path.join(directory, 'before'))
+            before = self.client.get('/api/beehives', headers=self.headers).headers['ETag']
+            invalidation_bus.store = SharedMemoryVersionStore(os.path.join(directory, 'after'))
+            response = self.revalidate('/api/beehives', before)
+        finally:
+            invalidation_bus.store = original
+            shutil.rmtree(directory, ignore_errors=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], before)
+
+    def test_05_unknown_version_not_cacheable(self):
+        """Without a trustworthy version there is no ETag and no 304"""
+        etag = self.client.get('/api/beehives', headers=self.headers).headers['ETag']
+        original = invalidation_bus.store
+        invalidation_bus.store = None
+        try:
+            response = self.revalidate('/api/beehives', etag)
+        finally:
+            invalidation_bus.store = original
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
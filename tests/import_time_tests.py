@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Import Time Tests for KBee Manager
+Measures `python -X importtime -c "import app"` (what every gunicorn worker
+or test run pays before serving) and enforces a budget. Export-only
+dependencies (reportlab, qrcode, PIL) must not be imported at all.
+
+Budget: KBEE_IMPORT_BUDGET_MS (default 1500 ms, best of 3 runs).
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_MS = float(os.getenv('KBEE_IMPORT_BUDGET_MS', '1500'))
+LAZY_MODULES = ('reportlab', 'qrcode', 'PIL')
+
+
+def run_python(code, importtime=False):
+    """Run code in a fresh interpreter from the repository root"""
+    env = dict(os.environ, FLASK_ENV='testing')
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    return subprocess.run(command, cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from -X importtime output"""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+class ImportTimeTests(unittest.TestCase):
+    """Worker import cost of the application module"""
+
+    def test_01_export_dependencies_are_lazy(self):
+        """reportlab, qrcode and PIL are not imported with the app"""
+        result = run_python(
+            'import sys, app; '
+            f'print(",".join(sorted({{m.split(".")[0] for m in sys.modules}} & {set(LAZY_MODULES)!r})))'
+        )
+        loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+        self.assertEqual(loaded, '', f'Imported at app load: {loaded}')
+
+    def test_02_import_time_budget(self):
+        """import app stays within the budget"""
+        best_ms = None
+        timings = {}
+        for _ in range(3):
+            timings = parse_importtime(run_python('import app', importtime=True).stderr)
+            total_ms = timings['app'][1] / 1000
+            best_ms = total_ms if best_ms is None else min(best_ms, total_ms)
+
+        slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:10]
+        report = '\n'.join(f'{self_us / 1000:8.1f} ms  {name}' for name, (self_us, _) in slowest)
+        print(f'\n⏱️  import app: {best_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)\n{report}')
+        self.assertLessEqual(best_ms, IMPORT_BUDGET_MS, f'Slowest modules (self time):\n{report}')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Index Usage Tests for KBee Manager
+Runs the list endpoints in-process, captures the SQL they issue and checks
+with EXPLAIN that every beehive query is served by an index (and sorted by
+it, without a filesort / temporary B-tree).
+
+Uses the testing config: SQLite in memory by default, or MySQL when
+TEST_DATABASE_URL points at a scratch database.
+"""
+
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+from sqlalchemy import event, text
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+
+LIST_SORT_FIELDS = ['serial_number', 'created_at', 'import_date', 'split_date', 'health_status', 'species']
+SOLD_SORT_FIELDS = ['serial_number', 'created_at', 'import_date', 'sold_date', 'health_status', 'species']
+
+
+class IndexUsageTests(unittest.TestCase):
+    """EXPLAIN the queries behind the beehive list endpoints"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the schema and a few hundred beehives for two users"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+        cls.dialect = db.engine.dialect.name
+
+        users = []
+        for name in ('owner', 'other'):
+            user = User(username=name, email=f'{name}@kbee.test')
+            user.set_password('Password123')
+            db.session.add(user)
+            users.append(user)
+        db.session.flush()
+
+        start = date(2025, 1, 1)
+        for i in range(400):
+            sold = i % 3 == 0
+            db.session.add(Beehive(
+                serial_number=f'TO{i + 1:03d}',
+                qr_token=f'qr{i:010d}',
+                import_date=start + timedelta(days=i % 200),
+                split_date=start + timedelta(days=i % 50) if i % 2 else None,
+                health_status='Tốt' if i % 4 else 'Yếu',
+                species='Furva Vàng' if i % 5 else 'Furva Đen',
+                is_sold=sold,
+                sold_date=start + timedelta(days=i % 90) if sold else None,
+                user_id=users[i % 2].id,
+            ))
+        db.session.commit()
+        if cls.dialect == 'mysql':
+            db.session.execute(text('ANALYZE TABLE beehive'))
+        elif cls.dialect == 'sqlite':
+            db.session.execute(text('ANALYZE'))
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def capture_queries(self, url):
+        """Request url and return the (statement, parameters) of its beehive SELECTs"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and 'FROM beehive' in statement:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(url, headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertTrue(statements, f'No beehive query captured for {url}')
+        return statements
+
+    def explain(self, statement, parameters):
+        """Plan problems of one statement: full scans and filesorts"""
+        problems = []
+        with db.engine.connect() as connection:
+            if self.dialect == 'sqlite':
+                rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+                for row in rows:
+                    detail = row[-1]
+                    if detail.startswith('SCAN beehive') and 'INDEX' not in detail:
+                        problems.append(detail)
+                    if 'TEMP B-TREE FOR ORDER BY' in detail:
+                        problems.append(detail)
+            else:
+                result = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters)
+                for row in result.mappings():
+                    if row['table'] != 'beehive':
+                        continue
+                    if row['type'] == 'ALL' or row['key'] is None:
+                        problems.append(f"full scan: {dict(row)}")
+                    if 'filesort' in (row['Extra'] or ''):
+                        problems.append(f"filesort: {dict(row)}")
+        return problems
+
+    def assertIndexed(self, url):
+        for statement, parameters in self.capture_queries(url):
+            problems = self.explain(statement, parameters)
+            self.assertEqual(problems, [], f'{url}\n{statement}')
+
+    def test_01_list_sorts_use_index(self):
+        """Every sort of the active list is read in index order"""
+        for field in LIST_SORT_FIELDS:
+            for order in ('asc', 'desc'):
+                with self.subTest(sort_field=field, sort_order=order):
+                    self.assertIndexed(f'/api/beehives?sort_field={field}&sort_order={order}')
+
+    def test_02_sold_list_sorts_use_index(self):
+        """Every sort of the sold list is read in index order"""
+        for field in SOLD_SORT_FIELDS:
+            for order in ('asc', 'desc'):
+                with self.subTest(sort_field=field, sort_order=order):
+                    self.assertIndexed(f'/api/sold-beehives?sort_field={field}&sort_order={order}')
+
+    def test_03_range_filters_use_index(self):
+        """Date ranges sorted on the same column are index range scans"""
+        self.assertIndexed('/api/beehives?import_from=2025-02-01&import_to=2025-03-01&sort_field=import_date')
+        self.assertIndexed('/api/sold-beehives?sold_from=2025-01-10&sold_to=2025-02-10&sort_field=sold_date')
+
+    def test_04_dashboard_uses_index(self):
+        """Dashboard first page is read in index order"""
+        self.assertIndexed('/api/dashboard')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Cache Invalidation Tests for KBee Manager
+Checks the version stores (counters, epochs across resets), that a failed
+publish disables version-keyed caching until a retry succeeds, and which
+transaction outcomes publish or discard the scopes of a flush.
+
+Uses the testing config (SQLite in memory, shared memory store). The Redis
+store is tested too when TEST_REDIS_URL points at a scratch Redis.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils import invalidation
+from backend.utils.cache import VersionedCache
+from backend.utils.invalidation import (
+    RedisVersionStore, SharedMemoryVersionStore, invalidation_bus, user_scope,
+)
+
+TEST_REDIS_URL = os.getenv('TEST_REDIS_URL')
+
+
+class RecordingStore:
+    """Wraps a store, recording bumps and failing them on demand"""
+
+    def __init__(self, store):
+        self.store = store
+        self.bumped = []
+        self.fail = False
+
+    def get(self, scope):
+        return self.store.get(scope)
+
+    def epoch(self):
+        return self.store.epoch()
+
+    def bump(self, scopes):
+        if self.fail:
+            raise ConnectionError('store unavailable')
+        scopes = list(scopes)
+        self.bumped.append(scopes)
+        self.store.bump(scopes)
+
+
+class VersionStoreTests(unittest.TestCase):
+    """Counters and epochs of the version stores"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='kbee_invalidation_')
+        self.path = os.path.join(self.directory, 'versions')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_01_shm_counters(self):
+        """Bumps are visible to every store opened on the same file"""
+        writer, reader = SharedMemoryVersionStore(self.path), SharedMemoryVersionStore(self.path)
+        self.assertEqual(reader.get('user:1'), 0)
+        writer.bump(['user:1', 'user:2'])
+        writer.bump(['user:1'])
+        self.assertEqual(reader.get('user:1'), 2)
+        self.assertEqual(reader.get('user:2'), 1)
+        self.assertEqual(reader.epoch(), writer.epoch())
+        self.assertNotEqual(reader.epoch(), 0)
+
+    def test_02_shm_reset_changes_epoch(self):
+        """A recreated file restarts the counters under a new epoch"""
+        before = SharedMemoryVersionStore(self.path)
+        before.bump(['user:1'])
+        old = (before.epoch(), before.get('user:1'))
+        os.remove(self.path)
+
+        after = SharedMemoryVersionStore(self.path)
+        after.bump(['user:1'])
+        new = (after.epoch(), after.get('user:1'))
+        self.assertEqual(old[1], new[1])
+        self.assertNotEqual(old, new)
+
+    @unittest.skipUnless(TEST_REDIS_URL, 'TEST_REDIS_URL not set')
+    def test_03_redis_reset_changes_epoch(self):
+        """A flushed Redis gets a new epoch on the next bump"""
+        import redis
+        client = redis.Redis.from_url(TEST_REDIS_URL)
+        client.flushdb()
+        store = RedisVersionStore(client)
+        store.bump(['user:1'])
+        old = (store.epoch(), store.get('user:1'))
+        client.flushdb()
+        store.bump(['user:1'])
+        new = (store.epoch(), store.get('user:1'))
+        self.assertEqual(old[1], new[1])
+        self.assertNotEqual(old, new)
+
+
+class InvalidationBusTests(unittest.TestCase):
+    """Publishing after commits and behaviour when publishing fails"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with one beehive"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=user.id))
+        db.session.commit()
+        cls.scope = user_scope(user.id)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def setUp(self):
+        self.original_store = invalidation_bus.store
+        self.store = RecordingStore(self.original_store)
+        invalidation_bus.store = self.store
+
+    def tearDown(self):
+        invalidation_bus.store = self.original_store
+        invalidation_bus._failed_scopes = set()
+        db.session.rollback()
+
+    def update_notes(self, notes):
+        beehive = Beehive.query.filter_by(serial_number='TO001').one()
+        beehive.notes = notes
+        db.session.flush()
+
+    def test_01_commit_publishes(self):
+        """A committed write bumps the owner's scope"""
+        before = invalidation_bus.version(self.scope)
+        self.update_notes('committed')
+        db.session.commit()
+        self.assertEqual(self.store.bumped, [[self.scope]])
+        self.assertNotEqual(invalidation_bus.version(self.scope), before)
+
+    def test_02_rollback_discards(self):
+        """A rolled back transaction publishes nothing"""
+        self.update_notes('rolled back')
+        db.session.rollback()
+        db.session.commit()
+        self.assertEqual(self.store.bumped, [])
+
+    def test_03_savepoint_rollback_keeps_outer_scopes(self):
+        """Rolling back a savepoint keeps the scopes flushed before it"""
+        self.update_notes('outer')
+        savepoint = db.session.begin_nested()
+        self.update_notes('inner')
+        savepoint.rollback()
+        db.session.commit()
+        self.assertEqual(self.store.bumped, [[self.scope]])
+
+    def test_04_failed_publish_disables_caching(self):
+        """After a failed bump versions are unknown until a retry succeeds"""
+        cache = VersionedCache(name='test')
+        calls = []
+        cache.get_or_set(self.scope, 'key', lambda: calls.append(1))
+        cache.get_or_set(self.scope, 'key', lambda: calls.append(1))
+        self.assertEqual(len(calls), 1)
+
+        self.store.fail = True
+        self.update_notes('unpublished')
+        db.session.commit()
+        self.assertIsNone(invalidation_bus.version(self.scope))
+        cache.get_or_set(self.scope, 'key', lambda: calls.append(1))
+        cache.get_or_set(self.scope, 'key', lambda: calls.append(1))
+        self.assertEqual(len(calls), 3)
+
+        # The retry waits PUBLISH_RETRY_SECONDS, then bumps the failed scope
+        self.store.fail = False
+        invalidation_bus._retry_at = 0.0
+        self.assertIsNotNone(invalidation_bus.version(self.scope))
+        self.assertEqual(self.store.bumped, [[self.scope]])
+        cache.get_or_set(self.scope, 'key', lambda: calls.append(1))
+        cache.get_or_set(self.scope, 'key', lambda: calls.append(1))
+        self.assertEqual(len(calls), 4)
+
+    def test_05_retry_waits(self):
+        """Versions stay unknown during the retry interval"""
+        self.store.fail = True
+        invalidation_bus.publish([self.scope])
+        self.store.fail = False
+        self.assertGreater(invalidation.PUBLISH_RETRY_SECONDS, 0)
+        self.assertIsNone(invalidation_bus.version(self.scope))
+        self.assertEqual(self.store.bumped, [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+JSON Provider Tests for KBee Manager
+Checks that Beehive.to_dict keeps native dates, that the orjson and stdlib
+providers produce the same documents (ISO 8601 dates, unescaped Vietnamese
+text), and that the API responses use them.
+
+Uses the testing config (SQLite in memory). The orjson checks are skipped
+when orjson is not installed.
+"""
+
+import os
+import sys
+import json
+import unittest
+from datetime import date, datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils.json_provider import KBeeJSONProvider, ORJSONProvider, get_json_provider_class, orjson
+
+
+class JsonProviderTests(unittest.TestCase):
+    """Native dates in to_dict and their encoding"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with one beehive"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 2),
+                               split_date=date(2025, 3, 4), health_status='Tốt', species='Furva Đen',
+                               notes='Đàn mạnh', user_id=user.id,
+                               created_at=datetime(2025, 1, 2, 8, 30, 15, 123456)))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        cls.document = db.session.get(Beehive, 'TO001').to_dict()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def test_01_to_dict_keeps_native_dates(self):
+        """to_dict leaves date formatting to the JSON provider"""
+        self.assertIsInstance(self.document['import_date'], date)
+        self.assertIsInstance(self.document['created_at'], datetime)
+        self.assertIsNone(self.document['sold_date'])
+
+    def test_02_stdlib_provider(self):
+        """The stdlib provider writes ISO dates and UTF-8 text"""
+        text = KBeeJSONProvider(self.app).dumps(self.document)
+        self.assertIn('"import_date": "2025-01-02"', text)
+        self.assertIn('"created_at": "2025-01-02T08:30:15.123456"', text)
+        self.assertIn('Đàn mạnh', text)
+
+    @unittest.skipUnless(orjson, 'orjson not installed')
+    def test_03_orjson_matches_stdlib(self):
+        """orjson produces the same document as the stdlib provider"""
+        fast = ORJSONProvider(self.app).dumps(self.document)
+        slow = KBeeJSONProvider(self.app).dumps(self.document)
+        self.assertEqual(json.loads(fast), json.loads(slow))
+        self.assertIn('Đàn mạnh', fast)
+
+    @unittest.skipUnless(orjson, 'orjson not installed')
+    def test_04_orjson_options_fall_back(self):
+        """Options orjson does not support (indent) use the stdlib encoder"""
+        text = ORJSONProvider(self.app).dumps({'a': date(2025, 1, 2)}, indent=2)
+        self.assertEqual(text, '{\n  "a": "2025-01-02"\n}')
+
+    def test_05_provider_selection(self):
+        """JSON_PROVIDER picks the provider, auto prefers orjson when installed"""
+        self.assertIs(get_json_provider_class('stdlib'), KBeeJSONProvider)
+        self.assertIs(get_json_provider_class('auto'), ORJSONProvider if orjson else KBeeJSONProvider)
+        self.assertIsInstance(self.app.json, get_json_provider_class(self.app.config['JSON_PROVIDER']))
+
+    def test_06_api_response(self):
+        """The detail endpoint returns ISO dates through the app's provider"""
+        response = self.client.get('/api/beehives/TO001', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['import_date'], '2025-01-02')
+        self.assertEqual(body['split_date'], '2025-03-04')
+        self.assertEqual(body['created_at'], '2025-01-02T08:30:15.123456')
+        self.assertIn('Furva Đen'.encode('utf-8'), response.data)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
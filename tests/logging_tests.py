@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Logging Tests for KBee Manager
+Checks the LOG_LEVEL and LOG_SAMPLE_RATES parsers, the JSON formatter, that
+logging through the queue does not wait for slow handlers, and that a forked
+worker gets its own listener.
+
+Uses the testing config with the queue pipeline switched on explicitly.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import tempfile
+import unittest
+import contextlib
+import multiprocessing
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.utils.log_config import LogPipeline, JsonFormatter, SamplingFilter, parse_levels, parse_sample_rates
+
+
+class SlowHandler(logging.Handler):
+    """A handler standing in for a slow disk or a blocked pipe"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.records = []
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.records.append(record)
+
+
+def _log_in_child(pipeline):
+    """Forked worker: log an error and flush it through this process's listener"""
+    logging.getLogger('backend.worker').error('error from pid %s', os.getpid())
+    pipeline.stop()
+
+
+class LoggingTests(unittest.TestCase):
+    """Queue pipeline, formatter and filters"""
+
+    @classmethod
+    def setUpClass(cls):
+        """App with a per-logger override and a private LOG_DIR"""
+        cls.log_dir = tempfile.mkdtemp(prefix='kbee_logs_')
+        cls.app = create_app('testing')
+        cls.app.config.update(LOG_LEVEL='INFO,backend.routes.auth=WARNING', LOG_FORMAT='json',
+                              LOG_SAMPLE_RATES='backend.noisy=0', LOG_DIR=cls.log_dir)
+        cls.app.testing = False
+        cls.pipeline = LogPipeline()
+        cls.stdout = io.StringIO()
+        with contextlib.redirect_stdout(cls.stdout):
+            cls.pipeline.init_app(cls.app)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Detach the pipeline from the root logger"""
+        cls.pipeline.stop()
+        logging.getLogger().removeHandler(cls.pipeline.handler)
+        cls.app.testing = True
+        shutil.rmtree(cls.log_dir, ignore_errors=True)
+
+    def lines(self):
+        """JSON records written to stdout so far"""
+        self.pipeline.stop()
+        self.pipeline.start()
+        return [json.loads(line) for line in self.stdout.getvalue().splitlines()]
+
+    def test_01_parse_levels(self):
+        """Application level first, then name=level overrides"""
+        self.assertEqual(parse_levels('warn'), (logging.WARNING, {}))
+        self.assertEqual(parse_levels('INFO, backend.routes=DEBUG ,sqlalchemy.engine=info'),
+                         (logging.INFO, {'backend.routes': logging.DEBUG, 'sqlalchemy.engine': logging.INFO}))
+        self.assertEqual(parse_levels(''), (logging.INFO, {}))
+        with self.assertRaises(ValueError):
+            parse_levels('INFO,backend=LOUD')
+
+    def test_02_levels_applied(self):
+        """App loggers follow LOG_LEVEL, third parties stay at WARNING, overrides win"""
+        self.assertEqual(logging.getLogger('backend').level, logging.INFO)
+        self.assertEqual(logging.getLogger().level, logging.WARNING)
+        self.assertFalse(logging.getLogger('sqlalchemy.engine').isEnabledFor(logging.INFO))
+        self.assertFalse(logging.getLogger('backend.routes.auth').isEnabledFor(logging.INFO))
+        self.assertTrue(logging.getLogger('backend.routes.beehives').isEnabledFor(logging.INFO))
+
+    def test_03_json_records(self):
+        """One JSON object per record, with extras and exceptions"""
+        logger = logging.getLogger('backend.routes.beehives')
+        logger.info('Beehive %s updated', 'TO001', extra={'user_id': 7})
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            logger.exception('Update failed')
+        records = [line for line in self.lines() if line['logger'] == 'backend.routes.beehives']
+        self.assertEqual(records[0]['message'], 'Beehive TO001 updated')
+        self.assertEqual(records[0]['level'], 'INFO')
+        self.assertEqual(records[0]['user_id'], 7)
+        self.assertIn('RuntimeError: boom', records[1]['exception'])
+
+        with open(os.path.join(self.log_dir, 'error.log')) as f:
+            self.assertIn('Update failed', f.read())
+
+    def test_04_sampling(self):
+        """Sampled loggers drop INFO records but always keep warnings"""
+        self.assertEqual(parse_sample_rates('backend.routes=0.1,backend=2'),
+                         {'backend.routes': 0.1, 'backend': 1.0})
+        sampling = SamplingFilter({'backend': 0.5, 'backend.noisy': 0.0})
+        self.assertEqual(sampling.rate_for('backend.noisy.child'), 0.0)
+        self.assertEqual(sampling.rate_for('backend.routes'), 0.5)
+        self.assertEqual(sampling.rate_for('backendx'), 1.0)
+
+        logger = logging.getLogger('backend.noisy')
+        logger.info('dropped')
+        logger.warning('kept')
+        messages = [line['message'] for line in self.lines() if line['logger'] == 'backend.noisy']
+        self.assertEqual(messages, ['kept'])
+
+    def test_05_logging_does_not_block(self):
+        """Logging returns immediately even when a handler is slow"""
+        slow = SlowHandler(0.02)
+        self.pipeline.stop()
+        self.pipeline._targets.append(slow)
+        self.pipeline.start()
+        try:
+            logger = logging.getLogger('backend.routes.beehives')
+            start = time.perf_counter()
+            for i in range(20):
+                logger.info('record %d', i)
+            elapsed = time.perf_counter() - start
+            self.assertLess(elapsed, 0.2, f'{elapsed:.3f}s spent logging 20 records')
+            self.pipeline.stop()
+            self.assertEqual(len(slow.records), 20)
+        finally:
+            self.pipeline._targets.remove(slow)
+            self.pipeline.start()
+
+    def test_06_forked_worker_has_listener(self):
+        """Records logged in a forked worker are written by that worker"""
+        context = multiprocessing.get_context('fork')
+        worker = context.Process(target=_log_in_child, args=(self.pipeline,))
+        worker.start()
+        worker.join(10)
+        self.assertEqual(worker.exitcode, 0)
+        with open(os.path.join(self.log_dir, 'error.log')) as f:
+            self.assertIn(f'error from pid {worker.pid}', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Metrics Tests for KBee Manager
+Serves requests from several forked "workers" in multiprocess mode (as under
+gunicorn) and checks that /metrics, scraped from any one process, reports
+the sum of all of them: request latency histograms per endpoint, in-flight
+gauges, DB time, cache hits and render times.
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+from datetime import date
+
+# Multiprocess mode must be chosen before prometheus_client is imported
+METRICS_DIR = tempfile.mkdtemp(prefix='kbee_metrics_')
+os.environ['PROMETHEUS_MULTIPROC_DIR'] = METRICS_DIR
+
+from prometheus_client.parser import text_string_to_metric_families
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from app import create_app
+from backend.config import ProductionConfig
+from backend.models import db, Beehive, User
+from backend.utils.metrics import PLACEHOLDER_METRICS_TOKEN, Metrics
+from backend.routes.beehives import stats_cache
+
+WORKERS = 3
+REQUESTS_PER_WORKER = 5
+
+
+def _serve(app, headers, results):
+    """One forked worker: a few list, stats and QR requests"""
+    client = app.test_client()
+    statuses = []
+    for _ in range(REQUESTS_PER_WORKER):
+        statuses.append(client.get('/api/beehives', headers=headers).status_code)
+        statuses.append(client.get('/api/stats', headers=headers).status_code)
+    statuses.append(client.get('/api/qr/TO001', headers=headers).status_code)
+    results.put(statuses)
+
+
+class MetricsTests(unittest.TestCase):
+    """/metrics across worker processes"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with one beehive, then let forked workers serve requests"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=user.id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        stats_cache.clear()
+
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        workers = [context.Process(target=_serve, args=(cls.app, cls.headers, queue)) for _ in range(WORKERS)]
+        for worker in workers:
+            worker.start()
+        cls.worker_statuses = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema and the metric files"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
+
+    def scrape(self, headers=None):
+        response = self.client.get('/metrics', headers=headers)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        samples = {}
+        for family in text_string_to_metric_families(response.get_data(as_text=True)):
+            for sample in family.samples:
+                key = (sample.name, tuple(sorted(sample.labels.items())))
+                samples[key] = samples.get(key, 0) + sample.value
+        return samples
+
+    def value(self, samples, name, **labels):
+        return samples.get((name, tuple(sorted(labels.items()))), 0)
+
+    def test_01_workers_succeeded(self):
+        """Every forked worker served its requests"""
+        for statuses in self.worker_statuses:
+            self.assertTrue(all(status == 200 for status in statuses), statuses)
+
+    def test_02_request_counts_summed_across_workers(self):
+        """Latency histogram and status counters include every worker's requests"""
+        samples = self.scrape()
+        expected = WORKERS * REQUESTS_PER_WORKER
+        self.assertEqual(self.value(samples, 'kbee_http_request_duration_seconds_count',
+                                    method='GET', endpoint='beehives.get_beehives'), expected)
+        self.assertEqual(self.value(samples, 'kbee_http_requests_total',
+                                    method='GET', endpoint='beehives.get_stats', status='200'), expected)
+        self.assertEqual(self.value(samples, 'kbee_db_request_duration_seconds_count',
+                                    endpoint='beehives.get_beehives'), expected)
+        self.assertGreater(self.value(samples, 'kbee_db_queries_per_request_sum',
+                                      endpoint='beehives.get_beehives'), 0)
+        self.assertGreater(self.value(samples, 'kbee_http_response_size_bytes_count',
+                                      endpoint='beehives.get_beehives'), 0)
+
+    def test_03_in_flight_back_to_zero(self):
+        """No request is reported in flight once all have finished"""
+        samples = self.scrape()
+        in_flight = [value for (name, _), value in samples.items() if name == 'kbee_http_requests_in_flight']
+        self.assertTrue(in_flight)
+        # The scrape itself is the only request in flight
+        self.assertEqual(sum(in_flight), 1)
+
+    def test_04_cache_and_render_metrics(self):
+        """Stats cache hits/misses and QR render times are exported"""
+        samples = self.scrape()
+        hits = self.value(samples, 'kbee_cache_requests_total', cache='stats', result='hit')
+        misses = self.value(samples, 'kbee_cache_requests_total', cache='stats', result='miss')
+        self.assertEqual(hits + misses, WORKERS * REQUESTS_PER_WORKER * 2)
+        self.assertGreater(hits, 0)
+        self.assertEqual(self.value(samples, 'kbee_render_duration_seconds_count', kind='qr'), WORKERS)
+
+    def test_05_metrics_token(self):
+        """METRICS_TOKEN, when set, is required as a bearer token"""
+        self.app.config['METRICS_TOKEN'] = 'scrape-secret'
+        try:
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            self.scrape(headers={'Authorization': 'Bearer scrape-secret'})
+        finally:
+            self.app.config['METRICS_TOKEN'] = ''
+
+    def test_06_production_requires_token(self):
+        """The production config refuses to serve /metrics without METRICS_TOKEN"""
+        app = Flask(__name__)
+        app.config.from_object(ProductionConfig)
+        app.config['METRICS_TOKEN'] = ''
+        with self.assertRaises(ValueError):
+            Metrics().init_app(app)
+        app.config['METRICS_TOKEN'] = PLACEHOLDER_METRICS_TOKEN
+        with self.assertRaises(ValueError):
+            Metrics().init_app(app)
+        app.config['METRICS_TOKEN'] = 'scrape-secret'
+        Metrics().init_app(app)
+        app = Flask(__name__)
+        app.config.from_object(ProductionConfig)
+        app.config.update(METRICS_TOKEN='', METRICS_ENABLED=False)
+        Metrics().init_app(app)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
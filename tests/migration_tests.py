@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Migration Tests for KBee Manager
+Runs the Alembic migrations and ``flask kbee init-db`` against a scratch
+database: the migrated schema must match the models (autogenerate
+compare_metadata finds no drift), downgrade to base and back must work,
+init-db must be idempotent, adopt a database created before migrations
+(keeping and backfilling its rows) and refuse an unversioned current one.
+
+Uses the testing config with a temporary SQLite file, or the scratch
+database in TEST_DATABASE_URL.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from sqlalchemy import inspect, text
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCRATCH_DIR = None
+if not os.getenv('TEST_DATABASE_URL'):
+    SCRATCH_DIR = tempfile.mkdtemp(prefix='kbee-migrations-')
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'kbee.db')}"
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from app import create_app
+from backend.migrations import alembic_config, include_object
+from backend.models import db, Beehive, apply_fulltext_search, folded_match
+
+
+class MigrationTests(unittest.TestCase):
+    """Alembic migrations and flask kbee init-db"""
+
+    @classmethod
+    def setUpClass(cls):
+        """App context on the scratch database"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        cls.config = alembic_config()
+        cls.runner = cls.app.test_cli_runner()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Leave the scratch database empty"""
+        cls.reset_database()
+        db.engine.dispose()
+        cls.ctx.pop()
+        if SCRATCH_DIR:
+            shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    @classmethod
+    def reset_database(cls):
+        """Drop everything the migrations or create_all may have created"""
+        db.session.remove()
+        if 'alembic_version' in inspect(db.engine).get_table_names():
+            command.downgrade(cls.config, 'base')
+            with db.engine.begin() as connection:
+                connection.execute(text('DROP TABLE alembic_version'))
+        db.drop_all()
+
+    def setUp(self):
+        self.reset_database()
+
+    def table_names(self):
+        return set(inspect(db.engine).get_table_names())
+
+    def drift(self):
+        """Differences between the models and the database schema"""
+        with db.engine.connect() as connection:
+            context = MigrationContext.configure(connection, opts={
+                'include_object': include_object,
+                'compare_type': True,
+            })
+            return compare_metadata(context, db.metadata)
+
+    def init_db(self):
+        return self.runner.invoke(args=['kbee', 'init-db'])
+
+    def test_01_single_head(self):
+        """Migrations form one linear history"""
+        heads = ScriptDirectory.from_config(self.config).get_heads()
+        self.assertEqual(len(heads), 1, heads)
+
+    def test_02_no_drift(self):
+        """The migrated schema matches the models"""
+        command.upgrade(self.config, 'head')
+        self.assertEqual(self.drift(), [])
+
+    def test_03_downgrade_round_trip(self):
+        """Every migration downgrades to an empty schema and upgrades again"""
+        command.upgrade(self.config, 'head')
+        command.downgrade(self.config, 'base')
+        self.assertEqual(self.table_names(), {'alembic_version'})
+        command.upgrade(self.config, 'head')
+        self.assertEqual(self.drift(), [])
+
+    def test_04_init_db_fresh_and_idempotent(self):
+        """init-db creates the schema, and running it again changes nothing"""
+        result = self.init_db()
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Database is ready for initial setup', result.output)
+        self.assertTrue({'user', 'beehive', 'beehive_search_token', 'alembic_version'} <= self.table_names())
+
+        result = self.init_db()
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.drift(), [])
+
+    def test_05_init_db_adopts_pre_migration_database(self):
+        """A database created before migrations is stamped, upgraded and backfilled"""
+        command.upgrade(self.config, '0001_baseline')
+        with db.engine.begin() as connection:
+            connection.execute(text('DROP TABLE alembic_version'))
+            connection.execute(text(
+                "INSERT INTO user (id, username, email, password_hash, created_at) "
+                "VALUES (1, 'owner', 'owner@kbee.test', 'x', '2025-01-01 00:00:00')"
+            ))
+            for number, notes in ((1, 'Đàn yếu cần chia'), (12, 'Ong chúa mới')):
+                connection.execute(text(
+                    "INSERT INTO beehive (serial_number, qr_token, import_date, health_status, species, notes, "
+                    "is_sold, user_id, created_at, updated_at) VALUES (:serial_number, :qr_token, '2025-01-01', "
+                    "'Tốt', 'Furva Vàng', :notes, 0, 1, '2025-01-01 00:00:00', '2025-01-01 00:00:00')"
+                ), {'serial_number': f'TO{number:03d}', 'qr_token': f'qr{number:010d}', 'notes': notes})
+
+        result = self.init_db()
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('marked as 0001_baseline', result.output)
+        self.assertIn('initialized with 1 users', result.output)
+        self.assertEqual(self.drift(), [])
+
+        self.assertEqual(db.session.get(Beehive, 'TO012').serial_seq, 12)
+        query = Beehive.query.filter_by(user_id=1)
+        self.assertEqual([b.serial_number for b in apply_fulltext_search(query, 'chia')], ['TO001'])
+        self.assertEqual([b.serial_number for b in query.filter(folded_match(1, 'notes', 'chua'))], ['TO012'])
+        self.assertEqual([b.serial_number for b in query.filter(folded_match(1, 'serial_number', '12'))], ['TO012'])
+
+    def test_06_init_db_refuses_unversioned_current_schema(self):
+        """Tables from create_all without migration history need an explicit stamp"""
+        db.create_all()
+        result = self.init_db()
+        self.assertEqual(result.exit_code, 1, result.output)
+        self.assertIn('flask kbee db stamp', result.output)
+        self.assertNotIn('alembic_version', self.table_names())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
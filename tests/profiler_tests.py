@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Profiler Tests for KBee Manager
+Profiles requests in-process with the profiling token and by sampling, then
+lists and downloads the stored profiles through the metrics API.
+
+Uses the testing config (SQLite in memory) and a temporary PROFILE_DIR.
+"""
+
+import os
+import sys
+import shutil
+import pstats
+import tempfile
+import unittest
+from datetime import date
+
+PROFILE_TOKEN = 'profile-secret'
+PROFILE_DIR = tempfile.mkdtemp(prefix='kbee_profiles_')
+
+# Configuration is read from the environment at import
+os.environ.update(PROFILE_TOKEN=PROFILE_TOKEN, PROFILE_DIR=PROFILE_DIR, PROFILE_MAX_FILES='3')
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils.profiler import profiler
+
+
+class ProfilerTests(unittest.TestCase):
+    """Profiling hook and profile download endpoints"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with one beehive"""
+        cls.profile_dir = PROFILE_DIR
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=user.id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+        cls.profile_headers = dict(cls.headers, **{'X-Profile-Token': PROFILE_TOKEN})
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema and the profiles"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+        shutil.rmtree(cls.profile_dir, ignore_errors=True)
+
+    def test_01_token_request_is_profiled(self):
+        """A request with the token is saved as a loadable .pstats file"""
+        response = self.client.get('/api/beehives', headers=self.profile_headers)
+        self.assertEqual(response.status_code, 200)
+        name = response.headers.get('X-Profile-File')
+        self.assertTrue(name and name.endswith('.pstats'), name)
+        self.assertIn('beehives.get_beehives', name)
+        stats = pstats.Stats(os.path.join(self.profile_dir, name))
+        self.assertTrue(any('get_beehives' in func[2] for func in stats.stats))
+
+    def test_02_plain_request_not_profiled(self):
+        """Without the token (and no sampling) nothing is profiled"""
+        response = self.client.get('/api/beehives', headers=self.headers)
+        self.assertNotIn('X-Profile-File', response.headers)
+        response = self.client.get('/api/beehives', headers=dict(self.headers, **{'X-Profile-Token': 'wrong'}))
+        self.assertNotIn('X-Profile-File', response.headers)
+
+    def test_03_stack_sampler(self):
+        """The sampling profiler writes collapsed stacks"""
+        headers = dict(self.profile_headers, **{'X-Profile-Mode': 'sample'})
+        response = self.client.get('/api/export_pdf/TO001', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        name = response.headers['X-Profile-File']
+        self.assertTrue(name.endswith('.collapsed'), name)
+        with open(os.path.join(self.profile_dir, name)) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+
+    def test_04_sample_rate(self):
+        """PROFILE_SAMPLE_RATE profiles requests of the listed endpoints only"""
+        profiler.sample_rate, profiler.endpoints = 1.0, {'beehives.get_stats'}
+        try:
+            sampled = self.client.get('/api/stats', headers=self.headers)
+            skipped = self.client.get('/api/beehives', headers=self.headers)
+        finally:
+            profiler.sample_rate, profiler.endpoints = 0.0, set()
+        self.assertIn('X-Profile-File', sampled.headers)
+        self.assertNotIn('X-Profile-File', skipped.headers)
+
+    def test_05_directory_is_bounded(self):
+        """Only the newest PROFILE_MAX_FILES profiles are kept"""
+        names = [self.client.get('/api/stats', headers=self.profile_headers).headers['X-Profile-File']
+                 for _ in range(5)]
+        stored = sorted(os.listdir(self.profile_dir))
+        self.assertEqual(len(stored), 3)
+        self.assertEqual(stored, sorted(names[-3:]))
+
+    def test_06_list_and_download(self):
+        """Profiles are listed and downloadable with the token, refused without"""
+        name = self.client.get('/api/stats', headers=self.profile_headers).headers['X-Profile-File']
+
+        self.assertEqual(self.client.get('/api/metrics/profiles', headers=self.headers).status_code, 403)
+        response = self.client.get('/api/metrics/profiles', headers=self.profile_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['profiles'][0]['name'], name)
+
+        response = self.client.get(f'/api/metrics/profiles/{name}', headers=self.profile_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(response.data), 0)
+        self.assertEqual(self.client.get('/api/metrics/profiles/..%2Fapp.py', headers=self.profile_headers).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
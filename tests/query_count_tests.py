@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Query Count Tests for KBee Manager
+Runs the API endpoints in-process and checks that none issues more SQL
+statements than its budget, so N+1 queries and extra round-trips are caught
+before they reach production. Also checks the Server-Timing header and the
+slow query log.
+
+Uses the testing config: SQLite in memory by default, or MySQL when
+TEST_DATABASE_URL points at a scratch database.
+
+Other test scripts can reuse the helper:
+
+    class MyTests(QueryCountMixin, unittest.TestCase):
+        def test_list(self):
+            with self.assertMaxQueries(3):
+                self.client.get('/api/beehives', headers=self.headers)
+"""
+
+import os
+import re
+import sys
+import unittest
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.routes.beehives import stats_cache, suggest_cache
+from backend.utils.query_stats import query_stats
+
+
+class QueryCountMixin:
+    """assertMaxQueries() for unittest test cases running inside an app context"""
+
+    @contextmanager
+    def assertMaxQueries(self, max_queries, label=''):
+        """Fail if the block issues more than max_queries statements on any engine"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(' '.join(statement.split()))
+
+        engines = list(db.engines.values())
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            for engine in engines:
+                event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        self.assertLessEqual(
+            len(statements), max_queries,
+            f'{label} issued {len(statements)} queries (budget {max_queries}):\n' + '\n'.join(statements)
+        )
+
+
+class QueryCountTests(QueryCountMixin, unittest.TestCase):
+    """Per-endpoint query budgets"""
+
+    # (method, url, json body, budget); each request starts with cold
+    # aggregate caches, so the budgets are worst cases
+    BUDGETS = [
+        ('GET', '/api/beehives', None, 3),  # page, count, health breakdown
+        ('GET', '/api/beehives?health_status=Yếu&import_from=2025-01-01&sort_field=import_date', None, 3),
+        ('GET', '/api/beehives?q=chia', None, 3),
+        ('GET', '/api/sold-beehives', None, 2),
+        ('GET', '/api/stats', None, 1),
+        ('GET', '/api/dashboard', None, 2),
+        ('GET', '/api/beehives/suggest?prefix=TO0', None, 1),  # one serial_seq range
+        ('GET', '/api/beehives/TO002', None, 1),
+        ('GET', '/api/beehive/qr0000000002', None, 2),  # beehive, owner
+        ('GET', '/beehive/qr0000000002', None, 1),
+        ('POST', '/api/beehives', {'import_date': '2025-06-01', 'health_status': 'Tốt'}, 5),
+        ('PUT', '/api/beehives/TO002', {'notes': 'đã kiểm tra'}, 5),
+        ('POST', '/api/beehives/TO002/sell', None, 3),
+        ('POST', '/api/beehives/TO002/unsell', None, 3),
+        ('DELETE', '/api/beehives/TO006', None, 3),
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the schema and a few dozen beehives"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+
+        start = date(2025, 1, 1)
+        for i in range(60):
+            sold = i % 3 == 0
+            db.session.add(Beehive(
+                serial_number=f'TO{i + 1:03d}',
+                qr_token=f'qr{i + 1:010d}',
+                import_date=start + timedelta(days=i),
+                health_status='Tốt' if i % 4 else 'Yếu',
+                species='Furva Vàng',
+                notes='chia đàn' if i % 2 else 'cho ăn',
+                is_sold=sold,
+                sold_date=start + timedelta(days=i) if sold else None,
+                user_id=user.id,
+            ))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def clear_caches(self):
+        """Measure cold requests, not cached aggregates"""
+        stats_cache.clear()
+        suggest_cache.clear()
+
+    def test_01_endpoint_budgets(self):
+        """No endpoint issues more queries than its budget"""
+        for method, url, body, budget in self.BUDGETS:
+            with self.subTest(method=method, url=url):
+                self.clear_caches()
+                with self.assertMaxQueries(budget, f'{method} {url}'):
+                    response = self.client.open(url, method=method, json=body, headers=self.headers)
+                self.assertLess(response.status_code, 400, response.get_data(as_text=True))
+
+    def test_02_server_timing_header(self):
+        """Server-Timing reports the request's query count and DB time"""
+        with self.assertMaxQueries(10) as statements:
+            response = self.client.get('/api/beehives', headers=self.headers)
+        header = response.headers.get('Server-Timing', '')
+        match = re.search(r'db;dur=([\d.]+);desc="(\d+) queries"', header)
+        self.assertIsNotNone(match, header)
+        self.assertEqual(int(match.group(2)), len(statements))
+        self.assertIn('app;dur=', header)
+
+    def test_03_slow_query_log(self):
+        """Statements over SLOW_QUERY_MS are logged with their route"""
+        threshold = query_stats.slow_query_seconds
+        query_stats.slow_query_seconds = 0
+        try:
+            with self.assertLogs('backend.utils.query_stats', level='WARNING') as logs:
+                self.client.get('/api/beehives/TO002', headers=self.headers)
+        finally:
+            query_stats.slow_query_seconds = threshold
+        self.assertTrue(any('GET /api/beehives/<serial_number>' in line and 'SELECT' in line for line in logs.output),
+                        logs.output)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
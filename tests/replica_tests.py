@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Replica Routing Tests for KBee Manager
+Runs the app with a read replica that lags the primary (a copy of the
+primary's SQLite file taken before the last write): @read_only requests
+read from it without probing it first, a user's own writes keep their
+reads on the primary, replica reads are neither cached nor given an ETag,
+and an unreachable replica falls back to the primary and is skipped for
+DB_REPLICA_RETRY_SECONDS. Also checks that a rolled back savepoint keeps
+the writes flushed before it pending for the read-your-writes marker.
+
+Uses the testing config with temporary SQLite files for the primary and
+the replica.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix='kbee-replicas-')
+PRIMARY_PATH = os.path.join(SCRATCH_DIR, 'primary.db')
+REPLICA_PATH = os.path.join(SCRATCH_DIR, 'replica.db')
+os.environ['TEST_DATABASE_URL'] = f'sqlite:///{PRIMARY_PATH}'
+
+from app import create_app
+from backend.config import TestingConfig, config
+from backend.models import db, Beehive, User
+from backend.routes.beehives import stats_cache, suggest_cache
+from backend.utils.db_routing import REPLICA_BIND_PREFIX, replica_router
+from backend.utils.invalidation import PENDING_SCOPES_KEY, user_scope
+
+
+class ReplicaTestingConfig(TestingConfig):
+    DATABASE_REPLICA_URLS = [f'sqlite:///{REPLICA_PATH}']
+    DB_REPLICA_STICKY_SECONDS = 0  # the login must not pin the reads to the primary
+    DB_REPLICA_RETRY_SECONDS = 60
+
+
+class UnreachableReplicaConfig(ReplicaTestingConfig):
+    DATABASE_REPLICA_URLS = [f"sqlite:///{os.path.join(SCRATCH_DIR, 'missing', 'replica.db')}"]
+
+
+config['replica_testing'] = ReplicaTestingConfig
+config['unreachable_replica'] = UnreachableReplicaConfig
+
+
+def add_beehive(number, user_id):
+    """Insert a beehive straight into the primary, as another worker would"""
+    db.session.add(Beehive(serial_number=f'TO{number:03d}', qr_token=f'qr{number:010d}',
+                           import_date=date(2025, 1, 1), health_status='Tốt', user_id=user_id))
+
+
+class ReplicaTestCase(unittest.TestCase):
+    """App on a primary with three beehives, logged in as their owner"""
+
+    config_name = 'replica_testing'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app(cls.config_name)
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)  # the primary only: the replica is a copy, or unreachable
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for number in (1, 2, 3):
+            add_beehive(number, user.id)
+        db.session.commit()
+        cls.user_id = user.id
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all(bind_key=None)
+        for engine in db.engines.values():
+            engine.dispose()
+        cls.ctx.pop()
+
+    def get(self, path, status=200):
+        response = self.client.get(path, headers=self.headers)
+        self.assertEqual(response.status_code, status, response.get_json())
+        return response
+
+
+class ReplicaRoutingTests(ReplicaTestCase):
+    """Reads from a lagging replica"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Copy the primary to the replica, then write a fourth beehive to the primary only"""
+        super().setUpClass()
+        db.session.remove()
+        db.engine.dispose()
+        shutil.copyfile(PRIMARY_PATH, REPLICA_PATH)
+        add_beehive(4, cls.user_id)
+        db.session.commit()
+        cls.replica = db.engines[f'{REPLICA_BIND_PREFIX}0']
+
+    def setUp(self):
+        replica_router.sticky.window = 0
+        stats_cache.clear()
+        suggest_cache.clear()
+
+    def total(self, path='/api/beehives'):
+        return self.get(path).get_json()['pagination']['total']
+
+    def test_01_reads_from_replica_without_probe(self):
+        """@read_only requests use the replica's data and one replica connection each"""
+        checkouts = []
+        listener = lambda *args: checkouts.append(1)
+        event.listen(self.replica, 'checkout', listener)
+        try:
+            for _ in range(3):
+                self.assertEqual(self.total(), 3)
+                db.session.remove()  # as the request teardown does outside the test's app context
+        finally:
+            event.remove(self.replica, 'checkout', listener)
+        self.assertEqual(len(checkouts), 3)
+
+    def test_02_replica_reads_not_cached(self):
+        """Replica responses carry no ETag and leave the versioned caches empty"""
+        for path in ('/api/beehives', '/api/dashboard', '/api/beehives/TO001'):
+            with self.subTest(path=path):
+                response = self.get(path)
+                self.assertIsNone(response.headers.get('ETag'))
+        self.assertEqual(self.get('/api/beehives/suggest?prefix=TO').get_json()['suggestions'],
+                         ['TO001', 'TO002', 'TO003'])
+        self.get('/api/stats')
+        self.assertEqual(len(stats_cache._data), 0)
+        self.assertEqual(len(suggest_cache._data), 0)
+
+    def test_03_sticky_after_write(self):
+        """After the user's own write, reads go to the primary and may be cached again"""
+        replica_router.sticky.window = 5
+        response = self.client.post('/api/beehives/TO002/sell', headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        self.assertEqual(self.total('/api/sold-beehives'), 1)
+        response = self.get('/api/dashboard')
+        self.assertIsNotNone(response.headers.get('ETag'))
+        self.assertEqual(response.get_json()['stats']['active'], 3)
+        self.assertEqual(len(stats_cache._data), 2)  # breakdown and dashboard page
+
+    def test_04_savepoint_rollback_keeps_pending_writes(self):
+        """Rolling back a savepoint keeps the scopes flushed before it pending until commit"""
+        replica_router.sticky.window = 5
+        replica_router.sticky._local.clear()
+        scope = user_scope(self.user_id)
+        beehive = db.session.get(Beehive, 'TO003')
+        beehive.notes = 'kiểm tra'
+        db.session.flush()
+        savepoint = db.session.begin_nested()
+        beehive.notes = 'chia đàn'
+        db.session.flush()
+        savepoint.rollback()
+        self.assertIn(scope, db.session.info.get(PENDING_SCOPES_KEY, set()))
+        db.session.commit()
+        self.assertNotIn(PENDING_SCOPES_KEY, db.session.info)
+        self.assertIn(scope, replica_router.sticky._local)
+
+
+class ReplicaFallbackTests(ReplicaTestCase):
+    """An unreachable replica"""
+
+    config_name = 'unreachable_replica'
+
+    def test_01_falls_back_and_skips(self):
+        """The first read falls back to the primary; later ones skip the replica without connecting"""
+        attempts = []
+        replica = db.engines[f'{REPLICA_BIND_PREFIX}0']
+        listener = lambda *args: attempts.append(1)
+        event.listen(replica, 'do_connect', listener)
+        try:
+            self.assertEqual(self.get('/api/beehives').get_json()['pagination']['total'], 3)
+            self.assertEqual(len(attempts), 1)
+            self.assertEqual(self.get('/api/beehives').get_json()['pagination']['total'], 3)
+            self.assertEqual(len(attempts), 1)
+        finally:
+            event.remove(replica, 'do_connect', listener)
+        self.assertIn(f'{REPLICA_BIND_PREFIX}0', replica_router._down_until)
+
+    def test_02_primary_reads_cached(self):
+        """With the replica down, reads come from the primary and get an ETag"""
+        response = self.get('/api/dashboard')
+        self.assertIsNotNone(response.headers.get('ETag'))
+
+
+if __name__ == '__main__':
+    try:
+        unittest.main(verbosity=2)
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Representation Benchmark for KBee Manager
+Compares encode time and size of JSON, columnar JSON and MessagePack list payloads
+"""
+
+import os
+import sys
+import gzip
+import timeit
+import argparse
+
+from flask import Flask
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.models import Beehive
+from backend.utils.json_provider import get_json_provider_class
+from backend.utils.representations import to_columnar, encode_msgpack, msgpack
+from serialization_benchmark import build_beehives
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list-endpoint representations')
+    parser.add_argument('--rows', type=int, default=500, help='Beehives per response (default: 500)')
+    parser.add_argument('--repeat', type=int, default=50, help='Encodes per measurement (default: 50)')
+    args = parser.parse_args()
+
+    provider = get_json_provider_class()(Flask(__name__))
+    rows = [beehive.to_dict() for beehive in build_beehives(args.rows)]
+
+    def payload(beehives):
+        return {'beehives': beehives, 'pagination': {'page': 1, 'per_page': args.rows, 'total': args.rows}}
+
+    cases = [
+        ('json objects', lambda: provider.dumps(payload(rows)).encode('utf-8')),
+        ('json columnar', lambda: provider.dumps(payload(to_columnar(rows, Beehive.API_FIELDS))).encode('utf-8')),
+    ]
+    if msgpack is not None:
+        cases += [
+            ('msgpack objects', lambda: encode_msgpack(payload(rows))),
+            ('msgpack columnar', lambda: encode_msgpack(payload(to_columnar(rows, Beehive.API_FIELDS)))),
+        ]
+    else:
+        print('⚠️  msgpack not installed, skipping MessagePack cases')
+
+    print(f'📊 Encoding {args.rows} beehives with {provider.__class__.__name__}')
+    print(f'{"representation":<18} {"µs/response":>12} {"bytes":>8} {"gzip bytes":>11}')
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5)) / args.repeat
+        body = func()
+        print(f'{name:<18} {best * 1e6:12.1f} {len(body):8d} {len(gzip.compress(body)):11d}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Representation Tests for KBee Manager
+Checks content negotiation on the list endpoints: MessagePack for
+``Accept: application/msgpack``, JSON otherwise, and the columnar layout of
+``?format=columnar`` (dictionary-encoded low-cardinality fields), all
+decoding to the same rows as the default JSON objects.
+
+Uses the testing config (SQLite in memory). The MessagePack checks are
+skipped when msgpack is not installed.
+"""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils.representations import MSGPACK_MIMETYPE, msgpack
+
+
+def from_columnar(document):
+    """Rebuild row objects from a columnar document"""
+    columns = dict(document['columns'])
+    for field, values in document['dictionaries'].items():
+        columns[field] = [values[code] for code in columns[field]]
+    return [{field: columns[field][i] for field in document['fields']} for i in range(document['count'])]
+
+
+class RepresentationTests(unittest.TestCase):
+    """msgpack and columnar list representations"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with beehives of both health states and species"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for i in range(8):
+            db.session.add(Beehive(serial_number=f'TO{i + 1:03d}', qr_token=f'qr{i + 1:010d}',
+                                   import_date=date(2025, 1, 1 + i), health_status='Yếu' if i % 3 == 0 else 'Tốt',
+                                   species='Furva Đen' if i % 2 else 'Furva Vàng', notes=f'Tổ số {i}',
+                                   user_id=user.id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def get(self, url, accept=None, status=200):
+        headers = dict(self.headers, Accept=accept) if accept else self.headers
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status, response.data[:200])
+        return response
+
+    @unittest.skipUnless(msgpack, 'msgpack not installed')
+    def test_01_msgpack(self):
+        """Accept: application/msgpack returns the same document, binary encoded"""
+        json_body = self.get('/api/beehives').get_json()
+        response = self.get('/api/beehives', accept=MSGPACK_MIMETYPE)
+        self.assertEqual(response.mimetype, MSGPACK_MIMETYPE)
+        self.assertIn('Accept', response.vary)
+        self.assertEqual(msgpack.unpackb(response.data, raw=False), json_body)
+
+    @unittest.skipUnless(msgpack, 'msgpack not installed')
+    def test_02_json_preferred(self):
+        """JSON wins unless MessagePack is preferred"""
+        for accept in ('*/*', 'application/json', f'application/json, {MSGPACK_MIMETYPE}',
+                       f'{MSGPACK_MIMETYPE};q=0.5, application/json'):
+            with self.subTest(accept=accept):
+                self.assertEqual(self.get('/api/beehives', accept=accept).mimetype, 'application/json')
+
+    @unittest.skipUnless(msgpack, 'msgpack not installed')
+    def test_03_etag_per_representation(self):
+        """A JSON ETag does not revalidate the MessagePack representation"""
+        etag = self.get('/api/beehives').headers['ETag']
+        headers = dict(self.headers, **{'Accept': MSGPACK_MIMETYPE, 'If-None-Match': etag})
+        self.assertEqual(self.client.get('/api/beehives', headers=headers).status_code, 200)
+
+    def test_04_columnar(self):
+        """format=columnar decodes to the same rows as the object layout"""
+        for url in ('/api/beehives', '/api/sold-beehives'):
+            with self.subTest(url=url):
+                objects = self.get(f'{url}?per_page=50').get_json()
+                columnar = self.get(f'{url}?per_page=50&format=columnar').get_json()
+                self.assertEqual(columnar['pagination'], objects['pagination'])
+                self.assertEqual(from_columnar(columnar['beehives']), objects['beehives'])
+
+    def test_05_dictionary_encoding(self):
+        """Health status and species are sent as value lists plus integer codes"""
+        document = self.get('/api/beehives?format=columnar').get_json()['beehives']
+        self.assertEqual(document['count'], 8)
+        self.assertEqual(sorted(document['dictionaries']), ['health_status', 'species'])
+        self.assertEqual(sorted(document['dictionaries']['health_status']), ['Tốt', 'Yếu'])
+        self.assertTrue(all(isinstance(code, int) for code in document['columns']['species']))
+
+    def test_06_columnar_with_fields(self):
+        """Columnar layout follows the requested fieldset"""
+        document = self.get('/api/beehives?format=columnar&fields=species').get_json()['beehives']
+        self.assertEqual(document['fields'], ['serial_number', 'species'])
+        self.assertEqual(sorted(document['columns']), ['serial_number', 'species'])
+
+    def test_07_invalid_format(self):
+        """Unknown formats are rejected with 400"""
+        body = self.get('/api/beehives?format=csv', status=400).get_json()
+        self.assertEqual(body['field'], 'format')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Request Log Tests for KBee Manager
+Checks X-Request-ID handling (accepted, generated, returned), request_id on
+log records and error responses, and the per-request access line.
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import sys
+import json
+import logging
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.utils.log_config import JsonFormatter
+
+
+class CaptureHandler(logging.Handler):
+    """Keeps the records of the backend.* loggers"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class RequestLogTests(unittest.TestCase):
+    """Request IDs and access log"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with one beehive and a route that fails"""
+        cls.app = create_app('testing')
+
+        @cls.app.route('/_test/boom')
+        def boom():
+            raise RuntimeError('boom')
+
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=user.id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+        cls.capture = CaptureHandler()
+        cls.backend_logger = logging.getLogger('backend')
+        cls.saved_level = cls.backend_logger.level
+        cls.backend_logger.setLevel(logging.INFO)
+        cls.backend_logger.addHandler(cls.capture)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema and the capture handler"""
+        cls.backend_logger.removeHandler(cls.capture)
+        cls.backend_logger.setLevel(cls.saved_level)
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def setUp(self):
+        self.capture.records.clear()
+
+    def access_records(self):
+        return [record for record in self.capture.records if record.name == 'backend.access']
+
+    def test_01_generated_id(self):
+        """A request without X-Request-ID gets a new one"""
+        first = self.client.get('/api/beehives', headers=self.headers).headers.get('X-Request-ID')
+        second = self.client.get('/api/beehives', headers=self.headers).headers.get('X-Request-ID')
+        self.assertRegex(first or '', r'^[0-9a-f]{32}$')
+        self.assertNotEqual(first, second)
+
+    def test_02_supplied_id(self):
+        """A sane incoming X-Request-ID is kept, anything else replaced"""
+        response = self.client.get('/api/beehives', headers=dict(self.headers, **{'X-Request-ID': 'nginx-abc.123'}))
+        self.assertEqual(response.headers['X-Request-ID'], 'nginx-abc.123')
+        for bad in ('has spaces', 'x' * 200, 'quote"d'):
+            response = self.client.get('/api/beehives', headers=dict(self.headers, **{'X-Request-ID': bad}))
+            self.assertRegex(response.headers['X-Request-ID'], r'^[0-9a-f]{32}$')
+
+    def test_03_log_records_carry_id(self):
+        """Records logged while handling a request carry its ID, also in JSON"""
+        response = self.client.post('/api/auth/login', json={'username': 'owner', 'password': 'wrong'},
+                                    headers={'X-Request-ID': 'req-login-1'})
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(self.capture.records)
+        for record in self.capture.records:
+            self.assertEqual(getattr(record, 'request_id', None), 'req-login-1', record.getMessage())
+        entry = json.loads(JsonFormatter().format(self.capture.records[0]))
+        self.assertEqual(entry['request_id'], 'req-login-1')
+
+        # Outside a request there is no ID
+        self.assertFalse(hasattr(logging.getLogger('backend').makeRecord('backend', logging.INFO, '', 0, '', (), None),
+                                 'request_id'))
+
+    def test_04_error_responses_carry_id(self):
+        """Error handlers return the request ID in the body"""
+        response = self.client.get('/api/beehives/NOPE', headers=dict(self.headers, **{'X-Request-ID': 'req-404'}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json()['request_id'], 'req-404')
+
+        response = self.client.get('/_test/boom', headers={'X-Request-ID': 'req-500'})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json()['request_id'], 'req-500')
+        self.assertEqual(response.headers['X-Request-ID'], 'req-500')
+        access = self.access_records()
+        self.assertEqual(access[-1].levelno, logging.WARNING)
+        self.assertEqual(access[-1].status, 500)
+
+    def test_05_access_line(self):
+        """One access line per request with route, timings, query count and size"""
+        response = self.client.get('/api/beehives/TO001', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        access = self.access_records()
+        self.assertEqual(len(access), 1)
+        record = access[0]
+        self.assertEqual(record.levelno, logging.INFO)
+        self.assertEqual(record.request_id, response.headers['X-Request-ID'])
+        self.assertEqual(record.route, '/api/beehives/<serial_number>')
+        self.assertEqual(record.path, '/api/beehives/TO001')
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.queries, 0)
+        self.assertGreaterEqual(record.duration_ms, record.db_ms)
+        self.assertEqual(record.response_bytes, len(response.data))
+        self.assertRegex(record.getMessage(),
+                         r'^GET /api/beehives/<serial_number> 200 [\d.]+ms db=[\d.]+ms/\d+q \d+B$')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Search Tests for KBee Manager
+Checks the full-text ``q=`` filter: results follow writes, survive a
+renumbering of beehive's implicit rowids, and the SQLite plans run the FTS5
+MATCH once per query (never once per beehive row), for the page query and
+for the pagination count alike. Also checks the accent-folded serialNumber
+and notes filters, including numbers typed without leading zeros.
+
+Uses the testing config (SQLite in memory). The plan checks only apply to
+SQLite.
+"""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+from backend.models.search import FTS_TABLE_NAME
+
+BEEHIVES = 120
+WORDS = ['chia đàn', 'ong chúa mới', 'kiểm tra mật', 'đàn yếu cần chia']
+
+
+class SearchTests(unittest.TestCase):
+    """Full-text search over notes"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a user with a hundred-odd beehives with notes"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+        cls.dialect = db.engine.dialect.name
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        for i in range(BEEHIVES):
+            db.session.add(Beehive(serial_number=f'TO{i + 1:03d}', qr_token=f'qr{i + 1:010d}',
+                                   import_date=date(2025, 1, 1 + i % 28), health_status='Tốt',
+                                   notes=WORDS[i % len(WORDS)], user_id=user.id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def search(self, q, **params):
+        query = '&'.join(f'{key}={value}' for key, value in dict(q=q, per_page=100, **params).items())
+        response = self.client.get(f'/api/beehives?{query}', headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json()
+
+    def serials(self, q, **params):
+        return {beehive['serial_number'] for beehive in self.search(q, **params)['beehives']}
+
+    def expected(self, word):
+        return {f'TO{i + 1:03d}' for i in range(BEEHIVES) if word in WORDS[i % len(WORDS)].split()}
+
+    def capture(self, url):
+        """Request url and return the (statement, parameters) of its full-text queries"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if FTS_TABLE_NAME in statement:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(url, headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(response.status_code, 200)
+        return statements
+
+    def test_01_matches(self):
+        """Every word must match, the last one as a prefix, diacritics ignored"""
+        self.assertEqual(self.serials('chia'), self.expected('chia'))
+        self.assertEqual(self.serials('chu'), self.expected('chúa'))
+        self.assertEqual(self.serials('đan'), self.expected('đàn'))
+        self.assertEqual(self.serials('yeu chia'), self.expected('yếu'))
+        self.assertEqual(self.search('chia')['pagination']['total'], len(self.expected('chia')))
+
+    def test_02_ranked_and_sorted_agree(self):
+        """Relevance order and an explicit sort return the same set"""
+        ranked = self.search('chia')['beehives']
+        sorted_ = self.search('chia', sort_field='serial_number', sort_order='asc')['beehives']
+        self.assertEqual({b['serial_number'] for b in ranked}, {b['serial_number'] for b in sorted_})
+        self.assertEqual([b['serial_number'] for b in sorted_], sorted(b['serial_number'] for b in sorted_))
+
+    def test_03_match_runs_once(self):
+        """The FTS5 scan is the outer loop or an uncorrelated list, never a per-row lookup"""
+        if self.dialect != 'sqlite':
+            self.skipTest('SQLite plans only')
+        for url in ('/api/beehives?q=chia', '/api/beehives?q=chia&page=2&per_page=10',
+                    '/api/beehives?q=chia&sort_field=import_date', '/api/sold-beehives?q=chia'):
+            statements = self.capture(url)
+            self.assertTrue(statements, url)
+            for statement, parameters in statements:
+                with self.subTest(url=url, statement=statement[:60]):
+                    with db.engine.connect() as connection:
+                        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+                    plan = {row[0]: (row[1], row[-1]) for row in rows}
+                    scans = [(node, parent, detail) for node, (parent, detail) in plan.items() if FTS_TABLE_NAME in detail]
+                    self.assertEqual(len(scans), 1, rows)
+                    node, parent, detail = scans[0]
+                    # '=' in the FTS5 index string is a rowid lookup, i.e. one MATCH per outer row
+                    self.assertNotIn('=', detail.split('INDEX')[-1], rows)
+                    if parent:
+                        self.assertTrue(plan[parent][1].startswith(('LIST SUBQUERY', 'MATERIALIZE')), rows)
+                    else:
+                        first_loop = min(n for n, (p, d) in plan.items() if p == 0 and d.startswith(('SCAN', 'SEARCH')))
+                        self.assertEqual(node, first_loop, rows)
+
+    def filtered(self, **params):
+        query = '&'.join(f'{key}={value}' for key, value in dict(per_page=100, **params).items())
+        response = self.client.get(f'/api/beehives?{query}', headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return {beehive['serial_number'] for beehive in response.get_json()['beehives']}
+
+    def test_04_serial_number_filter(self):
+        """Serial numbers match by prefix of the whole value or of the number, with or without zeros"""
+        self.assertEqual(self.filtered(serialNumber='TO012'), {'TO012'})
+        self.assertEqual(self.filtered(serialNumber='to01'), {f'TO{i:03d}' for i in range(10, 20)})
+        self.assertEqual(self.filtered(serialNumber='012'), {'TO012'})
+        self.assertEqual(self.filtered(serialNumber='12'), {'TO012', 'TO120'})
+        self.assertEqual(self.filtered(serialNumber='1'),
+                         {'TO001', 'TO100', *(f'TO{i:03d}' for i in range(10, 20)),
+                          *(f'TO{i:03d}' for i in range(101, 121))})
+        self.assertEqual(self.filtered(serialNumber='TO9'), set())
+
+    def test_05_notes_filter(self):
+        """Notes words match by prefix, ignoring case and diacritics; filters are OR-ed"""
+        self.assertEqual(self.filtered(notes='YEU'), self.expected('yếu'))
+        self.assertEqual(self.filtered(notes='chu moi'), self.expected('mới'))
+        self.assertEqual(self.filtered(notes='kiem'), self.expected('kiểm'))
+        self.assertEqual(self.filtered(notes='yeu', serialNumber='TO001'), self.expected('yếu') | {'TO001'})
+
+    def test_06_follows_writes(self):
+        """Notes updates and deletions are reflected by both indexes"""
+        beehive = db.session.get(Beehive, 'TO001')
+        beehive.notes = 'sáp ong vàng'
+        db.session.commit()
+        self.assertEqual(self.serials('sap'), {'TO001'})
+        self.assertNotIn('TO001', self.serials('chia'))
+        self.assertEqual(self.filtered(notes='vang'), {'TO001'})
+
+        db.session.delete(beehive)
+        db.session.commit()
+        self.assertEqual(self.serials('sap'), set())
+        self.assertEqual(self.filtered(serialNumber='1', notes='vang'), self.filtered(serialNumber='1') - {'TO001'})
+
+    def test_07_survives_rowid_renumbering(self):
+        """The index is keyed on search_id, not on beehive's implicit rowid (VACUUM may renumber it)"""
+        if self.dialect != 'sqlite':
+            self.skipTest('SQLite only')
+        before = self.serials('mật')
+        db.session.execute(db.text('UPDATE beehive SET rowid = rowid + 100000'))
+        db.session.commit()
+        self.assertEqual(self.serials('mật'), before)
+
+        db.session.add(Beehive(serial_number='TO999', qr_token='qr9999999999', import_date=date(2025, 2, 1),
+                               health_status='Tốt', notes='mật mới', user_id=1))
+        db.session.commit()
+        self.assertEqual(self.serials('mật'), before | {'TO999'})
+        db.session.execute(db.text(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('integrity-check')"))
+        db.session.commit()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
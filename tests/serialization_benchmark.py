@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Serialization Microbenchmark for KBee Manager
+Compares list-endpoint JSON encoding before and after the JSON provider change
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.models import Beehive
+from backend.utils.json_provider import KBeeJSONProvider, ORJSONProvider, orjson
+
+
+def build_beehives(count):
+    """Build transient beehives shaped like production rows"""
+    beehives = []
+    for i in range(count):
+        beehives.append(Beehive(
+            serial_number=f'TO{i + 1:03d}',
+            qr_token=f'{i:012d}',
+            import_date=date(2025, 3, 1) + timedelta(days=i % 200),
+            split_date=date(2025, 6, 1) if i % 3 == 0 else None,
+            health_status='Tốt' if i % 4 else 'Yếu',
+            species='Furva Vàng' if i % 2 else 'Furva Đen',
+            notes='Tổ mạnh, đã chia đàn' if i % 5 == 0 else '',
+            is_sold=False,
+            sold_date=None,
+            user_id=1,
+            created_at=datetime(2025, 3, 1, 8, 30, 15, 123456) + timedelta(hours=i),
+            updated_at=datetime(2025, 3, 2, 9, 0, 0, 654321) + timedelta(hours=i),
+        ))
+    return beehives
+
+
+def legacy_to_dict(beehive):
+    """Beehive.to_dict as it was before dates moved to the JSON provider"""
+    return {
+        'serial_number': beehive.serial_number,
+        'qr_token': beehive.qr_token,
+        'import_date': beehive.import_date.isoformat() if beehive.import_date else None,
+        'split_date': beehive.split_date.isoformat() if beehive.split_date else None,
+        'health_status': beehive.health_status,
+        'species': beehive.species,
+        'notes': beehive.notes,
+        'is_sold': beehive.is_sold,
+        'sold_date': beehive.sold_date.isoformat() if beehive.sold_date else None,
+        'user_id': beehive.user_id,
+        'created_at': beehive.created_at.isoformat() if beehive.created_at else None,
+        'updated_at': beehive.updated_at.isoformat() if beehive.updated_at else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list-endpoint JSON serialization')
+    parser.add_argument('--rows', type=int, default=100, help='Beehives per response (default: 100)')
+    parser.add_argument('--repeat', type=int, default=200, help='Encodes per measurement (default: 200)')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    beehives = build_beehives(args.rows)
+
+    def payload(items):
+        return {'beehives': items, 'pagination': {'page': 1, 'per_page': args.rows, 'total': args.rows}}
+
+    cases = [
+        ('before: isoformat to_dict + Flask default provider',
+         lambda: DefaultJSONProvider(app).dumps(payload([legacy_to_dict(b) for b in beehives]))),
+        ('after:  native to_dict + stdlib KBee provider',
+         lambda: KBeeJSONProvider(app).dumps(payload([b.to_dict() for b in beehives]))),
+    ]
+    if orjson is not None:
+        cases.append(('after:  native to_dict + orjson provider',
+                      lambda: ORJSONProvider(app).dumps(payload([b.to_dict() for b in beehives]))))
+
+    print(f'📊 Serializing {args.rows} beehives, {args.repeat} times per case')
+    baseline = None
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5)) / args.repeat
+        size = len(func().encode('utf-8'))
+        baseline = baseline or best
+        print(f'{name:<55} {best * 1e6:9.1f} µs/response  {size:7d} bytes  x{baseline / best:.2f}')
+
+    # Every provider must produce the same document
+    decoded = [json.loads(func()) for _, func in cases]
+    assert all(doc == decoded[0] for doc in decoded), 'Providers disagree on output'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+SQLite vs MySQL Benchmark for KBee Manager
+Runs the real API workloads (lists, filters, search, stats, creates, updates
+and concurrent creates from several worker processes) in-process against
+the SQLite production profile and, when --mysql-url is given, MySQL.
+
+Usage:
+    python sqlite_benchmark.py
+    python sqlite_benchmark.py --mysql-url mysql+pymysql://root:pw@localhost/kbee_bench
+
+The MySQL database is wiped: point it at a scratch database.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+import statistics
+import subprocess
+import multiprocessing
+from datetime import date, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add parent directory to path for imports
+sys.path.append(ROOT_DIR)
+
+
+def summarize(samples):
+    """p50 / p95 in ms and operations per second"""
+    ordered = sorted(samples)
+    return {
+        'p50_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[int(len(ordered) * 0.95) - 1] * 1000,
+        'ops_s': len(ordered) / sum(ordered),
+    }
+
+
+def timed(iterations, func):
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def seed(app, rows):
+    """Fresh schema, one user and `rows` beehives; returns a JWT"""
+    from backend.models import db, User, Beehive
+
+    with app.app_context():
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        user = User(username='bench', email='bench@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        rng = random.Random(42)
+        start = date(2024, 1, 1)
+        words = ['mạnh', 'yếu', 'chia đàn', 'thay chúa', 'cho ăn', 'kiểm tra', 'sâu bướm', 'mật tốt']
+        for i in range(rows):
+            sold = i % 4 == 0
+            db.session.add(Beehive(
+                serial_number=f'TO{i + 1:03d}',
+                qr_token=Beehive.generate_qr_token(),
+                import_date=start + timedelta(days=rng.randrange(700)),
+                health_status=rng.choice(['Tốt', 'Yếu']),
+                species=rng.choice(['Furva Vàng', 'Furva Đen']),
+                notes=' '.join(rng.sample(words, 3)),
+                is_sold=sold,
+                sold_date=start + timedelta(days=rng.randrange(700)) if sold else None,
+                user_id=user.id,
+            ))
+            if i % 500 == 499:
+                db.session.flush()
+        db.session.commit()
+
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'username': 'bench', 'password': 'Password123'})
+    return response.get_json()['token']
+
+
+def _concurrent_creates(app, headers, count, results):
+    from backend.models import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    client = app.test_client()
+    failures = 0
+    for i in range(count):
+        response = client.post('/api/beehives', headers=headers, json={
+            'import_date': '2025-06-01', 'health_status': 'Tốt', 'species': 'Furva Vàng', 'notes': f'song song {i}',
+        })
+        if response.status_code != 201:
+            failures += 1
+    results.put(failures)
+
+
+def run_backend(backend, args):
+    """Run every workload in this process and print the results as JSON"""
+    from app import create_app
+    from backend.routes.beehives import stats_cache
+
+    app = create_app('sqlite' if backend == 'sqlite' else 'testing')
+    token = seed(app, args.rows)
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+    n = args.iterations
+
+    def get(url):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def stats(_):
+        stats_cache.clear()
+        get('/api/stats')
+
+    def create(i):
+        response = client.post('/api/beehives', headers=headers, json={
+            'import_date': '2025-06-01', 'health_status': 'Tốt', 'species': 'Furva Vàng', 'notes': f'mới {i}',
+        })
+        assert response.status_code == 201, response.get_data(as_text=True)
+
+    def update(i):
+        # Sold hives (every 4th) are read-only
+        response = client.put(f'/api/beehives/TO{i % (args.rows // 4) * 4 + 2:03d}', headers=headers, json={'notes': f'cập nhật {i}'})
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    results = {
+        'list page': timed(n, lambda i: get(f'/api/beehives?page={i % 20 + 1}&per_page=20')),
+        'filtered list': timed(n, lambda i: get(
+            '/api/beehives?health_status=Yếu&species=Furva Đen&import_from=2024-03-01&import_to=2024-09-30&sort_field=import_date')),
+        'search notes': timed(n, lambda i: get('/api/beehives?q=chia')),
+        'folded search': timed(n, lambda i: get('/api/beehives?notes=yeu')),
+        'detail': timed(n, lambda i: get(f'/api/beehives/TO{i % args.rows + 1:03d}')),
+        'stats': timed(n, stats),
+        'create': timed(n, create),
+        'update': timed(n, update),
+    }
+
+    # Several worker processes creating at once (gunicorn-style prefork)
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    per_process = max(n // args.processes, 1)
+    processes = [
+        context.Process(target=_concurrent_creates, args=(app, headers, per_process, queue))
+        for _ in range(args.processes)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    failures = sum(queue.get() for _ in processes)
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    results[f'creates x{args.processes} procs'] = {
+        'p50_ms': float('nan'), 'p95_ms': float('nan'),
+        'ops_s': per_process * args.processes / elapsed, 'failures': failures,
+    }
+
+    print('RESULT ' + json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the SQLite profile against MySQL')
+    parser.add_argument('--mysql-url', help='Scratch MySQL database URL (wiped!)')
+    parser.add_argument('--rows', type=int, default=2000, help='Beehives to seed (default: 2000)')
+    parser.add_argument('--iterations', type=int, default=200, help='Requests per workload (default: 200)')
+    parser.add_argument('--processes', type=int, default=4, help='Concurrent writer processes (default: 4)')
+    parser.add_argument('--run', choices=['sqlite', 'mysql'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_backend(args.run, args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            'sqlite': {'SQLITE_PATH': os.path.join(tmp, 'kbee.db'), 'INVALIDATION_SHM_PATH': os.path.join(tmp, 'shm'),
+                       'METRICS_TOKEN': os.getenv('METRICS_TOKEN') or 'benchmark'},
+        }
+        if args.mysql_url:
+            backends['mysql'] = {'TEST_DATABASE_URL': args.mysql_url, 'INVALIDATION_SHM_PATH': os.path.join(tmp, 'shm-mysql')}
+        else:
+            print('⚠️  --mysql-url not given, benchmarking SQLite only')
+
+        all_results = {}
+        for backend, env in backends.items():
+            print(f'🐝 Running {backend} workloads ({args.rows} beehives, {args.iterations} requests each)...')
+            command = [sys.executable, os.path.abspath(__file__), '--run', backend,
+                       '--rows', str(args.rows), '--iterations', str(args.iterations), '--processes', str(args.processes)]
+            output = subprocess.run(command, cwd=ROOT_DIR, env=dict(os.environ, **env),
+                                    stdout=subprocess.PIPE, text=True, check=True).stdout
+            line = next(l for l in output.splitlines() if l.startswith('RESULT '))
+            all_results[backend] = json.loads(line[len('RESULT '):])
+
+    names = list(backends)
+    print(f'\n{"workload":<20}' + ''.join(f'{name + " p50 ms":>16}{name + " ops/s":>15}' for name in names))
+    for workload in all_results[names[0]]:
+        row = f'{workload:<20}'
+        for name in names:
+            result = all_results[name][workload]
+            row += f'{result["p50_ms"]:16.2f}{result["ops_s"]:15.1f}'
+        failures = [all_results[name][workload].get('failures') for name in names]
+        if any(failures):
+            row += f'  failures: {failures}'
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
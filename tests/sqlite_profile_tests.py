@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Tests for KBee Manager
+Runs the 'sqlite' config on a temporary database file: every connection
+gets the configured PRAGMAs, writing requests begin with BEGIN IMMEDIATE,
+and GET requests, CLI work and the readiness probe keep deferred
+transactions, so they still answer while another process holds the write
+lock.
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix='kbee-sqlite-')
+DB_PATH = os.path.join(SCRATCH_DIR, 'kbee.db')
+os.environ.update({
+    'SQLITE_PATH': DB_PATH,
+    'SQLITE_BUSY_TIMEOUT': '200',  # a BEGIN IMMEDIATE behind the test's lock gives up quickly
+    'INVALIDATION_SHM_PATH': os.path.join(SCRATCH_DIR, 'shm'),
+    'LOG_DIR': SCRATCH_DIR,
+    'METRICS_TOKEN': 'sqlite-profile-tests',  # required by the production configs
+})
+
+from app import create_app
+from backend.models import db, Beehive, User
+
+
+class SQLiteProfileTests(unittest.TestCase):
+    """PRAGMAs and transaction modes of the SQLite profile"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the schema and a user with one beehive"""
+        cls.app = create_app('sqlite')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.create_all(bind_key=None)
+
+        user = User(username='owner', email='owner@kbee.test')
+        user.set_password('Password123')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Beehive(serial_number='TO001', qr_token='qr0000000001', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=user.id))
+        db.session.commit()
+        db.session.remove()
+
+        cls.client = cls.app.test_client()
+        response = cls.client.post('/api/auth/login', json={'username': 'owner', 'password': 'Password123'})
+        cls.headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.engine.dispose()
+        cls.ctx.pop()
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    def tearDown(self):
+        # Outside a request nothing removes the session of the test's app context
+        db.session.remove()
+
+    def begins(self, action):
+        """Run action and return the BEGIN statements it issued"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('BEGIN'):
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            action()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+            db.session.remove()
+        return statements
+
+    def request(self, method, path, status=200, **kwargs):
+        response = self.client.open(path, method=method, headers=self.headers, **kwargs)
+        self.assertEqual(response.status_code, status, response.get_data(as_text=True))
+        return response
+
+    def test_01_pragmas(self):
+        """Every connection runs in WAL mode with the configured busy timeout"""
+        with db.engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql('PRAGMA journal_mode').scalar(), 'wal')
+            self.assertEqual(connection.exec_driver_sql('PRAGMA busy_timeout').scalar(), 200)
+            self.assertEqual(connection.exec_driver_sql('PRAGMA foreign_keys').scalar(), 1)
+            self.assertEqual(connection.exec_driver_sql('PRAGMA synchronous').scalar(), 1)  # NORMAL
+
+    def test_02_writing_requests_begin_immediate(self):
+        """POST, PUT and DELETE requests take the write lock up front"""
+        beehive = {'import_date': '2025-06-01', 'health_status': 'Tốt', 'species': 'Furva Vàng'}
+        created = self.request('POST', '/api/beehives', status=201, json=beehive).get_json()
+        serial_number = created['serial_number']
+        for method, path, kwargs in (
+            ('POST', '/api/beehives', {'status': 201, 'json': beehive}),
+            ('PUT', f'/api/beehives/{serial_number}', {'json': {'notes': 'chia đàn'}}),
+            ('DELETE', f'/api/beehives/{serial_number}', {}),
+        ):
+            with self.subTest(method=method):
+                statements = self.begins(lambda: self.request(method, path, **kwargs))
+                self.assertTrue(statements, method)
+                self.assertEqual(set(statements), {'BEGIN IMMEDIATE'})
+
+    def test_03_everything_else_deferred(self):
+        """GET requests, the readiness probe and work outside requests use deferred BEGIN"""
+        for path in ('/api/auth/me', '/api/beehives', '/healthz/ready'):
+            with self.subTest(path=path):
+                statements = self.begins(lambda: self.request('GET', path))
+                self.assertTrue(statements, path)
+                self.assertEqual(set(statements), {'BEGIN'})
+        statements = self.begins(lambda: db.session.query(User).count())
+        self.assertEqual(statements, ['BEGIN'])
+
+    def test_04_reads_while_write_locked(self):
+        """With another process holding the write lock, reads still answer and writes wait then fail"""
+        holder = sqlite3.connect(DB_PATH, isolation_level=None)
+        try:
+            holder.execute('BEGIN IMMEDIATE')
+            self.request('GET', '/api/auth/me')
+            self.request('GET', '/api/beehives')
+            self.assertEqual(db.session.query(Beehive).filter_by(serial_number='TO001').count(), 1)
+            db.session.remove()
+            response = self.client.put('/api/beehives/TO001', headers=self.headers, json={'notes': 'kiểm tra'})
+            self.assertGreaterEqual(response.status_code, 500)
+        finally:
+            holder.execute('ROLLBACK')
+            holder.close()
+        self.request('PUT', '/api/beehives/TO001', json={'notes': 'kiểm tra'})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
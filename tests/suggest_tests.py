@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Suggest Tests for KBee Manager
+Checks the serial-number prefix ranges behind /api/beehives/suggest
+(zero-padded and wider numbers, prefixes matching everything or nothing)
+and the endpoint itself: numeric order, the sold flag, the limit, per-user
+results, agreement with the serialNumber list filter for digits typed
+without zero padding, and the cache following writes.
+
+Uses the testing config (SQLite in memory).
+"""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from backend.models import db, Beehive, User
+
+ACTIVE = [f'TO{i:03d}' for i in range(1, 121)] + ['TO999', 'TO1000', 'TO1200', 'TO12000']
+SOLD = ['TO121', 'TO122']
+
+
+class SerialPrefixRangeTests(unittest.TestCase):
+    """Beehive.serial_prefix_ranges"""
+
+    def test_01_everything(self):
+        """Empty input and prefixes of TO match every serial number"""
+        for prefix in ('', '  ', 't', 'TO', 'to'):
+            with self.subTest(prefix=prefix):
+                self.assertIsNone(Beehive.serial_prefix_ranges(prefix))
+
+    def test_02_nothing(self):
+        """Other letters, non-digits and over-long numbers match nothing"""
+        for prefix in ('AB', 'TOX', 'TO1X', '1234567890', 'TO0001'):
+            with self.subTest(prefix=prefix):
+                self.assertEqual(Beehive.serial_prefix_ranges(prefix), [])
+
+    def test_03_padded(self):
+        """Prefixes inside the zero padding stay within three digits"""
+        self.assertEqual(Beehive.serial_prefix_ranges('TO0'), [(0, 99)])
+        self.assertEqual(Beehive.serial_prefix_ranges('TO01'), [(10, 19)])
+        self.assertEqual(Beehive.serial_prefix_ranges('to00'), [(0, 9)])
+        self.assertEqual(Beehive.serial_prefix_ranges('TO001'), [(1, 1)])
+
+    def test_04_wider_numbers(self):
+        """Numbers past the padding get one range per width, without leading zeros"""
+        self.assertEqual(Beehive.serial_prefix_ranges('TO12', max_width=5), [(120, 129), (1200, 1299), (12000, 12999)])
+        self.assertEqual(Beehive.serial_prefix_ranges('TO1000', max_width=6), [(1000, 1000), (10000, 10009), (100000, 100099)])
+        self.assertEqual(len(Beehive.serial_prefix_ranges('TO12')), 7)
+
+    def test_05_bare_digits(self):
+        """Digits typed without TO also match the number without its padding, as the list filter does"""
+        self.assertEqual(Beehive.serial_prefix_ranges('12', max_width=5), [(12, 12), (120, 129), (1200, 1299), (12000, 12999)])
+        self.assertEqual(Beehive.serial_prefix_ranges('1', max_width=3), [(1, 1), (10, 19), (100, 199)])
+        self.assertEqual(Beehive.serial_prefix_ranges('012'), [(12, 12)])
+        self.assertEqual(Beehive.serial_prefix_ranges('0'), [(0, 99)])
+
+
+class SuggestEndpointTests(unittest.TestCase):
+    """GET /api/beehives/suggest"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create two users, the first with active and sold beehives"""
+        cls.app = create_app('testing')
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        db.drop_all()
+        db.create_all()
+
+        users = []
+        for name in ('owner', 'other'):
+            user = User(username=name, email=f'{name}@kbee.test')
+            user.set_password('Password123')
+            db.session.add(user)
+            users.append(user)
+        db.session.flush()
+        for i, serial_number in enumerate(ACTIVE + SOLD):
+            db.session.add(Beehive(serial_number=serial_number, qr_token=f'qr{i:010d}', import_date=date(2025, 1, 1),
+                                   health_status='Tốt', user_id=users[0].id, is_sold=serial_number in SOLD))
+        db.session.add(Beehive(serial_number='TO500', qr_token='qr9999999999', import_date=date(2025, 1, 1),
+                               health_status='Tốt', user_id=users[1].id))
+        db.session.commit()
+
+        cls.client = cls.app.test_client()
+        cls.headers = {}
+        for name in ('owner', 'other'):
+            response = cls.client.post('/api/auth/login', json={'username': name, 'password': 'Password123'})
+            cls.headers[name] = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the schema"""
+        db.session.remove()
+        db.drop_all()
+        cls.ctx.pop()
+
+    def suggest(self, query, user='owner', status=200):
+        response = self.client.get(f'/api/beehives/suggest?{query}', headers=self.headers[user])
+        self.assertEqual(response.status_code, status, response.get_json())
+        return response.get_json()
+
+    def test_01_prefix(self):
+        """Matching serial numbers in numeric order, limit 10 by default"""
+        self.assertEqual(self.suggest('prefix=TO01')['suggestions'], [f'TO{i:03d}' for i in range(10, 20)])
+        self.assertEqual(self.suggest('prefix=to11&limit=3')['suggestions'], ['TO110', 'TO111', 'TO112'])
+        self.assertEqual(self.suggest('prefix=TO005')['suggestions'], ['TO005'])
+
+    def test_02_wider_numbers(self):
+        """Numbers past the padding sort numerically, TO999 before TO1000"""
+        self.assertEqual(self.suggest('prefix=TO12')['suggestions'], ['TO120', 'TO1200', 'TO12000'])
+        self.assertEqual(self.suggest('prefix=TO9')['suggestions'], ['TO999'])
+        self.assertEqual(self.suggest('prefix=1&limit=50')['suggestions'][-4:], ['TO120', 'TO1000', 'TO1200', 'TO12000'])
+
+    def test_03_sold_and_no_match(self):
+        """sold=true searches sold beehives; impossible prefixes return nothing"""
+        self.assertEqual(self.suggest('prefix=TO12&sold=true')['suggestions'], ['TO121', 'TO122'])
+        self.assertNotIn('TO121', self.suggest('prefix=TO12&limit=50')['suggestions'])
+        self.assertEqual(self.suggest('prefix=AB')['suggestions'], [])
+
+    def test_04_per_user(self):
+        """Suggestions only include the caller's beehives"""
+        self.assertEqual(self.suggest('prefix=TO5', user='other')['suggestions'], ['TO500'])
+        self.assertEqual(self.suggest('prefix=TO5')['suggestions'], [])
+
+    def test_05_invalid_limit(self):
+        """Out-of-range limits are rejected with 400"""
+        for limit in ('0', '51', 'abc'):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.suggest(f'prefix=TO&limit={limit}', status=400)['field'], 'limit')
+
+    def test_06_agrees_with_list_filter(self):
+        """Bare digits suggest the same active beehives the serialNumber filter lists"""
+        self.assertEqual(self.suggest('prefix=12')['suggestions'], ['TO012', 'TO120', 'TO1200', 'TO12000'])
+        for prefix in ('1', '12', '012', '5', '09', 'TO01', 'TO1'):
+            with self.subTest(prefix=prefix):
+                response = self.client.get(f'/api/beehives?serialNumber={prefix}&per_page=100',
+                                           headers=self.headers['owner'])
+                listed = {beehive['serial_number'] for beehive in response.get_json()['beehives']}
+                suggested = self.suggest(f'prefix={prefix}&limit=50')['suggestions']
+                self.assertLess(len(suggested), 50)
+                self.assertEqual(set(suggested), listed)
+
+    def test_07_follows_writes(self):
+        """A sale moves the beehive out of the active suggestions (cache invalidated)"""
+        self.assertEqual(self.suggest('prefix=TO007')['suggestions'], ['TO007'])
+        response = self.client.post('/api/beehives/TO007/sell', headers=self.headers['owner'])
+        self.assertEqual(response.status_code, 200, response.get_json())
+        self.assertEqual(self.suggest('prefix=TO007')['suggestions'], [])
+        self.assertEqual(self.suggest('prefix=TO007&sold=1')['suggestions'], ['TO007'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)